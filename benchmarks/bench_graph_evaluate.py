@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+import argparse
+
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "../../python")))
+
+from ofne.core import op
+from ofne.core import param
+from ofne.core import packet
+from ofne.core import opManager
+from ofne.core.scene import OFnScene
+from ofne.graph.scene import OFnGraphScene
+
+
+class BenchSource(op.OFnOp):
+    def params(self):
+        return [
+            param.OFnParamFloat("num", 1.0)
+        ]
+
+    def needs(self):
+        return 0
+
+    def packetable(self):
+        return True
+
+    def operate(self, params, packetArray):
+        return packet.OFnPacket()
+
+
+class BenchOne(op.OFnOp):
+    def params(self):
+        return [
+            param.OFnParamFloat("num", 1.0)
+        ]
+
+    def needs(self):
+        return 1
+
+    def packetable(self):
+        return True
+
+    def operate(self, params, packetArray):
+        return packetArray.packet(0)
+
+
+class BenchTwo(op.OFnOp):
+    def params(self):
+        return []
+
+    def needs(self):
+        return 2
+
+    def packetable(self):
+        return True
+
+    def operate(self, params, packetArray):
+        return packetArray.packet(0)
+
+
+def makeChain(scene, count):
+    head = scene.createNode("BenchSource")
+    cur = head
+    for _ in range(count - 1):
+        n = scene.createNode("BenchOne")
+        n.connect(cur, 0)
+        cur = n
+
+    return (head, cur)
+
+
+def makeFanIn(scene, count):
+    # a binary tree reducing count // 2 sources into one node
+    sources = [scene.createNode("BenchSource") for _ in range(max(1, count // 2))]
+    level = sources
+    while (len(level) > 1):
+        nexts = []
+        for i in range(0, len(level) - 1, 2):
+            n = scene.createNode("BenchTwo")
+            n.connect(level[i], 0)
+            n.connect(level[i + 1], 1)
+            nexts.append(n)
+
+        if len(level) % 2:
+            nexts.append(level[-1])
+
+        level = nexts
+
+    return (sources[0], level[0])
+
+
+def makeDiamonds(scene, count):
+    # a chain of diamonds, every node joins both branches of the previous one
+    head = scene.createNode("BenchSource")
+    cur = head
+    for _ in range(max(1, (count - 1) // 3)):
+        a = scene.createNode("BenchOne")
+        b = scene.createNode("BenchOne")
+        d = scene.createNode("BenchTwo")
+        a.connect(cur, 0)
+        b.connect(cur, 0)
+        d.connect(a, 0)
+        d.connect(b, 1)
+        cur = d
+
+    return (head, cur)
+
+
+GRAPHS = {
+    "chain": makeChain,
+    "fanin": makeFanIn,
+    "diamond": makeDiamonds
+}
+
+
+def _timed(func):
+    st = time.perf_counter()
+    func()
+
+    return time.perf_counter() - st
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("bench_graph_evaluate")
+    parser.add_argument("-n", "--nodes", type=int, default=10000)
+    parser.add_argument("-t", "--threads", type=int, default=1)
+    parser.add_argument("graphs", nargs="*", default=list(GRAPHS.keys()), help=f"{', '.join(GRAPHS.keys())} (default: all)")
+    opts = parser.parse_args(argv)
+
+    for name in opts.graphs:
+        if name not in GRAPHS:
+            parser.error(f"unknown graph '{name}'")
+
+    manager = opManager.OFnOpManager()
+    ops = [BenchSource(), BenchOne(), BenchTwo()]
+    for o in ops:
+        manager.registerOp(o)
+
+    print(f"nodes : {opts.nodes}, threads : {opts.threads}")
+    print(f"{'graph':>6} {'build (s)':>10} {'first (s)':>10} {'clean (s)':>10} {'head (s)':>10} {'tail (s)':>10}")
+
+    try:
+        for name in opts.graphs:
+            scene = OFnScene()
+            holder = {}
+
+            def _build():
+                holder["nodes"] = GRAPHS[name](scene, opts.nodes)
+
+            tb = _timed(_build)
+            head, tail = holder["nodes"]
+            graph = OFnGraphScene(scene, workers=opts.threads)
+
+            # everything dirty, nothing dirty, the whole graph dirty from the head, only the tail dirty
+            t1 = _timed(lambda: graph.evaluate([tail]))
+            t2 = _timed(lambda: graph.evaluate([tail]))
+            head.setParamValue("num", 2.0)
+            t3 = _timed(lambda: graph.evaluate([tail]))
+            tail.setByPassed(True)
+            t4 = _timed(lambda: graph.evaluate([tail]))
+
+            if graph.failedNodes():
+                print(f"ERROR : {name} failed to evaluate")
+                return 1
+
+            print(f"{name:>6} {tb:>10.4f} {t1:>10.4f} {t2:>10.4f} {t3:>10.4f} {t4:>10.4f}")
+    finally:
+        for o in ops:
+            manager.deregisterOp(o)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
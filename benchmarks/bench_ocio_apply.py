@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import argparse
+import importlib.util
+import numpy as np
+
+
+SIZES = {
+    "2K": (1080, 2048),
+    "4K": (2160, 4096),
+    "8K": (4320, 8192)
+}
+
+
+def _loadOCIOBuiltins():
+    sys.path.append(os.path.abspath(os.path.join(__file__, "../../python")))
+    fp = os.path.abspath(os.path.join(__file__, "../../python/ofne/builtins/ocio.py"))
+    spec = importlib.util.spec_from_file_location("_ofne_bench_ocio", fp)
+    mdl = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mdl)
+
+    return mdl
+
+
+def _best(func, data, repeat):
+    best = None
+    for _ in range(repeat):
+        d = data.copy()
+        st = time.perf_counter()
+        func(d)
+        t = time.perf_counter() - st
+        best = t if best is None else min(best, t)
+
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("bench_ocio_apply")
+    parser.add_argument("-t", "--threads", type=int, default=None, help="threads of the banded apply (default: OFNE_OCIO_THREADS or all cores)")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-c", "--channels", type=int, default=4, choices=[3, 4])
+    parser.add_argument("sizes", nargs="*", default=list(SIZES.keys()), help=f"{', '.join(SIZES.keys())} (default: all)")
+    opts = parser.parse_args(argv)
+
+    for name in opts.sizes:
+        if name not in SIZES:
+            parser.error(f"unknown size '{name}'")
+
+    mdl = _loadOCIOBuiltins()
+    if opts.threads:
+        mdl.APPLY_THREADS = opts.threads
+
+    proc = mdl.RAW_CONFIG.getProcessor(mdl.ocio.ExponentTransform(value=[2.2, 2.2, 2.2, 1.0], negativeStyle=mdl.ocio.NEGATIVE_CLAMP)).getDefaultCPUProcessor()
+    single = proc.applyRGB if opts.channels == 3 else proc.applyRGBA
+
+    print(f"threads : {mdl.APPLY_THREADS}")
+    print(f"{'size':>6} {'single (s)':>12} {'banded (s)':>12} {'speedup':>8}")
+    for name in opts.sizes:
+        h, w = SIZES[name]
+        data = np.random.rand(h, w, opts.channels).astype(np.float32)
+
+        a = data.copy()
+        b = data.copy()
+        single(a)
+        mdl._apply(proc, b)
+        if not np.array_equal(a, b):
+            print(f"ERROR : the results differ at {name}")
+            return 1
+
+        ts = _best(single, data, opts.repeat)
+        tb = _best(lambda d: mdl._apply(proc, d), data, opts.repeat)
+        print(f"{name:>6} {ts:>12.4f} {tb:>12.4f} {ts / tb:>8.2f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import os
+import sys
+import ast
+import time
+import shutil
+import argparse
+import tempfile
+from pprint import pprint
+
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "../../python")))
+
+from ofne.core import op
+from ofne.core import param
+from ofne.core import packet
+from ofne.core import opManager
+from ofne.core import sceneFormat
+from ofne.core.scene import OFnScene
+
+
+class BenchSceneOp(op.OFnOp):
+    def params(self):
+        return [
+            param.OFnParamFloat("num", 1.0),
+            param.OFnParamInt("count", 0),
+            param.OFnParamStr("label", ""),
+            param.OFnParamPath("path", "")
+        ]
+
+    def needs(self):
+        return 2
+
+    def packetable(self):
+        return True
+
+    def operate(self, params, packetArray):
+        return packet.OFnPacket()
+
+
+def makeScene(count):
+    scene = OFnScene()
+    nodes = []
+    for i in range(count):
+        n = scene.createNode("BenchSceneOp")
+        n.setParamValue("num", i * 0.5)
+        n.setParamValue("count", i)
+        n.setParamValue("label", f"label {i}")
+        n.setParamValue("path", f"${{OFSN}}/images/plate_{i}.####.exr")
+        n.setUserData("ui:pos", (float(i % 100) * 200.0, float(i // 100) * 100.0))
+        if nodes:
+            n.connect(nodes[-1], 0)
+        if len(nodes) > 1:
+            n.connect(nodes[-2], 1)
+
+        nodes.append(n)
+
+    return scene
+
+
+def _best(func, repeat):
+    best = None
+    for _ in range(repeat):
+        st = time.perf_counter()
+        func()
+        t = time.perf_counter() - st
+        best = t if best is None else min(best, t)
+
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("bench_scene_io")
+    parser.add_argument("-n", "--nodes", type=int, default=10000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    opts = parser.parse_args(argv)
+
+    manager = opManager.OFnOpManager()
+    bench_op = BenchSceneOp()
+    manager.registerOp(bench_op)
+    tmpdir = tempfile.mkdtemp()
+
+    try:
+        scene = makeScene(opts.nodes)
+        data = scene.toDict()
+        new_path = os.path.join(tmpdir, "new.ofsn")
+        legacy_path = os.path.join(tmpdir, "legacy.ofsn")
+
+        def _writeLegacy():
+            with open(legacy_path, "w", encoding="utf-8") as f:
+                pprint(data, f)
+
+        def _readEval():
+            with open(legacy_path, encoding="utf-8") as f:
+                return eval(f.read())
+
+        def _readLiteral():
+            with open(legacy_path, encoding="utf-8") as f:
+                return ast.literal_eval(f.read())
+
+        def _load(filepath):
+            s = OFnScene()
+            if not s.read(filepath):
+                raise RuntimeError(f"Failed to read {filepath}")
+
+        print(f"nodes : {opts.nodes}")
+        print(f"{'step':>22} {'time (s)':>10}")
+        print(f"{'toDict':>22} {_best(scene.toDict, opts.repeat):>10.4f}")
+        print(f"{'write pprint (legacy)':>22} {_best(_writeLegacy, opts.repeat):>10.4f}")
+        print(f"{'write json':>22} {_best(lambda: sceneFormat.writeFile(new_path, data), opts.repeat):>10.4f}")
+        print(f"{'parse eval (legacy)':>22} {_best(_readEval, opts.repeat):>10.4f}")
+        print(f"{'parse literal (legacy)':>22} {_best(_readLiteral, opts.repeat):>10.4f}")
+        print(f"{'parse json':>22} {_best(lambda: sceneFormat.readFile(new_path), opts.repeat):>10.4f}")
+        print(f"{'load legacy':>22} {_best(lambda: _load(legacy_path), opts.repeat):>10.4f}")
+        print(f"{'load json':>22} {_best(lambda: _load(new_path), opts.repeat):>10.4f}")
+        print(f"{'size legacy (KiB)':>22} {os.path.getsize(legacy_path) / 1024:>10.0f}")
+        print(f"{'size json (KiB)':>22} {os.path.getsize(new_path) / 1024:>10.0f}")
+
+        if sceneFormat.readFile(new_path) != sceneFormat.readFile(legacy_path):
+            print("ERROR : the legacy and the json scenes differ")
+            return 1
+    finally:
+        manager.deregisterOp(bench_op)
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import numpy as np
+import OpenImageIO as oiio
+
+
+sys.path.append(os.path.abspath(os.path.join(__file__, "../../python")))
+
+from ofne import synthetic
+from ofne.core import packet
+from ofne.core import opManager
+from ofne.core.scene import OFnScene
+from ofne.graph.scene import OFnGraphScene
+
+import bench_scene_io
+import bench_graph_evaluate
+
+
+SIZES = {
+    "1K": (540, 1024),
+    "4K": (2160, 4096)
+}
+
+OCIO_PARAMS = {
+    "OCIOMatrixTransform": {"m00": 1.1, "m11": 0.9, "m22": 1.05, "offset0": 0.01},
+    "OCIOAllocationUniformTransform": {"min": 0.0, "max": 2.0},
+    "OCIOAllocationLog2Transform": {"min": -8.0, "max": 8.0},
+    "OCIOFileTransform": {"interpolation": "tetrahedral"},
+    "OCIOExponentTransform": {"gamma": 2.2},
+    "OCIOExponentWithLinearTransform": {"gamma": 2.4, "offset": 0.055},
+    "OCIOExposureContrastTransform": {"exposure": 1.0, "contrast": 1.2},
+    "OCIOColorSpaceTransform": {"config": "builtin:studio-config-v2.2.0_aces-v1.3_ocio-v2.4", "from": "aka:ap0", "to": "aka:srgb"},
+    "OCIODisplayViewTransform": {"config": "builtin:studio-config-v2.2.0_aces-v1.3_ocio-v2.4", "from": "aka:ap0", "display": "sRGB - Display", "view": "ACES 1.0 - SDR Video"},
+    "OCIONamedTransform": {"config": "builtin:studio-config-v2.2.0_aces-v1.3_ocio-v2.4", "name": "ARRI LogC4 - Curve"},
+    "OCIOBuiltinTransform": {"name": "ACES-LMT - ACES 1.3 Reference Gamut Compression"}
+}
+
+EXPRESSION_SMALL = """outPacket = inPackets.packet(0)
+"""
+
+EXPRESSION_IMAGE = """d = inPackets.packet(0).data()
+outPacket = Packet(data=np.clip(d * 1.5 + 0.1, 0.0, 1.0))
+"""
+
+GROUPS = ["packet", "graph", "scene", "ocio", "io", "expression", "synthetic"]
+
+
+def _best(func, repeat, setup=None):
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        st = time.perf_counter()
+        func()
+        t = time.perf_counter() - st
+        best = t if best is None else min(best, t)
+
+    return best
+
+
+def _image(size, channels=4):
+    h, w = SIZES[size]
+
+    return np.random.default_rng(0).random((h, w, channels), dtype=np.float32)
+
+
+def _operate(node, packets):
+    def _run():
+        if node.operate(packet.OFnPacketArray(packets)).data().size == 0:
+            raise RuntimeError(f"{node.name()} returned an empty packet")
+
+    return _run
+
+
+def benchPacket(opts, tmpdir):
+    res = {}
+    data = _image("1K")
+    count = 100000 // opts.scale
+
+    def _construct():
+        for _ in range(count):
+            packet.OFnPacket(data=data)
+
+    p = packet.OFnPacket(metadata={"a": 1}, data=data)
+
+    def _access():
+        for _ in range(count):
+            p.data()
+            p.metadata()
+
+    res[f"packet/construct x{count}"] = _best(_construct, opts.repeat)
+    res[f"packet/access x{count}"] = _best(_access, opts.repeat)
+
+    for size in opts.sizes:
+        d = _image(size)
+        holder = {}
+        res[f"packet/mutableData {size}"] = _best(lambda: packet.OFnPacket(data=d).mutableData(), opts.repeat)
+        res[f"packet/resolve uint16 {size}"] = _best(lambda: holder["p"].resolved(), opts.repeat,
+                                                     setup=lambda: holder.update(p=packet.OFnPacket(data=d, storageType=np.uint16)))
+
+    return res
+
+
+def benchGraph(opts, tmpdir):
+    res = {}
+    count = 2000 // opts.scale
+
+    for name, make in bench_graph_evaluate.GRAPHS.items():
+        holder = {}
+
+        def _setup():
+            scene = OFnScene()
+            holder["nodes"] = make(scene, count)
+            holder["graph"] = OFnGraphScene(scene, workers=opts.threads)
+
+        def _evaluate():
+            holder["graph"].evaluate([holder["nodes"][1]])
+
+        def _dirtyHead():
+            _setup()
+            _evaluate()
+            holder["nodes"][0].setParamValue("num", 2.0)
+
+        res[f"graph/{name} {count} first"] = _best(_evaluate, opts.repeat, setup=_setup)
+        res[f"graph/{name} {count} clean"] = _best(_evaluate, opts.repeat, setup=lambda: (_setup(), _evaluate()))
+        res[f"graph/{name} {count} head"] = _best(_evaluate, opts.repeat, setup=_dirtyHead)
+
+    return res
+
+
+def benchScene(opts, tmpdir):
+    res = {}
+    count = 10000 // opts.scale
+    scene = bench_scene_io.makeScene(count)
+    path = os.path.join(tmpdir, "scene.ofsn")
+
+    def _load():
+        if not OFnScene().read(path):
+            raise RuntimeError(f"Failed to read {path}")
+
+    res[f"scene/toDict {count}"] = _best(scene.toDict, opts.repeat)
+    res[f"scene/write {count}"] = _best(lambda: scene.write(path), opts.repeat)
+    res[f"scene/load {count}"] = _best(_load, opts.repeat)
+
+    return res
+
+
+def _writeCube(path, size=17):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"LUT_3D_SIZE {size}\n")
+        for b in range(size):
+            for g in range(size):
+                for r in range(size):
+                    f.write(f"{(r / (size - 1)) ** 0.8:.6f} {(g / (size - 1)) ** 0.9:.6f} {b / (size - 1):.6f}\n")
+
+
+def benchOCIO(opts, tmpdir):
+    res = {}
+    lut_path = os.path.join(tmpdir, "bench.cube")
+    _writeCube(lut_path)
+
+    scene = OFnScene()
+    for size in opts.sizes:
+        inp = packet.OFnPacket(data=_image(size))
+        for op_name, params in OCIO_PARAMS.items():
+            n = scene.createNode(op_name)
+            for k, v in params.items():
+                n.setParamValue(k, v)
+
+            if op_name == "OCIOFileTransform":
+                n.setParamValue("src", lut_path)
+
+            run = _operate(n, [inp])
+            run()
+            res[f"ocio/{op_name} {size}"] = _best(run, opts.repeat)
+
+    return res
+
+
+def benchIO(opts, tmpdir):
+    res = {}
+    clear = opManager.OFnOpManager().getOp("ReadImage").operate.__globals__["_clearImageCache"]
+    formats = [("exr", "half", oiio.HALF), ("tif", "uint8", oiio.UINT8), ("tif", "uint16", oiio.UINT16)]
+
+    scene = OFnScene()
+    for size in opts.sizes:
+        h, w = SIZES[size]
+        data = _image(size)
+        for ext, fmt_name, fmt in formats:
+            path = os.path.join(tmpdir, f"read_{size}_{fmt_name}.{ext}")
+            buf = oiio.ImageBuf(oiio.ImageSpec(w, h, 4, fmt))
+            buf.set_pixels(oiio.ROI(0, w, 0, h, 0, 1, 0, 4), data)
+            if not buf.write(path):
+                raise RuntimeError(f"Failed to write {path} : {buf.geterror()}")
+
+            n = scene.createNode("ReadImage")
+            n.setParamValue("path", path)
+            run = _operate(n, [])
+            res[f"io/ReadImage {ext} {fmt_name} {size}"] = _best(run, opts.repeat, setup=clear)
+            res[f"io/ReadImage {ext} {fmt_name} {size} cached"] = _best(run, opts.repeat)
+
+    return res
+
+
+def benchExpression(opts, tmpdir):
+    res = {}
+    count = 1000 // opts.scale
+    scene = OFnScene()
+
+    small = scene.createNode("PythonExpression")
+    small.setParamValue("code", EXPRESSION_SMALL)
+    tiny = [packet.OFnPacket(data=np.zeros((4, 4, 4), dtype=np.float32))]
+
+    def _small():
+        for _ in range(count):
+            small.operate(packet.OFnPacketArray(tiny))
+
+    res[f"expression/passthrough x{count}"] = _best(_small, opts.repeat)
+
+    image = scene.createNode("PythonExpression")
+    image.setParamValue("code", EXPRESSION_IMAGE)
+    for size in opts.sizes:
+        res[f"expression/numpy {size}"] = _best(_operate(image, [packet.OFnPacket(data=_image(size))]), opts.repeat)
+
+    return res
+
+
+def benchSynthetic(opts, tmpdir):
+    # a mixed graph of the scene generator, the same seed makes the same graph in every run
+    res = {}
+    count = 1000 // opts.scale
+    holder = {}
+
+    def _generate():
+        holder["scene"] = synthetic.generate(nodes=count, depth=20, fanIn=3, fanOut=2, sizes=[(256, 128), (512, 256)], seed=0)
+
+    def _setup():
+        _generate()
+        holder["graph"] = OFnGraphScene(holder["scene"], workers=opts.threads)
+        holder["targets"] = [x for x in holder["scene"].nodes() if not x.outputs()]
+
+    res[f"synthetic/generate {count}"] = _best(_generate, opts.repeat)
+    res[f"synthetic/evaluate {count}"] = _best(lambda: holder["graph"].evaluate(holder["targets"]), opts.repeat, setup=_setup)
+
+    return res
+
+
+BENCHES = {
+    "packet": benchPacket,
+    "graph": benchGraph,
+    "scene": benchScene,
+    "ocio": benchOCIO,
+    "io": benchIO,
+    "expression": benchExpression,
+    "synthetic": benchSynthetic
+}
+
+
+def compare(results, baseline, threshold, minTime=0.0):
+    # returns the names of the results slower than the baseline by more than threshold (0.2 = 20%)
+    # the results faster than minTime in both runs are too noisy to be regressions
+    regressions = []
+    print(f"{'benchmark':>56} {'baseline (s)':>12} {'current (s)':>12} {'ratio':>7}")
+    for name, t in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:>56} {'-':>12} {t:>12.4f} {'new':>7}")
+            continue
+
+        ratio = t / base if base > 0 else 1.0
+        mark = ""
+        if ratio > 1.0 + threshold and max(t, base) >= minTime:
+            regressions.append(name)
+            mark = " !"
+
+        print(f"{name:>56} {base:>12.4f} {t:>12.4f} {ratio:>7.2f}{mark}")
+
+    for name in baseline.keys():
+        if name not in results:
+            print(f"{name:>56} {baseline[name]:>12.4f} {'-':>12} {'gone':>7}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("bench_suite")
+    parser.add_argument("-o", "--output", default=None, help="save the results to this JSON file")
+    parser.add_argument("-b", "--baseline", default=None, help="compare the results with this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="the slowdown reported as a regression (default: 0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.001, help="the results faster than this in seconds are never regressions (default: 0.001)")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-t", "--threads", type=int, default=1, help="workers of the graph evaluations")
+    parser.add_argument("-q", "--quick", action="store_true", help="1K images and fewer nodes")
+    parser.add_argument("groups", nargs="*", default=GROUPS, help=f"{', '.join(GROUPS)} (default: all)")
+    opts = parser.parse_args(argv)
+
+    for name in opts.groups:
+        if name not in BENCHES:
+            parser.error(f"unknown group '{name}'")
+
+    opts.scale = 10 if opts.quick else 1
+    opts.sizes = ["1K"] if opts.quick else list(SIZES.keys())
+
+    baseline = None
+    if opts.baseline:
+        with open(opts.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+        # only the groups run this time
+        baseline = dict([(k, v) for k, v in baseline.items() if k.split("/")[0] in opts.groups])
+
+    os.environ.pop("OFNE_PLUGIN_PATH", None)
+    manager = opManager.OFnOpManager()
+    manager.reloadPlugins()
+    ops = [bench_scene_io.BenchSceneOp(), bench_graph_evaluate.BenchSource(), bench_graph_evaluate.BenchOne(), bench_graph_evaluate.BenchTwo()]
+    for o in ops:
+        manager.registerOp(o)
+
+    tmpdir = tempfile.mkdtemp()
+    results = {}
+    try:
+        for name in opts.groups:
+            st = time.perf_counter()
+            results.update(BENCHES[name](opts, tmpdir))
+            print(f"{name} : {time.perf_counter() - st:.1f} s", file=sys.stderr)
+    finally:
+        for o in ops:
+            manager.deregisterOp(o)
+
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    if opts.output:
+        info = {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": opts.quick,
+            "repeat": opts.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        with open(opts.output, "w", encoding="utf-8") as f:
+            json.dump({"info": info, "results": results}, f, indent=1)
+
+    if baseline is None:
+        for name, t in results.items():
+            print(f"{name:>56} {t:>12.4f}")
+
+        return 0
+
+    regressions = compare(results, baseline, opts.threshold, minTime=opts.min_time)
+    if regressions:
+        print(f"ERROR : {len(regressions)} benchmark(s) slower than the baseline by more than {opts.threshold * 100:.0f}%")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import os
+import sys
+
+
+try:
+    import ofne
+except:
+    sys.path.append(os.path.abspath(os.path.join(__file__, "../../python")))
+finally:
+    import ofne.batch
+
+
+if __name__ == "__main__":
+    sys.exit(ofne.batch.main())
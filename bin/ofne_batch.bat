@@ -0,0 +1,3 @@
+@echo off
+
+python %~dp0_ofne_batch.py %*
@@ -0,0 +1,228 @@
+import os
+import re
+import contextlib
+import argparse
+import numpy as np
+import OpenImageIO as oiio
+from .core import param
+from .core import trace
+from .core.scene import OFnScene
+from .graph import memory
+from .graph import profile
+from .graph.scene import OFnGraphScene
+
+
+RE_FRAMES = re.compile(r"^(?P<start>-?[0-9]+)(-(?P<end>-?[0-9]+)(x(?P<step>[0-9]+))?)?$")
+
+OIIO_TYPES = {
+    np.dtype(np.uint8): oiio.UINT8,
+    np.dtype(np.int8): oiio.INT8,
+    np.dtype(np.uint16): oiio.UINT16,
+    np.dtype(np.int16): oiio.INT16,
+    np.dtype(np.uint32): oiio.UINT32,
+    np.dtype(np.int32): oiio.INT32,
+    np.dtype(np.float16): oiio.HALF,
+    np.dtype(np.float32): oiio.FLOAT,
+    np.dtype(np.float64): oiio.DOUBLE
+}
+
+
+def parseFrames(text):
+    frames = []
+
+    for token in text.split(","):
+        token = token.strip()
+        if not token:
+            continue
+
+        m = RE_FRAMES.match(token)
+        if not m:
+            raise ValueError(f"Invalid frame range '{token}'")
+
+        start = int(m.group("start"))
+        end = int(m.group("end")) if m.group("end") is not None else start
+        step = int(m.group("step")) if m.group("step") is not None else 1
+
+        if step < 1 or end < start:
+            raise ValueError(f"Invalid frame range '{token}'")
+
+        for f in range(start, end + 1, step):
+            if f not in frames:
+                frames.append(f)
+
+    return frames
+
+
+def _splitAssign(text):
+    if "=" not in text:
+        raise ValueError(f"Expected 'KEY=VALUE' but received '{text}'")
+
+    k, v = text.split("=", 1)
+
+    return (k.strip(), v)
+
+
+def _findNode(scene, name):
+    for n in scene.nodes():
+        if n.name() == name:
+            return n
+
+    return None
+
+
+def writeImage(filepath, data):
+    if len(data.shape) != 3:
+        raise ValueError(f"Cannot write an image of shape {data.shape} : {filepath}")
+
+    if data.dtype not in OIIO_TYPES:
+        raise ValueError(f"Cannot write an image of type {data.dtype} : {filepath}")
+
+    d = os.path.dirname(os.path.abspath(filepath))
+    if not os.path.isdir(d):
+        os.makedirs(d)
+
+    h, w, c = data.shape
+    out = oiio.ImageOutput.create(filepath)
+    if not out:
+        raise IOError(f"Failed to create an image output : {oiio.geterror()}")
+
+    spec = oiio.ImageSpec(w, h, c, OIIO_TYPES[data.dtype])
+    if not out.open(filepath, spec):
+        raise IOError(f"Failed to open the image output : {out.geterror()}")
+
+    try:
+        if not out.write_image(np.ascontiguousarray(data)):
+            raise IOError(f"Failed to write the image : {out.geterror()}")
+    finally:
+        out.close()
+
+
+def render(scenePath, outputs, frames=None, overrides=None, padding=4, workers=None, profileCount=0, tracePath=None):
+    """
+    Evaluate the scene without any display and write the results of the given nodes
+
+    outputs : {node name: output file path}
+    frames : a list of frame numbers, ${FRAME} is set to each frame before evaluating
+    overrides : {"node name.param name": value} for path parameters
+    workers : the number of threads evaluating independent nodes, all cores if None
+    profileCount : print the profile of the slowest nodes of each frame
+    tracePath : write the Chrome trace events of the evaluations to this file
+    """
+    # ${OFSN} and ${FRAME} are set while rendering only
+    envs = dict([(x, os.environ.get(x)) for x in ("OFSN", "FRAME")])
+    try:
+        return _render(scenePath, outputs, frames, overrides, padding, workers, profileCount, tracePath)
+    finally:
+        for k, v in envs.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def _render(scenePath, outputs, frames, overrides, padding, workers, profileCount, tracePath):
+    scene = OFnScene()
+    os.environ["OFSN"] = os.path.normpath(os.path.dirname(os.path.abspath(scenePath)))
+
+    if not scene.read(scenePath):
+        return False
+
+    targets = []
+    for node_name, out_path in outputs.items():
+        n = _findNode(scene, node_name)
+        if n is None:
+            print(f"Error : no such node '{node_name}'")
+            return False
+
+        if not n.packetable():
+            print(f"Error : '{node_name}' does not produce a packet")
+            return False
+
+        targets.append((n, out_path))
+
+    for key, value in (overrides or {}).items():
+        if "." not in key:
+            print(f"Error : invalid override '{key}', expected 'node.param'")
+            return False
+
+        node_name, param_name = key.split(".", 1)
+        n = _findNode(scene, node_name)
+        if n is None:
+            print(f"Error : no such node '{node_name}'")
+            return False
+
+        p = n.getParam(param_name)
+        if p is None or p.type() != param.ParamTypePath:
+            print(f"Error : '{key}' is not a path parameter")
+            return False
+
+        n.setParamValue(param_name, value)
+
+    # only the written nodes keep their packets, the intermediate ones are dropped as soon as possible
+    graph = OFnGraphScene(scene, workers=workers or os.cpu_count(), memoryPolicy=memory.MemoryRelease)
+    nodes = [x[0] for x in targets]
+    success = True
+
+    # the spans of all frames are written in one trace file
+    with (trace.record(tracePath) if tracePath else contextlib.nullcontext()):
+        for frame in (frames or [None]):
+            if frame is not None:
+                os.environ["FRAME"] = str(frame).zfill(padding)
+                print(f"Frame {frame}")
+
+            graph.evaluate(nodes)
+
+            peak = graph.memoryStats()["peakRSS"]
+            if peak is not None:
+                print(f"Peak RSS : {peak / (1024 * 1024):.1f} MiB")
+
+            if profileCount > 0:
+                print(profile.formatReport(graph.profileReport(limit=profileCount)))
+
+            failed = graph.failedNodes()
+            if failed:
+                success = False
+                for fn in failed:
+                    print(f"Error : '{fn.name()}' failed to evaluate")
+
+                continue
+
+            for n, out_path in targets:
+                filepath = param.expandPath(out_path)
+                try:
+                    with trace.span("write", cat="io", path=filepath):
+                        writeImage(filepath, graph.packet(n).data())
+                    print(f"Wrote {filepath}")
+                except Exception as e:
+                    success = False
+                    print(f"Error : {e}")
+
+    if tracePath:
+        print(f"Wrote trace {tracePath}")
+
+    return success
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("OFNE batch")
+    parser.add_argument("Scene", help="an ofsn file path to render")
+    parser.add_argument("-w", "--write", action="append", default=[], metavar="NODE=PATH", help="write the result of NODE to PATH, ${FRAME} is replaced with the current frame")
+    parser.add_argument("-f", "--frames", default=None, help="frames to render e.g. 1-10, 1-10x2, 1,5,7")
+    parser.add_argument("-s", "--set", action="append", default=[], metavar="NODE.PARAM=PATH", help="override a path parameter")
+    parser.add_argument("-p", "--padding", type=int, default=4, help="zero padding of ${FRAME}")
+    parser.add_argument("-t", "--threads", type=int, default=None, help="the number of threads evaluating independent nodes (default: all cores)")
+    parser.add_argument("-P", "--profile", type=int, default=0, metavar="COUNT", help="print the evaluation profile of the COUNT slowest nodes of each frame")
+    parser.add_argument("--trace", default=os.environ.get("OFNE_TRACE") or None, metavar="PATH", help="write a Chrome trace of the evaluations to PATH (default: $OFNE_TRACE)")
+    opts = parser.parse_args(argv)
+
+    try:
+        outputs = dict([_splitAssign(x) for x in opts.write])
+        overrides = dict([_splitAssign(x) for x in opts.set])
+        frames = parseFrames(opts.frames) if opts.frames else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not outputs:
+        parser.error("at least one --write is required")
+
+    return 0 if render(opts.Scene, outputs, frames=frames, overrides=overrides, padding=opts.padding, workers=opts.threads, profileCount=opts.profile, tracePath=opts.trace) else 1
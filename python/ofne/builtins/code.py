@@ -1,6 +1,9 @@
+import hashlib
+import threading
 import numpy
 import OpenImageIO
 import PyOpenColorIO
+from collections import OrderedDict
 from ofne import plugin
 
 
@@ -19,6 +22,74 @@ DefaultPythonExpression = """# Inputs - Automatically provided by the program
 outPacket = inPackets.packet(0)
 """
 
+DefaultPythonSetup = """# Setup - Runs once before the expression, the names defined here are visible to the expression
+# It runs again only when this code is changed, e.g. for lookup tables or kernels expensive to build
+# lut = np.linspace(0.0, 1.0, 4096, dtype=np.float32) ** 2.2
+"""
+
+MAX_CACHED_CODES = 256
+MAX_CACHED_SETUPS = 16
+
+_BASE_NAMESPACE = {"np": numpy, "oiio": OpenImageIO, "ocio": PyOpenColorIO, "Packet": plugin.OFnPacket}
+
+_CODES = OrderedDict()
+_SETUPS = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _sourceKey(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _lookup(cache, key, limit, factory):
+    # LRU of the compiled codes and the setup namespaces, the factory runs outside of the lock
+    with _LOCK:
+        v = cache.get(key)
+        if v is not None:
+            cache.move_to_end(key)
+            return v
+
+    v = factory()
+
+    with _LOCK:
+        v = cache.setdefault(key, v)
+        cache.move_to_end(key)
+        while (len(cache) > limit):
+            cache.popitem(last=False)
+
+    return v
+
+
+def _compile(source, filename):
+    # the code is compiled once for each source text
+    return _lookup(_CODES, (_sourceKey(source), filename), MAX_CACHED_CODES, lambda: compile(source, filename, "exec"))
+
+
+def _runSetup(source):
+    ns = dict(_BASE_NAMESPACE)
+    exec(_compile(source, "<setup>"), ns)
+
+    return ns
+
+
+def _setupNamespace(source):
+    # the names made by the setup code are kept until the code is changed
+    if not source or not source.strip():
+        return _BASE_NAMESPACE
+
+    return _lookup(_SETUPS, _sourceKey(source), MAX_CACHED_SETUPS, lambda: _runSetup(source))
+
+
+def _clearCodeCache():
+    with _LOCK:
+        _CODES.clear()
+        _SETUPS.clear()
+
+
+def _codeCacheStats():
+    with _LOCK:
+        return {"codes": len(_CODES), "setups": len(_SETUPS)}
+
 
 class PythonExpression(plugin.OFnOp):
     def __init__(self):
@@ -26,7 +97,8 @@ class PythonExpression(plugin.OFnOp):
 
     def params(self):
         return [
-            plugin.OFnParamCode("code", default=DefaultPythonExpression)
+            plugin.OFnParamCode("code", default=DefaultPythonExpression),
+            plugin.OFnParamCode("setup", default=DefaultPythonSetup)
         ]
 
     def needs(self):
@@ -35,13 +107,17 @@ class PythonExpression(plugin.OFnOp):
     def packetable(self):
         return True
 
-    def _eval(self, expression, inPackets):
-        eval_local = {"inPackets": inPackets, "Packet": plugin.OFnPacket}
-        eval_global = {"np": numpy, "oiio": OpenImageIO, "ocio": PyOpenColorIO}
+    def _eval(self, expression, inPackets, setup=None):
+        # a single namespace copied from the setup one, the names bound by the expression do not leak into the setup
+        # nor into the next evaluation, and the nodes sharing a setup can run on several threads at once
+        # the copy is shallow, the setup values are shared
+        code = _compile(expression, "<expression>")
+        ns = _setupNamespace(setup).copy()
+        ns["inPackets"] = inPackets
 
-        exec(expression, eval_global, eval_local)
+        exec(code, ns)
 
-        op = eval_local.get("outPacket")
+        op = ns.get("outPacket")
         if isinstance(op, plugin.OFnPacket):
             return op
         else:
@@ -53,7 +129,7 @@ class PythonExpression(plugin.OFnOp):
         if not exp:
             return plugin.OFnPacket()
 
-        op = self._eval(exp, packetArray)
+        op = self._eval(exp, packetArray, setup=params.get("setup"))
         if op:
             return op
         else:
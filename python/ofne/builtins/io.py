@@ -1,7 +1,115 @@
 from ofne import plugin
 import numpy as np
 import os
+import threading
 import OpenImageIO as oiio
+from collections import OrderedDict
+
+
+def _readCacheBudget():
+    try:
+        mb = float(os.environ.get("OFNE_READ_CACHE_MB", "1024"))
+    except ValueError:
+        mb = 1024
+
+    return int(max(0, mb) * 1024 * 1024)
+
+
+READ_CACHE_BUDGET = _readCacheBudget()
+
+_IMAGES = OrderedDict()
+_IMAGES_LOCK = threading.Lock()
+_IMAGES_BYTES = 0
+
+
+def _evictImages(budget):
+    global _IMAGES_BYTES
+
+    while (_IMAGES_BYTES > budget and _IMAGES):
+        _, pixels = _IMAGES.popitem(last=False)
+        _IMAGES_BYTES -= pixels.nbytes
+
+
+def _proxySize(width, height, proxy):
+    # the size of a MIP level, each level halves the size of the previous one
+    return (max(1, width // proxy), max(1, height // proxy))
+
+
+def _readProxyBuf(path, subimage, miplevel, proxy):
+    # the MIP level matching the proxy is read if the file has one, otherwise the nearest finer level is resized
+    inp = oiio.ImageInput.open(path)
+    if not inp:
+        raise Exception("Failed to open the image : {}".format(oiio.geterror()))
+
+    try:
+        spec = inp.spec_dimensions(subimage, miplevel)
+        size = _proxySize(spec.width, spec.height, proxy)
+        level = miplevel
+        for k in range(proxy.bit_length() - 1, 0, -1):
+            if inp.seek_subimage(subimage, miplevel + k):
+                level = miplevel + k
+                break
+
+        inp.geterror()
+    finally:
+        inp.close()
+
+    buf = oiio.ImageBuf(path, subimage, level)
+    if (buf.spec().width, buf.spec().height) != size:
+        buf = oiio.ImageBufAlgo.resize(buf, roi=oiio.ROI(0, size[0], 0, size[1], 0, 1, 0, buf.nchannels))
+
+    return buf
+
+
+def _readPixels(path, subimage=0, miplevel=0, proxy=1):
+    # decoded images are shared by the packets, a file is read again only when it is modified
+    global _IMAGES_BYTES
+
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size, subimage, miplevel, proxy)
+
+    with _IMAGES_LOCK:
+        pixels = _IMAGES.get(key)
+        if pixels is not None:
+            _IMAGES.move_to_end(key)
+            return pixels
+
+    with plugin.trace.span("read", cat="io", path=path, proxy=proxy):
+        if proxy > 1:
+            buf = _readProxyBuf(path, subimage, miplevel, proxy)
+        else:
+            buf = oiio.ImageBuf(path, subimage, miplevel)
+
+        pixels = buf.get_pixels(format=buf.pixeltype)
+
+    if buf.has_error:
+        raise Exception("Failed to read the image : {}".format(buf.geterror()))
+
+    pixels.flags.writeable = False
+
+    with _IMAGES_LOCK:
+        for k in [x for x in _IMAGES.keys() if x[0] == path and x[3:] == key[3:]]:
+            _IMAGES_BYTES -= _IMAGES.pop(k).nbytes
+
+        if pixels.nbytes <= READ_CACHE_BUDGET:
+            _IMAGES[key] = pixels
+            _IMAGES_BYTES += pixels.nbytes
+            _evictImages(READ_CACHE_BUDGET)
+
+    return pixels
+
+
+def _clearImageCache():
+    global _IMAGES_BYTES
+
+    with _IMAGES_LOCK:
+        _IMAGES.clear()
+        _IMAGES_BYTES = 0
+
+
+def _imageCacheStats():
+    with _IMAGES_LOCK:
+        return {"entries": len(_IMAGES), "bytes": _IMAGES_BYTES, "budget": READ_CACHE_BUDGET}
 
 
 class ReadImage(plugin.OFnOp):
@@ -28,9 +136,7 @@ class ReadImage(plugin.OFnOp):
         if not os.path.isfile(path):
             raise Exception("No such image file : {}".format(path))
 
-        buf = oiio.ImageBuf(path)
-
-        return plugin.OFnPacket(data=buf.get_pixels(format=buf.pixeltype))
+        return plugin.OFnPacket(data=_readPixels(path, proxy=packetArray.proxy()))
 
 
 class ConstantImage(plugin.OFnOp):
@@ -54,11 +160,13 @@ class ConstantImage(plugin.OFnOp):
         return True
 
     def operate(self, params, packetArray):
+        width, height = _proxySize(params.get("width"), params.get("height"), packetArray.proxy())
+
         return plugin.OFnPacket(
             data=np.full(
                 (
-                    params.get("height"),
-                    params.get("width"),
+                    height,
+                    width,
                     4
                 ),
                 [
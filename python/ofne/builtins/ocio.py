@@ -1,7 +1,13 @@
+import os
 import re
+import functools
+import threading
 import numpy as np
 import PyOpenColorIO as ocio
+from collections import OrderedDict
+from concurrent import futures
 from ofne import plugin
+from ofne import exceptions
 
 
 RAW_CONFIG = ocio.Config.CreateRaw()
@@ -42,6 +48,58 @@ INTERP_MAP = {
 
 BUILTIN_TRANSFORMS = [x[0] for x in ocio.BuiltinTransformRegistry().getBuiltins()]
 
+MAX_CACHED_CONFIGS = 8
+MAX_CACHED_PROCESSORS = 64
+
+_PROCESSORS = OrderedDict()
+_PROCESSORS_LOCK = threading.Lock()
+_LUT_STAMPS = {}
+
+
+def _applyThreads():
+    try:
+        n = int(os.environ.get("OFNE_OCIO_THREADS", "0"))
+    except ValueError:
+        n = 0
+
+    return n if n > 0 else (os.cpu_count() or 1)
+
+
+APPLY_THREADS = _applyThreads()
+APPLY_MIN_ROWS = 64
+
+_APPLY_POOL = None
+_APPLY_POOL_LOCK = threading.Lock()
+
+
+def _applyPool():
+    global _APPLY_POOL
+
+    with _APPLY_POOL_LOCK:
+        if _APPLY_POOL is None:
+            _APPLY_POOL = futures.ThreadPoolExecutor(max_workers=APPLY_THREADS, thread_name_prefix="ofne_ocio")
+
+        return _APPLY_POOL
+
+
+def _apply(proc, data):
+    # split the image into row bands and apply the processor to them in place on the thread pool
+    h, w, c = data.shape
+    bands = min(APPLY_THREADS, h // APPLY_MIN_ROWS)
+
+    if bands <= 1 or not data.flags.c_contiguous:
+        func = proc.applyRGB if c == 3 else proc.applyRGBA
+        func(data)
+        return
+
+    rows = (h + bands - 1) // bands
+
+    def _band(y):
+        band = data[y:y + rows]
+        proc.apply(ocio.PackedImageDesc(band, w, band.shape[0], c))
+
+    list(_applyPool().map(_band, range(0, h, rows)))
+
 
 def _validPacketData(data):
     shape = data.shape
@@ -54,7 +112,36 @@ def _validPacketData(data):
     return True
 
 
-def _getOCIO(path):
+def _fileStamp(path):
+    if os.path.isfile(path):
+        return os.path.getmtime(path)
+
+    return None
+
+
+def _lutStamp(path):
+    stamp = _fileStamp(path)
+
+    with _PROCESSORS_LOCK:
+        if path in _LUT_STAMPS and _LUT_STAMPS[path] != stamp:
+            # ocio keeps the contents of LUT files by their path
+            ocio.ClearAllCaches()
+            RAW_CONFIG.clearProcessorCache()
+
+        _LUT_STAMPS[path] = stamp
+
+    return stamp
+
+
+def _configKey(path):
+    if re.match(r"^builtin\:", path):
+        return (path, None)
+
+    return (path, _fileStamp(path))
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_CONFIGS)
+def _loadOCIO(path, stamp):
     if re.match(r"^builtin\:", path):
         path = re.sub(r"^builtin\:", "", path)
         return ocio.Config.CreateFromBuiltinConfig(path)
@@ -62,6 +149,49 @@ def _getOCIO(path):
         return ocio.Config.CreateFromFile(path)
 
 
+def _getOCIO(path):
+    # a config file is parsed again only when it is modified
+    return _loadOCIO(*_configKey(path))
+
+
+def _getProcessor(key, factory):
+    with _PROCESSORS_LOCK:
+        proc = _PROCESSORS.get(key)
+        if proc is not None:
+            _PROCESSORS.move_to_end(key)
+            return proc
+
+    proc = factory()
+
+    with _PROCESSORS_LOCK:
+        _PROCESSORS[key] = proc
+        while (len(_PROCESSORS) > MAX_CACHED_PROCESSORS):
+            _PROCESSORS.popitem(last=False)
+
+    return proc
+
+
+def _getFusedProcessor(procs):
+    # procs : [(key, factory of ocio.Processor), ...], the transforms are combined into a single cpu processor
+    if len(procs) == 1:
+        key, factory = procs[0]
+        return _getProcessor(key, lambda: factory().getDefaultCPUProcessor())
+
+    def _make():
+        grp = ocio.GroupTransform([x[1]().createGroupTransform() for x in procs])
+        return RAW_CONFIG.getProcessor(grp).getDefaultCPUProcessor()
+
+    return _getProcessor(tuple([x[0] for x in procs]), _make)
+
+
+def _clearCaches():
+    _loadOCIO.cache_clear()
+
+    with _PROCESSORS_LOCK:
+        _PROCESSORS.clear()
+        _LUT_STAMPS.clear()
+
+
 def _getColorSpaceName(config, inpt):
     global AKA
 
@@ -74,11 +204,13 @@ def _getColorSpaceName(config, inpt):
     return inpt
 
 
-def _forceType(src):
-    org_dt = None
+def _forceType(packet):
+    org_dt = packet.storageType()
+    src = packet.data()
 
     if src.dtype == np.float32:
-        return (src, None)
+        # ocio applies the transform in place, the working data of the upstream ocio node is used as is
+        return (packet.mutableData(), org_dt)
 
     org_dt = src.dtype
     nd = src.astype(np.float32)
@@ -93,26 +225,55 @@ def _forceType(src):
     return (nd, org_dt)
 
 
-def _revertType(src, org_dt):
-    if org_dt is None:
-        return src
+class _OCIOOp(object):
+    def needs(self):
+        return 1
+
+    def packetable(self):
+        return True
 
-    nd = src
-    if np.issubdtype(org_dt, np.floating):
-        type_info = np.finfo(org_dt)
-        if type_info.bits < 32:
-            nd = np.clip(nd, type_info.min, type_info.max)
+    def tileable(self):
+        return True
 
-        return nd.astype(org_dt)
+    def fuseGroup(self):
+        return "ocio"
 
-    else:
-        type_info = np.iinfo(org_dt)
-        nd = np.clip(nd * np.float64(type_info.max), type_info.min, type_info.max)
+    def acceptsWorkingData(self):
+        return True
+
+    def _processor(self, params):
+        # returns (cache key, factory of ocio.Processor) or None if the params are incomplete
+        raise exceptions.OFnNotImplementedError(self, "_processor")
+
+    def operate(self, params, packetArray):
+        return self.operateFused([(self, params)], packetArray)
+
+    def operateFused(self, steps, packetArray):
+        inp = packetArray.packet(0)
+        d = inp.data()
+
+        if not _validPacketData(d):
+            return plugin.OFnPacket()
+
+        procs = []
+        for op, params in steps:
+            p = op._processor(params)
+            if p is None:
+                return plugin.OFnPacket()
 
-        return nd.astype(org_dt)
+            procs.append(p)
 
+        proc = _getFusedProcessor(procs)
 
-class OCIOMatrixTransform(plugin.OFnOp):
+        d, org_dt = _forceType(inp)
+
+        _apply(proc, d)
+
+        # the data stays in float32 until a node not taking the working data needs it
+        return plugin.OFnPacket(data=d, storageType=org_dt)
+
+
+class OCIOMatrixTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOMatrixTransform, self).__init__()
 
@@ -141,20 +302,7 @@ class OCIOMatrixTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
+    def _processor(self, params):
         matrix = [
             params.get("m00"),
             params.get("m01"),
@@ -180,24 +328,22 @@ class OCIOMatrixTransform(plugin.OFnOp):
             params.get("offset3")
         ]
 
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(
-            ocio.MatrixTransform(
-                matrix=matrix,
-                offset=offset,
-                direction=direction
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
+
+        return (
+            ("MatrixTransform", tuple(matrix), tuple(offset), inverse),
+            lambda: RAW_CONFIG.getProcessor(
+                ocio.MatrixTransform(
+                    matrix=matrix,
+                    offset=offset,
+                    direction=direction
+                )
             )
-        ).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        )
 
 
-class OCIOAllocationUniformTransform(plugin.OFnOp):
+class OCIOAllocationUniformTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOAllocationUniformTransform, self).__init__()
 
@@ -208,41 +354,27 @@ class OCIOAllocationUniformTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
+    def _processor(self, params):
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
+        alloc_vars = [
+            params.get("min"),
+            params.get("max")
+        ]
 
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(
-            ocio.AllocationTransform(
-                ocio.ALLOCATION_UNIFORM,
-                vars=[
-                    params.get("min"),
-                    params.get("max")
-                ],
-                direction=direction
+        return (
+            ("AllocationUniformTransform", tuple(alloc_vars), inverse),
+            lambda: RAW_CONFIG.getProcessor(
+                ocio.AllocationTransform(
+                    ocio.ALLOCATION_UNIFORM,
+                    vars=alloc_vars,
+                    direction=direction
+                )
             )
-        ).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        )
 
 
-class OCIOAllocationLog2Transform(plugin.OFnOp):
+class OCIOAllocationLog2Transform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOAllocationLog2Transform, self).__init__()
 
@@ -254,42 +386,28 @@ class OCIOAllocationLog2Transform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
+    def _processor(self, params):
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
+        alloc_vars = [
+            params.get("min"),
+            params.get("max"),
+            params.get("offset")
+        ]
 
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(
-            ocio.AllocationTransform(
-                ocio.ALLOCATION_LG2,
-                vars=[
-                    params.get("min"),
-                    params.get("max"),
-                    params.get("offset")
-                ],
-                direction=direction
+        return (
+            ("AllocationLog2Transform", tuple(alloc_vars), inverse),
+            lambda: RAW_CONFIG.getProcessor(
+                ocio.AllocationTransform(
+                    ocio.ALLOCATION_LG2,
+                    vars=alloc_vars,
+                    direction=direction
+                )
             )
-        ).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        )
 
 
-class OCIOFileTransform(plugin.OFnOp):
+class OCIOFileTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOFileTransform, self).__init__()
 
@@ -301,39 +419,28 @@ class OCIOFileTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(
-            ocio.FileTransform(
-                src=params.get("src"),
-                cccId=params.get("cccId"),
-                interpolation=INTERP_MAP[params.get("interpolation")],
-                direction=direction
+    def _processor(self, params):
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
+        src = params.get("src")
+        cccid = params.get("cccId")
+        interp = params.get("interpolation")
+
+        # the LUT is loaded again only when the file is modified
+        return (
+            ("FileTransform", src, _lutStamp(src), cccid, interp, inverse),
+            lambda: RAW_CONFIG.getProcessor(
+                ocio.FileTransform(
+                    src=src,
+                    cccId=cccid,
+                    interpolation=INTERP_MAP[interp],
+                    direction=direction
+                )
             )
-        ).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        )
 
 
-class OCIOExponentTransform(plugin.OFnOp):
+class OCIOExponentTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOExponentTransform, self).__init__()
 
@@ -343,33 +450,18 @@ class OCIOExponentTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
+    def _processor(self, params):
         gamma = params.get("gamma")
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(ocio.ExponentTransform(value=[gamma, gamma, gamma, 1.0], negativeStyle=ocio.NEGATIVE_CLAMP, direction=direction)).getDefaultCPUProcessor()
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
 
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("ExponentTransform", gamma, inverse),
+            lambda: RAW_CONFIG.getProcessor(ocio.ExponentTransform(value=[gamma, gamma, gamma, 1.0], negativeStyle=ocio.NEGATIVE_CLAMP, direction=direction))
+        )
 
 
-class OCIOExponentWithLinearTransform(plugin.OFnOp):
+class OCIOExponentWithLinearTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOExponentWithLinearTransform, self).__init__()
 
@@ -380,34 +472,19 @@ class OCIOExponentWithLinearTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
+    def _processor(self, params):
         gamma = params.get("gamma")
         offset = params.get("offset")
-        direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
-        proc = RAW_CONFIG.getProcessor(ocio.ExponentWithLinearTransform(gamma=[gamma, gamma, gamma, 1], offset=[offset, offset, offset, 0], negativeStyle=ocio.NEGATIVE_LINEAR, direction=direction)).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
+        inverse = params.get("inverse")
+        direction = ocio.TRANSFORM_DIR_INVERSE if inverse else ocio.TRANSFORM_DIR_FORWARD
 
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("ExponentWithLinearTransform", gamma, offset, inverse),
+            lambda: RAW_CONFIG.getProcessor(ocio.ExponentWithLinearTransform(gamma=[gamma, gamma, gamma, 1], offset=[offset, offset, offset, 0], negativeStyle=ocio.NEGATIVE_LINEAR, direction=direction))
+        )
 
 
-class OCIOExposureContrastTransform(plugin.OFnOp):
+class OCIOExposureContrastTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOExposureContrastTransform, self).__init__()
 
@@ -422,41 +499,34 @@ class OCIOExposureContrastTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        ocio.ExposureContrastTransform()
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
-        trn = ocio.ExposureContrastTransform(
-            exposure=params.get("exposure"),
-            contrast=params.get("contrast"),
-            gamma=params.get("gamma"),
-            pivot=params.get("pivot"),
-            logExposureStep=params.get("logExposureStep"),
-            logMidGray=params.get("logMidGray"),
-            direction=ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
+    def _processor(self, params):
+        values = (
+            params.get("exposure"),
+            params.get("contrast"),
+            params.get("gamma"),
+            params.get("pivot"),
+            params.get("logExposureStep"),
+            params.get("logMidGray"),
+            params.get("inverse")
         )
-        proc = RAW_CONFIG.getProcessor(trn).getDefaultCPUProcessor()
 
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
+        def _make():
+            trn = ocio.ExposureContrastTransform(
+                exposure=values[0],
+                contrast=values[1],
+                gamma=values[2],
+                pivot=values[3],
+                logExposureStep=values[4],
+                logMidGray=values[5],
+                direction=ocio.TRANSFORM_DIR_INVERSE if values[6] else ocio.TRANSFORM_DIR_FORWARD
+            )
 
-        d = _revertType(d, org_dt)
+            return RAW_CONFIG.getProcessor(trn)
 
-        return plugin.OFnPacket(data=d)
+        return (("ExposureContrastTransform", ) + values, _make)
 
 
-class OCIOColorSpaceTransform(plugin.OFnOp):
+class OCIOColorSpaceTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOColorSpaceTransform, self).__init__()
 
@@ -467,41 +537,25 @@ class OCIOColorSpaceTransform(plugin.OFnOp):
             plugin.OFnParamStr("to", "", valueList=list(AKA.keys()), enforceValueList=False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
+    def _processor(self, params):
         config_path = params.get("config")
         src = params.get("from")
         dst = params.get("to")
 
         if not config_path or not src or not dst:
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
+            return None
 
         config = _getOCIO(config_path)
         src = _getColorSpaceName(config, src)
         dst = _getColorSpaceName(config, dst)
-        proc = config.getProcessor(src, dst).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
 
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("ColorSpaceTransform", _configKey(config_path), src, dst),
+            lambda: config.getProcessor(src, dst)
+        )
 
 
-class OCIODisplayViewTransform(plugin.OFnOp):
+class OCIODisplayViewTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIODisplayViewTransform, self).__init__()
 
@@ -514,42 +568,25 @@ class OCIODisplayViewTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
+    def _processor(self, params):
         config_path = params.get("config")
         src = params.get("from")
         display = params.get("display")
         view = params.get("view")
         direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
         if not config_path or not src or not display or not view:
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
+            return None
 
         config = _getOCIO(config_path)
         src = _getColorSpaceName(config, src)
-        proc = None
-        proc = config.getProcessor(src, display, view, direction).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
 
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("DisplayViewTransform", _configKey(config_path), src, display, view, params.get("inverse")),
+            lambda: config.getProcessor(src, display, view, direction)
+        )
 
 
-class OCIONamedTransform(plugin.OFnOp):
+class OCIONamedTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIONamedTransform, self).__init__()
 
@@ -560,43 +597,25 @@ class OCIONamedTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
+    def _processor(self, params):
         config_path = params.get("config")
         name = params.get("name")
         direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
 
         if not config_path or not name:
-            return plugin.OFnPacket()
+            return None
 
         config = _getOCIO(config_path)
         if config is None:
-            return plugin.OFnPacket()
+            return None
 
-        d, org_dt = _forceType(d)
-
-        nt = config.getNamedTransform(name)
-        proc = config.getProcessor(nt, direction).getDefaultCPUProcessor()
-
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("NamedTransform", _configKey(config_path), name, params.get("inverse")),
+            lambda: config.getProcessor(config.getNamedTransform(name), direction)
+        )
 
 
-class OCIOBuiltinTransform(plugin.OFnOp):
+class OCIOBuiltinTransform(_OCIOOp, plugin.OFnOp):
     def __init__(self):
         super(OCIOBuiltinTransform, self).__init__()
 
@@ -606,31 +625,14 @@ class OCIOBuiltinTransform(plugin.OFnOp):
             plugin.OFnParamBool("inverse", False)
         ]
 
-    def needs(self):
-        return 1
-
-    def packetable(self):
-        return True
-
-    def operate(self, params, packetArray):
-        d = packetArray.packet(0).data()
-
-        if not _validPacketData(d):
-            return plugin.OFnPacket()
-
+    def _processor(self, params):
         name = params.get("name")
         direction = ocio.TRANSFORM_DIR_INVERSE if params.get("inverse") else ocio.TRANSFORM_DIR_FORWARD
 
         if not name:
-            return plugin.OFnPacket()
-
-        d, org_dt = _forceType(d)
-
-        proc = RAW_CONFIG.getProcessor(ocio.BuiltinTransform(name), direction).getDefaultCPUProcessor()
+            return None
 
-        func = proc.applyRGB if d.shape[2] == 3 else proc.applyRGBA
-        func(d)
-
-        d = _revertType(d, org_dt)
-
-        return plugin.OFnPacket(data=d)
+        return (
+            ("BuiltinTransform", name, params.get("inverse")),
+            lambda: RAW_CONFIG.getProcessor(ocio.BuiltinTransform(name), direction)
+        )
@@ -13,24 +13,30 @@ class Viewer(plugin.OFnOp):
     def needs(self):
         return 1
 
+    def acceptsWorkingData(self):
+        return True
+
     def packetable(self):
         return False
 
     def operate(self, params, packetArray):
         p = packetArray.packet(0)
         d = p.data()
+        # the viewport scales a proxy image up to its full size
+        metadata = p.metadata()
+        metadata[resource.ProxyKey] = packetArray.proxy()
         if d.dtype != numpy.float32:
             if numpy.issubdtype(d.dtype, numpy.integer):
                 invf = numpy.float64(1 / float(numpy.iinfo(d.dtype).max))
-                resource.OFnViewResource().dump(plugin.OFnPacket(data=(d * invf).astype(numpy.float32), metadata=p.metadata()))
+                resource.OFnViewResource().dump(plugin.OFnPacket(data=(d * invf).astype(numpy.float32), metadata=metadata))
             elif d.dtype == numpy.float64:
                 f32 = numpy.finfo(numpy.float32)
                 d = numpy.clip(d, f32.min, f32.max)
-                resource.OFnViewResource().dump(plugin.OFnPacket(data=d.astype(numpy.float32), metadata=p.metadata()))
+                resource.OFnViewResource().dump(plugin.OFnPacket(data=d.astype(numpy.float32), metadata=metadata))
             else:
-                resource.OFnViewResource().dump(plugin.OFnPacket(data=d.astype(numpy.float32), metadata=p.metadata()))
+                resource.OFnViewResource().dump(plugin.OFnPacket(data=d.astype(numpy.float32), metadata=metadata))
         else:
-            resource.OFnViewResource().dump(p)
+            resource.OFnViewResource().dump(plugin.OFnPacket(data=d, metadata=metadata, storageType=p.storageType()))
 
     def unique(self):
         return True
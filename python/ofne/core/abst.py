@@ -44,6 +44,15 @@ class _NodeBase(object):
     def packetable(self):
         raise OFnNotImplementedError(self, "packetable")
 
+    def tileable(self):
+        raise OFnNotImplementedError(self, "tileable")
+
+    def acceptsWorkingData(self):
+        raise OFnNotImplementedError(self, "acceptsWorkingData")
+
+    def generation(self):
+        raise OFnNotImplementedError(self, "generation")
+
     def inputs(self):
         raise OFnNotImplementedError(self, "inputs")
 
@@ -62,6 +71,12 @@ class _NodeBase(object):
     def operate(self, packetArray):
         raise OFnNotImplementedError(self, "operate")
 
+    def fuseGroup(self):
+        raise OFnNotImplementedError(self, "fuseGroup")
+
+    def operateFused(self, nodes, packetArray):
+        raise OFnNotImplementedError(self, "operateFused")
+
     def userDataKeys(self):
         raise OFnNotImplementedError(self, "userDataKeys")
 
@@ -115,6 +130,20 @@ class _SceneBase(object):
     def clear(self):
         raise OFnNotImplementedError(self, "clear")
 
+    def nodeChanged(self, node):
+        # called by the nodes of the scene, scenes not tracking the changes can ignore it
+        pass
+
+    def nodeRenamed(self, node, oldName):
+        # called by the nodes of the scene, scenes not indexing the names can ignore it
+        pass
+
+    def addChangeCallback(self, func):
+        raise OFnNotImplementedError(self, "addChangeCallback")
+
+    def removeChangeCallback(self, func):
+        raise OFnNotImplementedError(self, "removeChangeCallback")
+
 
 class _OpBase(object):
     def __init__(self):
@@ -133,9 +162,21 @@ class _OpBase(object):
     def packetable(self):
         raise OFnNotImplementedError(self, "packetable")
 
+    def tileable(self):
+        raise OFnNotImplementedError(self, "tileable")
+
+    def acceptsWorkingData(self):
+        raise OFnNotImplementedError(self, "acceptsWorkingData")
+
     def operate(self, params, packetArray):
         raise OFnNotImplementedError(self, "operate")
 
+    def fuseGroup(self):
+        raise OFnNotImplementedError(self, "fuseGroup")
+
+    def operateFused(self, steps, packetArray):
+        raise OFnNotImplementedError(self, "operateFused")
+
 
 class _OpManagerBase(object):
     def __init__(self):
@@ -170,6 +211,15 @@ class _PacketBase(object):
     def data(self):
         raise OFnNotImplementedError(self, "data")
 
+    def mutableData(self):
+        raise OFnNotImplementedError(self, "mutableData")
+
+    def storageType(self):
+        raise OFnNotImplementedError(self, "storageType")
+
+    def resolved(self):
+        raise OFnNotImplementedError(self, "resolved")
+
 
 class _PacketArrayBase(object):
     def __init__(self):
@@ -181,6 +231,9 @@ class _PacketArrayBase(object):
     def packet(self, index):
         raise OFnNotImplementedError(self, "packet")
 
+    def proxy(self):
+        raise OFnNotImplementedError(self, "proxy")
+
 
 class _ParamBase(object):
     def __init__(self, name, default, label=None):
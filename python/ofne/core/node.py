@@ -31,7 +31,10 @@ class OFnNode(abst._NodeBase):
         return self.__name
 
     def rename(self, newName):
+        old_name = self.__name
         self.__name = self.__scene.getUniqueName(newName)
+        if old_name is not None:
+            self.__scene.nodeRenamed(self, old_name)
 
         return self.__name
 
@@ -45,7 +48,8 @@ class OFnNode(abst._NodeBase):
         return self.__impl.getParamValue(name, default=default, raw=raw)
 
     def setParamValue(self, name, value):
-        self.__impl.setParamValue(name, value)
+        if self.__impl.setParamValue(name, value):
+            self.__scene.nodeChanged(self)
 
     def needs(self):
         return self.__impl.needs()
@@ -53,6 +57,16 @@ class OFnNode(abst._NodeBase):
     def packetable(self):
         return self.__impl.packetable()
 
+    def tileable(self):
+        return self.__impl.tileable()
+
+    def acceptsWorkingData(self):
+        return self.__impl.acceptsWorkingData()
+
+    def generation(self):
+        # increased whenever the params, the inputs or the bypass state are changed
+        return self.__impl.generation()
+
     def inputs(self):
         inpts = []
         for i in self.__impl.inputs():
@@ -72,17 +86,49 @@ class OFnNode(abst._NodeBase):
         return oupts
 
     def connect(self, src, index=0):
-        return self.__impl.connectInput(index, src.__impl)
+        org = self.__impl.generation()
+        res = self.__impl.connectInput(index, src.__impl)
+        if self.__impl.generation() != org:
+            self.__scene.nodeChanged(self)
+
+        return res
+
+    @staticmethod
+    def connectTrusted(connections):
+        # connections : [(dst, src, index), ...], cycles are checked once for all of them
+        if not _node.connectTrusted([(dst.__impl, index, src.__impl) for dst, src, index in connections]):
+            return False
+
+        for dst in set([x[0] for x in connections]):
+            dst.__scene.nodeChanged(dst)
+
+        return True
 
     def disconnect(self, index=0):
-        return self.__impl.disconnectInput(index)
+        res = self.__impl.disconnectInput(index)
+        if res:
+            self.__scene.nodeChanged(self)
+
+        return res
 
     def disconnectAll(self):
-        return self.__impl.disconnectAllInputs()
+        org = self.__impl.generation()
+        res = self.__impl.disconnectAllInputs()
+        if self.__impl.generation() != org:
+            self.__scene.nodeChanged(self)
+
+        return res
 
     def operate(self, packetArray):
         return self.__impl.operate(packetArray)
 
+    def fuseGroup(self):
+        return self.__impl.fuseGroup()
+
+    def operateFused(self, nodes, packetArray):
+        # operate the given upstream nodes and then this node as a single operation
+        return self.__impl.operateFused([x.__impl for x in nodes], packetArray)
+
     def userDataKeys(self):
         return self.__impl.userDataKeys()
 
@@ -102,4 +148,99 @@ class OFnNode(abst._NodeBase):
         return self.__bypassed
 
     def setByPassed(self, b):
+        if self.__bypassed == b:
+            return
+
         self.__bypassed = b
+        self.__impl._touch()
+        self.__scene.nodeChanged(self)
+
+    def snapshot(self):
+        # a frozen copy of the params, the bypass state and the generation, the inputs are set by OFnSceneSnapshot
+        op, params = self.__impl._fuseStep()
+
+        return OFnNodeSnapshot(self.id(), self.type(), self.name(), op, params, self.__bypassed, self.__impl.generation())
+
+
+class OFnNodeSnapshot(abst._NodeBase):
+    def __init__(self, id, type, name, op, params, byPassed, generation):
+        super(OFnNodeSnapshot, self).__init__()
+        self.__id = id
+        self.__type = type
+        self.__name = name
+        self.__op = op
+        self.__params = params
+        self.__bypassed = byPassed
+        self.__generation = generation
+        self.__inputs = [None] * op.needs()
+        self.__outputs = []
+
+    def id(self):
+        return self.__id
+
+    def __hash__(self):
+        return hash(self.__id)
+
+    def __eq__(self, other):
+        return isinstance(other, OFnNodeSnapshot) and other.id() == self.__id
+
+    def __neq__(self, other):
+        return not self.__eq__(other)
+
+    def type(self):
+        return self.__type
+
+    def name(self):
+        return self.__name
+
+    def paramNames(self):
+        return self.__params.keys()
+
+    def getParam(self, name):
+        return self.__params.getParam(name)
+
+    def getParamValue(self, name, default=None, raw=False):
+        return self.__params.get(name, default=default, raw=raw)
+
+    def needs(self):
+        return self.__op.needs()
+
+    def packetable(self):
+        return self.__op.packetable()
+
+    def tileable(self):
+        return self.__op.tileable()
+
+    def acceptsWorkingData(self):
+        return self.__op.acceptsWorkingData()
+
+    def generation(self):
+        return self.__generation
+
+    def inputs(self):
+        return self.__inputs[:]
+
+    def outputs(self):
+        return self.__outputs[:]
+
+    def _link(self, index, src):
+        self.__inputs[index] = src
+        if self not in src.__outputs:
+            src.__outputs.append(self)
+
+    def operate(self, packetArray):
+        return self.__op.operate(self.__params.copy(), packetArray)
+
+    def fuseGroup(self):
+        return self.__op.fuseGroup()
+
+    def _fuseStep(self):
+        return (self.__op, self.__params.copy())
+
+    def operateFused(self, nodes, packetArray):
+        steps = [x._fuseStep() for x in nodes] + [self._fuseStep()]
+
+        return self.__op.operateFused(steps, packetArray)
+
+    def getByPassed(self):
+        return self.__bypassed
@@ -22,5 +22,21 @@ class OFnOp(abst._OpBase):
     def operate(self, params, packetArray):
         raise exceptions.OFnNotImplementedError(self, "operate")
 
+    def tileable(self):
+        # pixel-local ops can be evaluated on a cropped region of the inputs
+        return False
+
+    def acceptsWorkingData(self):
+        # ops taking float32 packets which are not converted back to their storage type yet
+        return False
+
+    def fuseGroup(self):
+        # consecutive ops of the same group can be evaluated at once by operateFused
+        return None
+
+    def operateFused(self, steps, packetArray):
+        # steps : [(op, params), ...] from upstream to downstream, packetArray : the inputs of the first step
+        raise exceptions.OFnNotImplementedError(self, "operateFused")
+
     def unique(self):
         return False
@@ -1,14 +1,41 @@
-import copy
 import numpy as np
 from . import abst
+from . import trace
 from .. import exceptions
 
 
+def _readOnlyView(data):
+    v = data.view()
+    v.flags.writeable = False
+
+    return v
+
+
+def toStorageType(data, dtype):
+    # convert normalized float32 working data back to the given type
+    dtype = np.dtype(dtype)
+    if data.dtype == dtype:
+        return data
+
+    if np.issubdtype(dtype, np.floating):
+        type_info = np.finfo(dtype)
+        if type_info.bits < 32:
+            data = np.clip(data, type_info.min, type_info.max)
+
+        return data.astype(dtype)
+
+    type_info = np.iinfo(dtype)
+
+    return np.rint(np.clip(data * np.float64(type_info.max), type_info.min, type_info.max)).astype(dtype)
+
+
 class OFnPacket(abst._PacketBase):
-    def __init__(self, metadata=None, data=None):
+    def __init__(self, metadata=None, data=None, storageType=None):
         super(OFnPacket, self).__init__()
         self.__metadata = {}
-        self.__data = np.array([])
+        self.__data = None
+        self.__storage_type = None
+        self.__resolved = None
 
         if isinstance(metadata, dict):
             self.__metadata = metadata.copy()
@@ -16,31 +43,64 @@ class OFnPacket(abst._PacketBase):
             raise exceptions.OFnInvalidArgumentError(dict, metadata)
 
         if isinstance(data, np.ndarray):
-            self.__data = data.copy()
+            # the packet does not copy the given array, it keeps a read-only view of it
+            # the span args are not made unless tracing, a packet is made for every node
+            if trace.isEnabled():
+                with trace.span("packet", cat="packet", shape=data.shape, dtype=str(data.dtype)):
+                    self.__data = _readOnlyView(data)
+            else:
+                self.__data = _readOnlyView(data)
         elif data is not None:
             raise exceptions.OFnInvalidArgumentError(np.ndarray, data)
+        else:
+            self.__data = _readOnlyView(np.array([]))
+
+        if storageType is not None and np.dtype(storageType) != self.__data.dtype:
+            self.__storage_type = np.dtype(storageType)
 
     def copy(self):
-        return OFnPacket(metadata=self.__metadata, data=self.__data)
+        # the data is read-only so both packets can share it
+        return OFnPacket(metadata=self.__metadata, data=self.__data, storageType=self.__storage_type)
 
     def metadata(self):
-        return copy.deepcopy(self.__metadata)
+        return self.__metadata.copy()
 
     def data(self):
-        return self.__data.copy()
+        return self.__data
+
+    def mutableData(self):
+        with trace.span("copy", cat="packet", bytes=self.__data.nbytes):
+            return self.__data.copy()
+
+    def storageType(self):
+        # None unless the data is kept in the float32 working representation of another type
+        return self.__storage_type
+
+    def resolved(self):
+        if self.__storage_type is None:
+            return self
+
+        if self.__resolved is None:
+            with trace.span("resolve", cat="packet", dtype=str(self.__storage_type)):
+                self.__resolved = OFnPacket(metadata=self.__metadata, data=toStorageType(self.__data, self.__storage_type))
+
+        return self.__resolved
 
 
 class OFnPacketArray(abst._PacketArrayBase):
-    def __init__(self, packets):
+    def __init__(self, packets, proxy=1):
         super(OFnPacketArray, self).__init__()
         if not isinstance(packets, list):
             raise exceptions.OFnInvalidArgumentError(list, packets)
         for fp in packets:
             if not isinstance(fp, OFnPacket):
                 raise exceptions.OFnInvalidArgumentError(OFnPacket, fp)
+        if not isinstance(proxy, int):
+            raise exceptions.OFnInvalidArgumentError(int, proxy)
 
         self.__packets = packets[:]
         self.__count = len(packets)
+        self.__proxy = max(1, proxy)
 
     def count(self):
         return self.__count
@@ -50,3 +110,7 @@ class OFnPacketArray(abst._PacketArrayBase):
             return OFnPacket()
 
         return self.__packets[index]
+
+    def proxy(self):
+        # the images are evaluated at 1 / proxy of their size, source ops read or make smaller images
+        return self.__proxy
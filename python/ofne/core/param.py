@@ -14,6 +14,16 @@ ParamTypeCode = 5
 RE_ENV = re.compile("[$][{](?P<name>[a-zA-Z0-9-_]+)[}]")
 
 
+def expandPath(v):
+    envs = set(RE_ENV.findall(v))
+
+    for env in envs:
+        if env in os.environ:
+            v = v.replace("${" + env + "}", os.environ[env])
+
+    return v
+
+
 class OFnParamBase(abst._ParamBase):
     def __init__(self, name, default, label=None):
         super(OFnParamBase, self).__init__(name, default, label=label)
@@ -117,14 +127,7 @@ class OFnParamPath(OFnParamStr):
         return self.__path_type
 
     def path(self):
-        v = self.get()
-        envs = set(RE_ENV.findall(v))
-
-        for env in envs:
-            if env in os.environ:
-                v = v.replace("${" + env + "}", os.environ[env])
-
-        return v
+        return expandPath(self.get())
 
     def copy(self):
         n = OFnParamPath(self.name(), default=self.default(), label=self.label(), valueList=self.valueList(), pathType=self.pathType())
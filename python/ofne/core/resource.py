@@ -1,7 +1,15 @@
 import uuid
+import threading
 from .packet import OFnPacket
 
 
+ProxyKey = "ofne:proxy"
+
+# a coarse image is shown while the full pass is running
+PassFinal = 0
+PassCoarse = 1
+
+
 class OFnViewResource(object):
     __Instance = None
 
@@ -10,6 +18,9 @@ class OFnViewResource(object):
             OFnViewResource.__Instance = super(OFnViewResource, self).__new__(self)
             OFnViewResource.__Instance.__packet = OFnPacket()
             OFnViewResource.__Instance.__stamp = uuid.uuid4()
+            OFnViewResource.__Instance.__lock = threading.Lock()
+            OFnViewResource.__Instance.__pass = PassFinal
+            OFnViewResource.__Instance.__packet_pass = PassFinal
 
         return OFnViewResource.__Instance
 
@@ -17,11 +28,30 @@ class OFnViewResource(object):
         super(OFnViewResource, self).__init__()
 
     def dump(self, packet):
-        self.__packet = packet
-        self.__stamp = uuid.uuid4()
+        # called by the evaluation thread, read by the viewport on the UI thread
+        with self.__lock:
+            self.__packet = packet
+            self.__packet_pass = self.__pass
+            self.__stamp = uuid.uuid4()
+
+    def setPass(self, passState):
+        # the pass of the images dumped from now on
+        with self.__lock:
+            self.__pass = passState
+
+    def passState(self):
+        # the pass of the latest image
+        with self.__lock:
+            return self.__packet_pass
 
     def packet(self):
-        return self.__packet
+        with self.__lock:
+            return self.__packet
 
     def stamp(self):
-        return self.__stamp
+        with self.__lock:
+            return self.__stamp
+
+    def latest(self):
+        with self.__lock:
+            return (self.__packet, self.__stamp, self.__packet_pass)
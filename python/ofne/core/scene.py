@@ -36,8 +36,66 @@ class OFnScene(abst._SceneBase):
     def clear(self):
         return self.__impl.clear()
 
+    def nodeChanged(self, node):
+        self.__impl.nodeChanged(node)
+
+    def nodeRenamed(self, node, oldName):
+        self.__impl.nodeRenamed(node, oldName)
+
+    def addChangeCallback(self, func):
+        # func(node) is called when the params, the inputs or the bypass state of the node are changed
+        return self.__impl.addChangeCallback(func)
+
+    def removeChangeCallback(self, func):
+        return self.__impl.removeChangeCallback(func)
+
+    def snapshot(self, nodes):
+        return OFnSceneSnapshot(self, nodes)
+
     def misc(self):
         return self.__impl.misc()
 
     def setMisc(self, misc):
         self.__impl.setMisc(misc)
+
+
+class OFnSceneSnapshot(object):
+    """
+    An immutable copy of the given nodes and their input network
+    it can be evaluated on another thread while the scene is edited
+    """
+    def __init__(self, scene, nodes):
+        super(OFnSceneSnapshot, self).__init__()
+        self.__scene_node_ids = frozenset([x.id() for x in scene.nodes()])
+        self.__nodes = {}
+
+        stack = list(nodes)
+        links = []
+        while (stack):
+            cur = stack.pop()
+            if cur.id() in self.__nodes:
+                continue
+
+            self.__nodes[cur.id()] = cur.snapshot()
+            for i, inp in enumerate(cur.inputs()):
+                if inp is None:
+                    continue
+
+                links.append((cur.id(), i, inp.id()))
+                if inp.id() not in self.__nodes:
+                    stack.append(inp)
+
+        for dst, index, src in links:
+            self.__nodes[dst]._link(index, self.__nodes[src])
+
+        self.__targets = [self.__nodes[x.id()] for x in nodes]
+
+    def nodes(self):
+        return list(self.__nodes.values())
+
+    def targets(self):
+        return self.__targets[:]
+
+    def sceneNodeIds(self):
+        # the ids of all nodes in the scene at the time of the snapshot
+        return self.__scene_node_ids
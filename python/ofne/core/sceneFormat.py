@@ -0,0 +1,212 @@
+import io
+import os
+import ast
+import json
+import itertools
+from .. import exceptions
+
+
+FormatName = "ofne-scene"
+FormatVersion = 1
+
+
+# a scene file is a JSON Lines document, a header record and then one record per node, connection and the misc data
+# {"format": "ofne-scene", "version": 1}
+# {"node": {"name": ..., "type": ..., "id": ..., "byPassed": ..., "params": {...}, "userData": {...}}}
+# {"connection": {"src": ..., "dst": ..., "index": ...}}
+# {"misc": {...}}
+
+
+def _header():
+    return {"format": FormatName, "version": FormatVersion}
+
+
+def iterDump(data):
+    yield json.dumps(_header())
+
+    for nd in data.get("nodes", []):
+        yield json.dumps({"node": nd})
+
+    for con in data.get("connections", []):
+        yield json.dumps({"connection": con})
+
+    yield json.dumps({"misc": data.get("misc") or {}})
+
+
+def dumps(data):
+    return "\n".join(iterDump(data)) + "\n"
+
+
+def dump(data, f):
+    for line in iterDump(data):
+        f.write(line)
+        f.write("\n")
+
+
+def writeFile(filepath, data):
+    # write next to the destination first, a failure never leaves a broken scene behind
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, mode="w", encoding="utf-8") as f:
+            dump(data, f)
+
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def isLegacy(text):
+    # a versioned scene starts with its header record, anything else is taken as a legacy python literal
+    first = text.lstrip().split("\n", 1)[0]
+    try:
+        header = json.loads(first)
+    except ValueError:
+        return True
+
+    return not isinstance(header, dict) or "format" not in header
+
+
+def _checkHeader(header):
+    if not isinstance(header, dict) or header.get("format") != FormatName:
+        raise exceptions.OFnSceneFormatError("Not an ofne scene")
+
+    version = header.get("version")
+    if not isinstance(version, int) or version < 1:
+        raise exceptions.OFnSceneFormatError(f"Invalid scene version '{version}'")
+
+    if version > FormatVersion:
+        raise exceptions.OFnSceneFormatError(f"The scene version {version} is newer than the supported version {FormatVersion}")
+
+    return version
+
+
+def parse(lines):
+    """
+    Read the records one line at a time, the whole text is never held in memory
+    """
+    data = {"nodes": [], "connections": [], "misc": {}}
+    decoder = json.JSONDecoder()
+    version = None
+
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            record = decoder.decode(line)
+        except ValueError as e:
+            raise exceptions.OFnSceneFormatError(f"Invalid record at line {i + 1} : {e}")
+
+        if version is None:
+            version = _checkHeader(record)
+            continue
+
+        if not isinstance(record, dict) or len(record) != 1:
+            raise exceptions.OFnSceneFormatError(f"Invalid record at line {i + 1}")
+
+        if "node" in record:
+            data["nodes"].append(record["node"])
+        elif "connection" in record:
+            data["connections"].append(record["connection"])
+        elif "misc" in record:
+            data["misc"] = record["misc"]
+        else:
+            raise exceptions.OFnSceneFormatError(f"Unknown record '{next(iter(record))}' at line {i + 1}")
+
+    if version is None:
+        raise exceptions.OFnSceneFormatError("Empty scene")
+
+    return _checkData(migrate(data, version))
+
+
+def parseLegacy(text):
+    # the scenes before the version 1 were python literals, never evaluate them
+    try:
+        data = ast.literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as e:
+        raise exceptions.OFnSceneFormatError(f"Invalid legacy scene : {e}")
+
+    if not isinstance(data, dict) or not isinstance(data.get("nodes", []), list) or not isinstance(data.get("connections", []), list):
+        raise exceptions.OFnSceneFormatError("Invalid legacy scene")
+
+    return _checkData(migrate(data, 0))
+
+
+def _migrateFrom0(data):
+    # tuples become lists as in a JSON round trip and the misc is always a dict
+    data = json.loads(json.dumps(data))
+    data.setdefault("nodes", [])
+    data.setdefault("connections", [])
+    if not isinstance(data.get("misc"), dict):
+        data["misc"] = {}
+
+    return data
+
+
+_MIGRATIONS = {
+    0: _migrateFrom0
+}
+
+
+def migrate(data, version):
+    # e.g. a legacy scene with a bytes or a set literal cannot become JSON
+    try:
+        while (version < FormatVersion):
+            data = _MIGRATIONS[version](data)
+            version += 1
+    except (ValueError, TypeError, RecursionError) as e:
+        raise exceptions.OFnSceneFormatError(f"Failed to migrate the scene version {version} : {e}")
+
+    return data
+
+
+def _isId(v):
+    return isinstance(v, (str, int)) and not isinstance(v, bool)
+
+
+def _checkData(data):
+    # the records are checked before loading so that a broken scene is a format error rather than a KeyError
+    for i, nd in enumerate(data["nodes"]):
+        if not isinstance(nd, dict):
+            raise exceptions.OFnSceneFormatError(f"Invalid node {i}")
+
+        for key, types in (("name", str), ("type", str), ("byPassed", bool), ("params", dict), ("userData", dict)):
+            if not isinstance(nd.get(key), types):
+                raise exceptions.OFnSceneFormatError(f"Invalid node {i} : '{key}' is missing or invalid")
+
+        if not _isId(nd.get("id")):
+            raise exceptions.OFnSceneFormatError(f"Invalid node {i} : 'id' is missing or invalid")
+
+    for i, con in enumerate(data["connections"]):
+        if not isinstance(con, dict) or not _isId(con.get("src")) or not _isId(con.get("dst")):
+            raise exceptions.OFnSceneFormatError(f"Invalid connection {i}")
+
+        index = con.get("index")
+        if not isinstance(index, int) or isinstance(index, bool) or index < 0:
+            raise exceptions.OFnSceneFormatError(f"Invalid connection {i} : 'index' is missing or invalid")
+
+    if not isinstance(data["misc"], dict):
+        raise exceptions.OFnSceneFormatError("Invalid misc")
+
+    return data
+
+
+def loads(text):
+    if isLegacy(text):
+        return parseLegacy(text)
+
+    return parse(io.StringIO(text))
+
+
+def readFile(filepath):
+    with open(filepath, mode="r", encoding="utf-8") as f:
+        head = f.readline()
+        while (head and not head.strip()):
+            head = f.readline()
+
+        if isLegacy(head):
+            return parseLegacy(head + f.read())
+
+        return parse(itertools.chain([head], f))
@@ -0,0 +1,135 @@
+import os
+import json
+import time
+import threading
+import contextlib
+
+
+# Chrome trace-event recording of the evaluations, the file opens in chrome://tracing or Perfetto
+# nothing is recorded unless a tracer is started, span() returns a shared no-op span then
+
+_TRACER = None
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    def __init__(self, tracer, name, cat, args):
+        self.__tracer = tracer
+        self.__name = name
+        self.__cat = cat
+        self.__args = args
+        self.__start = 0
+
+    def __enter__(self):
+        self.__start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, excType, excValue, tb):
+        self.__tracer.complete(self.__name, self.__cat, self.__start, time.perf_counter_ns(), self.__args)
+        return False
+
+
+class OFnTracer(object):
+    def __init__(self):
+        super(OFnTracer, self).__init__()
+        self.__lock = threading.Lock()
+        self.__events = []
+        self.__threads = {}
+        self.__origin = time.perf_counter_ns()
+        self.__pid = os.getpid()
+
+    def span(self, name, cat="ofne", args=None):
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, cat, start, end, args=None):
+        # start and end are time.perf_counter_ns() values
+        tid = threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start - self.__origin) / 1000.0,
+            "dur": (end - start) / 1000.0,
+            "pid": self.__pid,
+            "tid": tid
+        }
+        if args:
+            event["args"] = args
+
+        with self.__lock:
+            self.__events.append(event)
+            if tid not in self.__threads:
+                self.__threads[tid] = threading.current_thread().name
+
+    def events(self):
+        with self.__lock:
+            events = list(self.__events)
+            threads = dict(self.__threads)
+
+        meta = [{"name": "thread_name", "ph": "M", "pid": self.__pid, "tid": tid, "args": {"name": name}} for tid, name in threads.items()]
+
+        return meta + events
+
+    def write(self, filepath):
+        with open(filepath, mode="w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+
+
+def isEnabled():
+    return _TRACER is not None
+
+
+def tracer():
+    return _TRACER
+
+
+def start():
+    global _TRACER
+
+    _TRACER = OFnTracer()
+
+    return _TRACER
+
+
+def stop():
+    global _TRACER
+
+    tr = _TRACER
+    _TRACER = None
+
+    return tr
+
+
+def span(name, cat="ofne", **args):
+    tr = _TRACER
+    if tr is None:
+        return _NULL_SPAN
+
+    return tr.span(name, cat=cat, args=args)
+
+
+@contextlib.contextmanager
+def record(filepath):
+    """
+    record the spans of the block and write them to filepath
+    """
+    global _TRACER
+
+    prev = _TRACER
+    tr = OFnTracer()
+    _TRACER = tr
+    try:
+        yield tr
+    finally:
+        _TRACER = prev
+        tr.write(filepath)
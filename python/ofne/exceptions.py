@@ -22,3 +22,7 @@ class OFnInvalidParamValueError(Exception):
 
 class OFnGraphEvaluationError(Exception):
     pass
+
+
+class OFnSceneFormatError(Exception):
+    pass
@@ -8,18 +8,36 @@ class _GraphNodeBase(object):
     def node(self):
         raise OFnNotImplementedError(self, "node")
 
+    def rebind(self, node):
+        raise OFnNotImplementedError(self, "rebind")
+
     def dirty(self):
         raise OFnNotImplementedError(self, "dirty")
 
     def isDirty(self):
         raise OFnNotImplementedError(self, "isDirty")
 
-    def evaluate(self, packetArray):
+    def cacheKey(self):
+        raise OFnNotImplementedError(self, "cacheKey")
+
+    def isMaterialized(self):
+        raise OFnNotImplementedError(self, "isMaterialized")
+
+    def absorb(self, cacheKey=None):
+        raise OFnNotImplementedError(self, "absorb")
+
+    def release(self):
+        raise OFnNotImplementedError(self, "release")
+
+    def evaluate(self, packetArray, cacheKey=None, cache=None, fused=None):
         raise OFnNotImplementedError(self, "evaluate")
 
     def packet(self):
         raise OFnNotImplementedError(self, "packet")
 
+    def profile(self):
+        raise OFnNotImplementedError(self, "profile")
+
     def result(self):
         raise OFnNotImplementedError(self, "result")
 
@@ -31,14 +49,62 @@ class _GraphSceneBase(object):
     def __init__(self, scene):
         super(_GraphSceneBase, self).__init__()
 
-    def evaluate(self, nodes, force=False):
+    def workers(self):
+        raise OFnNotImplementedError(self, "workers")
+
+    def setWorkers(self, workers):
+        raise OFnNotImplementedError(self, "setWorkers")
+
+    def proxy(self):
+        raise OFnNotImplementedError(self, "proxy")
+
+    def setProxy(self, proxy):
+        raise OFnNotImplementedError(self, "setProxy")
+
+    def memoryPolicy(self):
+        raise OFnNotImplementedError(self, "memoryPolicy")
+
+    def setMemoryPolicy(self, policy):
+        raise OFnNotImplementedError(self, "setMemoryPolicy")
+
+    def memoryStats(self):
+        raise OFnNotImplementedError(self, "memoryStats")
+
+    def evaluate(self, nodes, force=False, cancel=None):
         raise OFnNotImplementedError(self, "evaluate")
 
-    def packet(self, nodes):
+    def evaluateSnapshot(self, snapshot, force=False, cancel=None):
+        raise OFnNotImplementedError(self, "evaluateSnapshot")
+
+    def packet(self, node, roi=None):
         raise OFnNotImplementedError(self, "packet")
 
     def failedNodes(self):
         raise OFnNotImplementedError(self, "failedNodes")
 
+    def cacheBudget(self):
+        raise OFnNotImplementedError(self, "cacheBudget")
+
+    def setCacheBudget(self, budget):
+        raise OFnNotImplementedError(self, "setCacheBudget")
+
+    def cacheStats(self):
+        raise OFnNotImplementedError(self, "cacheStats")
+
+    def tileBudget(self):
+        raise OFnNotImplementedError(self, "tileBudget")
+
+    def setTileBudget(self, budget):
+        raise OFnNotImplementedError(self, "setTileBudget")
+
+    def tileStats(self):
+        raise OFnNotImplementedError(self, "tileStats")
+
+    def clearCache(self):
+        raise OFnNotImplementedError(self, "clearCache")
+
+    def profileReport(self, last=True, sort="wall", limit=None):
+        raise OFnNotImplementedError(self, "profileReport")
+
     def errorMessage(self, node):
         raise OFnNotImplementedError(self, "errorMessage")
@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def makeKey(nodeId, byPassed, params, inputKeys, proxy=1):
+    # params and the keys of the inputs identify the result of a node, a proxy result is kept apart from the full one
+    return hashlib.sha1(repr((nodeId, byPassed, params, inputKeys, proxy)).encode("utf-8")).hexdigest()
+
+
+def packetBytes(packet):
+    return packet.data().nbytes
+
+
+class OFnPacketCache(object):
+    def __init__(self, budget=0):
+        super(OFnPacketCache, self).__init__()
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__budget = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.setBudget(budget)
+
+    def budget(self):
+        return self.__budget
+
+    def setBudget(self, budget):
+        with self.__lock:
+            self.__budget = max(0, int(budget))
+            self.__evict()
+
+    def enabled(self):
+        return self.__budget > 0
+
+    def get(self, key):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+
+            return entry[0]
+
+    def put(self, key, packet):
+        size = packetBytes(packet)
+
+        with self.__lock:
+            if size > self.__budget:
+                return False
+
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.__bytes -= old[1]
+
+            self.__entries[key] = (packet, size)
+            self.__bytes += size
+            self.__evict()
+
+            return True
+
+    def __evict(self):
+        while (self.__bytes > self.__budget and self.__entries):
+            _, (_, size) = self.__entries.popitem(last=False)
+            self.__bytes -= size
+
+    def clear(self):
+        with self.__lock:
+            self.__entries = OrderedDict()
+            self.__bytes = 0
+
+    def resetStats(self):
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+
+    def stats(self):
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "entries": len(self.__entries),
+                "bytes": self.__bytes,
+                "budget": self.__budget
+            }
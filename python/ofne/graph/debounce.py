@@ -0,0 +1,100 @@
+import time
+import threading
+
+
+class OFnDebouncer(object):
+    """
+    Merges bursts of evaluation requests into the latest one
+
+    request() returns how long to wait for more requests before take() starts the evaluation
+    the wait follows the duration of the recent evaluations, a fast graph is evaluated right away
+    and a slow graph waits until the edits pause instead of queueing evaluations
+    the wait never ends later than the delay after the first pending request, a continuous burst
+    (e.g. a slider drag) is still evaluated at its latest state every delay
+    """
+    def __init__(self, minDelay=0.0, maxDelay=0.5, factor=1.0, smoothing=0.5):
+        super(OFnDebouncer, self).__init__()
+        self.__lock = threading.Lock()
+        self.__min_delay = max(0.0, float(minDelay))
+        self.__max_delay = max(self.__min_delay, float(maxDelay))
+        self.__factor = max(0.0, float(factor))
+        self.__smoothing = min(max(0.0, float(smoothing)), 1.0)
+        self.__duration = None
+        self.__pending = False
+        self.__first = None
+        self.__requested = 0
+        self.__executed = 0
+        self.__dropped = 0
+        self.__cancelled = 0
+
+    def delay(self):
+        with self.__lock:
+            return self.__delay()
+
+    def __delay(self):
+        if self.__duration is None:
+            return self.__min_delay
+
+        return min(max(self.__min_delay, self.__duration * self.__factor), self.__max_delay)
+
+    def request(self, now=None):
+        # now : time.monotonic() by default
+        now = time.monotonic() if now is None else now
+
+        with self.__lock:
+            self.__requested += 1
+            if self.__pending:
+                # the waiting request is replaced by the newer one
+                self.__dropped += 1
+            else:
+                self.__first = now
+
+            self.__pending = True
+            delay = self.__delay()
+
+            return max(0.0, min(delay, self.__first + delay - now))
+
+    def isPending(self):
+        with self.__lock:
+            return self.__pending
+
+    def take(self):
+        with self.__lock:
+            if not self.__pending:
+                return False
+
+            self.__pending = False
+            self.__first = None
+            self.__executed += 1
+
+            return True
+
+    def cancelled(self):
+        # a started evaluation was stopped by a newer one
+        with self.__lock:
+            self.__cancelled += 1
+
+    def finished(self, duration):
+        with self.__lock:
+            if self.__duration is None:
+                self.__duration = duration
+            else:
+                self.__duration += (duration - self.__duration) * self.__smoothing
+
+    def resetStats(self):
+        with self.__lock:
+            self.__requested = 0
+            self.__executed = 0
+            self.__dropped = 0
+            self.__cancelled = 0
+
+    def stats(self):
+        with self.__lock:
+            return {
+                "requested": self.__requested,
+                "executed": self.__executed,
+                "dropped": self.__dropped,
+                "cancelled": self.__cancelled,
+                "duration": self.__duration,
+                "delay": self.__delay()
+            }
@@ -0,0 +1,78 @@
+import sys
+import numpy as np
+
+
+# keep every packet of the evaluated nodes, a clean node never runs again
+MemoryKeep = 0
+# drop the packets of the intermediate nodes once all of their outputs have run
+# only the requested nodes keep their packets, the packet cache keeps the others within its budget
+MemoryRelease = 1
+
+MemoryPolicies = (MemoryKeep, MemoryRelease)
+
+
+def peakRSS():
+    """
+    the peak resident set size of the process in bytes, None if it is not available
+    """
+    if sys.platform == "win32":
+        return _peakRSSWindows()
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _peakRSSWindows():
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t)
+        ]
+
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+    except (AttributeError, OSError):
+        return None
+
+    return counters.PeakWorkingSetSize
+
+
+def baseArray(arr):
+    # the array owning the buffer of a view
+    while (isinstance(arr.base, np.ndarray)):
+        arr = arr.base
+
+    return arr
+
+
+def packetBytes(packets):
+    # the bytes held by the packets, the arrays viewing the same buffer are counted once
+    bases = {}
+    for p in packets:
+        base = baseArray(p.data())
+        bases[id(base)] = base.nbytes
+
+    return sum(bases.values())
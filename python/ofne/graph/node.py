@@ -1,5 +1,9 @@
+import time
 import traceback
 from . import abst
+from . import profile
+from ..core import param
+from ..core import trace
 from ..core.packet import OFnPacket
 
 
@@ -12,80 +16,125 @@ class OFnGraphNode(abst._GraphNodeBase):
     def __init__(self, node):
         super(OFnGraphNode, self).__init__(node)
         self.__node = node
-        self.__latest_inputs = None
-        self.__bypassed_last_time = False
-        self.__latest_params = None
+        self.__generation = None
+        self.__dirty = True
         self.__packet = OFnPacket()
         self.__eval_res = ResNE
         self.__error_msg = ""
+        self.__cache_key = None
+        self.__materialized = True
+        self.__profile = None
+        # the path params expand the environment variables, e.g. ${FRAME}, which do not change the generation
+        self.__path_names = [x for x in node.paramNames() if node.getParam(x).type() == param.ParamTypePath]
+        self.__paths = None
 
     def node(self):
         return self.__node
 
-    def __params(self):
-        d = {}
-        for p in self.__node.paramNames():
-            d[p] = self.__node.getParamValue(p)
-
-        return d
-
-    def __inputs(self):
-        inputs = []
-        for inp in self.__node.inputs():
-            if inp is not None and not inp.getByPassed():
-                inp = inp.id()
-
-            inputs.append(inp)
-
-        return inputs
+    def rebind(self, node):
+        # the same node from a newer snapshot or the scene itself
+        self.__node = node
 
     def dirty(self):
-        self.__latest_inputs = None
-        self.__latest_params = None
+        self.__dirty = True
+
+    def __expandedPaths(self):
+        return [self.__node.getParamValue(x) for x in self.__path_names]
 
     def isDirty(self):
-        if self.__bypassed_last_time != self.__node.getByPassed():
+        # the node changes its generation when the params, the inputs or the bypass state are changed
+        if self.__dirty or self.__generation != self.__node.generation():
             return True
 
-        if self.__latest_inputs is None or self.__latest_params is None:
-            return True
+        return bool(self.__path_names) and self.__paths != self.__expandedPaths()
 
-        if self.__latest_inputs != self.__inputs():
-            return True
+    def cacheKey(self):
+        return self.__cache_key
 
-        d = self.__params()
-        if len(d) != len(self.__latest_params):
-            return True
+    def isMaterialized(self):
+        return self.__materialized
 
-        for k, v in d.items():
-            if self.__latest_params.get(k) != v:
-                return True
+    def absorb(self, cacheKey=None):
+        # the node was evaluated as a part of a fused downstream node, its packet is not kept
+        self.__generation = self.__node.generation()
+        self.__paths = self.__expandedPaths()
+        self.__dirty = False
+        self.__cache_key = cacheKey
+        self.__packet = OFnPacket()
+        self.__eval_res = ResSuccess
+        self.__error_msg = ""
+        self.__materialized = False
+        self.__profile = None
 
-        return False
+    def release(self):
+        # the packet is not needed anymore, the node is evaluated again (or taken from the cache) when it is
+        self.__packet = OFnPacket()
+        self.__materialized = False
 
-    def evaluate(self, packetArray):
+    def evaluate(self, packetArray, cacheKey=None, cache=None, fused=None):
         self.__eval_res = ResNE
         self.__error_msg = ""
 
         if self.isDirty():
-            self.__bypassed_last_time = self.__node.getByPassed()
-            self.__latest_inputs = self.__inputs()
-            self.__latest_params = self.__params()
-
-            if self.__node.getByPassed():
-                self.__packet = packetArray.packet(0)
-            else:
-                try:
+            wall = time.perf_counter()
+            cpu = time.thread_time()
+            cache_state = self.__evaluate(packetArray, cacheKey, cache, fused)
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+
+            out = self.__packet if self.__node.packetable() and isinstance(self.__packet, OFnPacket) else None
+            self.__profile = profile.makeProfile(wall, cpu, out, packetArray, cache=cache_state, fused=len(fused or []))
+
+    def __evaluate(self, packetArray, cacheKey, cache, fused):
+        # returns the cache state for the profile
+        self.__generation = self.__node.generation()
+        self.__paths = self.__expandedPaths()
+        self.__dirty = False
+        self.__cache_key = cacheKey
+        self.__materialized = True
+
+        if self.__node.getByPassed():
+            self.__packet = packetArray.packet(0)
+            return None
+
+        use_cache = cache is not None and cacheKey is not None and self.__node.packetable() and cache.enabled()
+        if use_cache:
+            with trace.span("cache", cat="cache"):
+                p = cache.get(cacheKey)
+
+            if p is not None:
+                self.__packet = p
+                self.__eval_res = ResSuccess
+                return profile.CacheHit
+
+        try:
+            with trace.span(self.__node.name(), cat="operate", type=self.__node.type(), fused=len(fused or [])):
+                if fused:
+                    p = self.__node.operateFused(fused, packetArray)
+                else:
                     p = self.__node.operate(packetArray)
-                    if self.__node.packetable():
-                        self.__packet = p
-
-                    self.__eval_res = ResSuccess
-                except Exception as e:
-                    self.__eval_res = ResFailure
-                    self.__error_msg = traceback.format_exc()
-                    self.__error_msg += f"\n=============================\n{e}"
-                    self.__packet = OFnPacket()
+
+            if self.__node.packetable():
+                self.__packet = p
+                if use_cache and isinstance(p, OFnPacket):
+                    cache.put(cacheKey, p)
+
+            self.__eval_res = ResSuccess
+        except Exception as e:
+            self.__eval_res = ResFailure
+            self.__error_msg = traceback.format_exc()
+            self.__error_msg += f"\n=============================\n{e}"
+            self.__packet = OFnPacket()
+            self.__cache_key = None
+
+        return profile.CacheMiss if use_cache else None
+
+    def profile(self):
+        """
+        the profile of the last evaluation, see profile.makeProfile
+        None if the node has not been evaluated by itself
+        """
+        return self.__profile
 
     def result(self):
         return self.__eval_res
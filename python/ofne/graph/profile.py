@@ -0,0 +1,58 @@
+from . import memory
+
+
+CacheHit = "hit"
+CacheMiss = "miss"
+
+SortKeys = ("wall", "cpu", "bytes")
+
+
+def makeProfile(wall, cpu, out, packetArray, cache=None, fused=0):
+    """
+    wall, cpu : seconds spent by the node, cpu is the time of the evaluating thread
+    out : the output packet, None if the node has no output
+    cache : CacheHit, CacheMiss or None if the cache was not used
+    fused : the number of upstream nodes evaluated together with this node
+    """
+    shape = None
+    dtype = None
+    allocated = 0
+    if out is not None:
+        data = out.data()
+        shape = tuple(data.shape)
+        dtype = str(data.dtype)
+
+        # an output viewing an input or taken from the cache allocated nothing
+        if cache != CacheHit:
+            base = memory.baseArray(data)
+            inputs = set([id(memory.baseArray(packetArray.packet(i).data())) for i in range(packetArray.count())])
+            if id(base) not in inputs:
+                allocated = base.nbytes
+
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "bytes": allocated,
+        "shape": shape,
+        "dtype": dtype,
+        "cache": cache,
+        "fused": fused
+    }
+
+
+def sortReport(rows, sort="wall", limit=None):
+    if sort not in SortKeys:
+        raise ValueError(f"Invalid sort key '{sort}', expected one of {SortKeys}")
+
+    rows = sorted(rows, key=lambda x: x[sort], reverse=True)
+
+    return rows if limit is None else rows[:limit]
+
+
+def formatReport(rows):
+    lines = [f"{'node':>24} {'type':>24} {'wall (ms)':>10} {'cpu (ms)':>10} {'MiB':>8} {'cache':>5} {'shape':>16} {'dtype':>8}"]
+    for r in rows:
+        shape = "x".join([str(x) for x in r["shape"]]) if r["shape"] is not None else "-"
+        lines.append(f"{r['name']:>24} {r['type']:>24} {r['wall'] * 1000:>10.2f} {r['cpu'] * 1000:>10.2f} {r['bytes'] / (1024 * 1024):>8.1f} {r['cache'] or '-':>5} {shape:>16} {r['dtype'] or '-':>8}")
+
+    return "\n".join(lines)
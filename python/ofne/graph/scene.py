@@ -1,107 +1,525 @@
+import queue
+import itertools
+import collections
+import numpy as np
+from concurrent import futures
 from . import abst
 from . import node
+from . import cache
+from . import memory
+from . import profile
 from ..core import packet
+from ..core import resource
+from ..core import trace
 from .. import exceptions
 
 
+DefaultTileSize = 256
+DefaultTileBudget = 256 * 1024 * 1024
+ProxyLevels = (1, 2, 4, 8)
+
+
+class _OFnRegionFallback(Exception):
+    pass
+
+
+def _crop(pck, rect):
+    x0, y0, x1, y1 = rect
+
+    return packet.OFnPacket(metadata=pck.metadata(), data=pck.data()[y0:y1, x0:x1], storageType=pck.storageType())
+
+
 class OFnGraphScene(abst._GraphSceneBase):
-    def __init__(self, scene):
+    def __init__(self, scene, workers=1, cacheBudget=0, memoryPolicy=memory.MemoryKeep):
         super(OFnGraphScene, self).__init__(scene)
         self.__scene = scene
         self.__graph_nodes = {}
+        self.__cache = cache.OFnPacketCache(budget=cacheBudget)
+        # {node id: (signature, token)}, the tiles are kept in their own LRU cache by (node id, token, tile)
+        self.__tiles = {}
+        self.__tile_tokens = itertools.count()
+        self.__tile_cache = cache.OFnPacketCache(budget=DefaultTileBudget)
+        self.__tile_size = DefaultTileSize
+        self.__proxy = 1
+        self.__coarse_graph = None
+        self.__workers = 1
+        self.setWorkers(workers)
+        self.__memory_policy = memory.MemoryKeep
+        self.setMemoryPolicy(memoryPolicy)
+        self.__memory_stats = {"peakRSS": None, "packetBytes": 0, "released": 0}
+        self.__profiled = []
+        self.__scene.addChangeCallback(self.__nodeChanged)
+
+    def __nodeChanged(self, changed):
+        # mark the changed node and its outputs, the nodes already dirty are not visited again
+        curs = [changed]
+        visited = set()
+        while (curs):
+            nexts = []
+            for cur in curs:
+                nid = cur.id()
+                if nid in visited:
+                    continue
 
-    def __track_nodes(self):
-        new_nodes = {}
+                visited.add(nid)
 
-        for sn in self.__scene.nodes():
-            n = self.__graph_nodes.get(sn.id(), None)
-            if n is None:
-                n = node.OFnGraphNode(sn)
+                gn = self.__graph_nodes.get(nid)
+                if gn is not None:
+                    if cur is not changed and gn.isDirty():
+                        continue
 
-            new_nodes[sn.id()] = n
+                    gn.dirty()
 
-        self.__graph_nodes = new_nodes
+                nexts.extend(cur.outputs())
 
-    def __inputNetwork(self, nodes):
-        cache = set()
-        eval_nodes = []
+            curs = nexts
 
-        currents = nodes[:]
-        while (currents):
-            nexts = []
+    def workers(self):
+        return self.__workers
 
-            for cur in currents:
-                if cur not in cache:
-                    eval_nodes.append(cur)
-                    cache.add(cur)
-                    nexts.extend([x for x in cur.inputs() if x is not None])
+    def setWorkers(self, workers):
+        # evaluate independent nodes on a thread pool when workers > 1
+        self.__workers = max(1, int(workers or 1))
 
-            currents = nexts
+    def cacheBudget(self):
+        return self.__cache.budget()
 
-        return [self.__graph_nodes[x.id()] for x in reversed(eval_nodes)]
+    def setCacheBudget(self, budget):
+        # bytes of packets kept for recent parameter states, 0 disables the cache
+        self.__cache.setBudget(budget)
 
-    def evaluate(self, nodes, force=False):
-        self.__track_nodes()
+    def cacheStats(self):
+        return self.__cache.stats()
 
-        waiting = self.__inputNetwork(nodes)
-        dirty_set = set()
+    def clearCache(self):
+        self.__cache.clear()
 
-        curs = [x for x in waiting if x.isDirty()]
-        while (curs):
-            nexts = []
-            for cur in curs:
-                if cur.node().id() in dirty_set:
-                    continue
+    def memoryPolicy(self):
+        return self.__memory_policy
 
-                cur.dirty()
-                dirty_set.add(cur.node().id())
-                nexts.extend([self.__graph_nodes[x.id()] for x in cur.node().outputs()])
+    def setMemoryPolicy(self, policy):
+        """
+        memory.MemoryKeep : every evaluated node keeps its packet
+        memory.MemoryRelease : the packets of the intermediate nodes are dropped once their outputs have run
+        """
+        if policy not in memory.MemoryPolicies:
+            raise ValueError(f"Invalid memory policy '{policy}', expected one of {memory.MemoryPolicies}")
 
-            curs = nexts
+        self.__memory_policy = policy
 
-        evaled = set()
+    def memoryStats(self):
+        """
+        peakRSS : the peak resident set size of the process in bytes after the last evaluation, None if unknown
+        packetBytes : the bytes of the packets kept by the graph nodes
+        released : the packets dropped during the last evaluation
+        """
+        return dict(self.__memory_stats)
 
-        latest_count = None
-        while (waiting):
-            if len(waiting) == latest_count:
-                raise exceptions.OFnGraphEvaluationError("Failed to evaludate the scene graph")
+    def tileSize(self):
+        return self.__tile_size
 
-            latest_count = len(waiting)
+    def setTileSize(self, size):
+        self.__tile_size = max(1, int(size))
+        self.__clearTiles()
 
-            pending = []
-            for _ in range(latest_count):
-                gn = waiting.pop(0)
+    def tileBudget(self):
+        return self.__tile_cache.budget()
 
-                if gn.node().id() in evaled:
-                    continue
+    def setTileBudget(self, budget):
+        # bytes of the tiles kept for the roi evaluations, the least recently used ones are dropped first
+        self.__tile_cache.setBudget(budget)
+
+    def tileStats(self):
+        return self.__tile_cache.stats()
+
+    def __clearTiles(self):
+        self.__tiles = {}
+        self.__tile_cache.clear()
 
+    def proxy(self):
+        return self.__proxy
+
+    def setProxy(self, proxy):
+        """
+        evaluate the images at 1 / proxy of their size, one of ProxyLevels
+        the results of each level are cached separately
+        """
+        if proxy not in ProxyLevels:
+            raise ValueError(f"Invalid proxy level '{proxy}', expected one of {ProxyLevels}")
+
+        if proxy == self.__proxy:
+            return
+
+        self.__proxy = proxy
+        self.__clearTiles()
+        for gn in self.__graph_nodes.values():
+            gn.dirty()
+
+    def __track_nodes(self, snapshot=None):
+        new_nodes = {}
+
+        if snapshot is not None:
+            # a snapshot has only the nodes to evaluate, the others are kept while they are in the scene
+            scene_ids = snapshot.sceneNodeIds()
+            for nid, n in self.__graph_nodes.items():
+                if nid in scene_ids:
+                    new_nodes[nid] = n
+
+        for sn in (self.__scene.nodes() if snapshot is None else snapshot.nodes()):
+            n = self.__graph_nodes.get(sn.id(), None)
+            if n is None:
+                n = node.OFnGraphNode(sn)
+            elif n.node() is not sn:
+                n.rebind(sn)
+
+            new_nodes[sn.id()] = n
+
+        self.__graph_nodes = new_nodes
+
+        for nid in [x for x in self.__tiles.keys() if x not in new_nodes]:
+            self.__tiles.pop(nid)
+
+    def __inputNetwork(self, nodes):
+        # the nodes feeding the given nodes in topological order, each node is visited once
+        visited = set()
+        eval_nodes = []
+        stack = [(x, False) for x in reversed(nodes)]
+
+        while (stack):
+            cur, expanded = stack.pop()
+            if expanded:
+                eval_nodes.append(cur)
+                continue
+
+            if cur.id() in visited:
+                continue
+
+            visited.add(cur.id())
+            stack.append((cur, True))
+            for inp in reversed(cur.inputs()):
+                if inp is not None and inp.id() not in visited:
+                    stack.append((inp, False))
+
+        return [self.__graph_nodes[x.id()] for x in eval_nodes]
+
+    def __packetArray(self, gn):
+        # float32 working data is converted back to its storage type unless the node takes it as is
+        working = gn.node().acceptsWorkingData()
+        packets = []
+        for inn in gn.node().inputs():
+            if inn is None:
+                packets.append(packet.OFnPacket())
+            else:
+                p = self.__graph_nodes[inn.id()].packet()
+                packets.append(p if working else p.resolved())
+
+        return packet.OFnPacketArray(packets, proxy=self.__proxy)
+
+    def __cacheKey(self, gn, keys=None):
+        input_keys = []
+        for inn in gn.node().inputs():
+            if inn is None:
+                input_keys.append(None)
+                continue
+
+            if keys is not None and inn.id() in keys:
+                k = keys[inn.id()]
+            else:
+                k = self.__graph_nodes[inn.id()].cacheKey()
+            if k is None:
+                return None
+
+            input_keys.append(k)
+
+        n = gn.node()
+
+        return cache.makeKey(n.id(), n.getByPassed(), [(x, n.getParamValue(x)) for x in n.paramNames()], input_keys, proxy=self.__proxy)
+
+    def evaluate(self, nodes, force=False, cancel=None, coarse=None, tracePath=None):
+        """
+        cancel : a threading.Event, no more nodes are started once it is set
+        coarse : a proxy level, the nodes are evaluated at this level first and then at the proxy level of this scene
+        tracePath : write the Chrome trace events of the evaluation to this file
+        """
+        if tracePath is not None:
+            with trace.record(tracePath):
+                return self.evaluate(nodes, force=force, cancel=cancel, coarse=coarse)
+
+        self.__track_nodes()
+        if self.__coarsePass(nodes, coarse, cancel, lambda g: g.evaluate(nodes, force=force, cancel=cancel)):
+            return
+
+        self.__evaluate(nodes, force, cancel)
+
+    def evaluateSnapshot(self, snapshot, force=False, cancel=None, coarse=None, tracePath=None):
+        """
+        evaluate the targets of an OFnSceneSnapshot, the scene can be edited meanwhile
+        """
+        if tracePath is not None:
+            with trace.record(tracePath):
+                return self.evaluateSnapshot(snapshot, force=force, cancel=cancel, coarse=coarse)
+
+        self.__track_nodes(snapshot=snapshot)
+        if self.__coarsePass(snapshot.targets(), coarse, cancel, lambda g: g.evaluateSnapshot(snapshot, force=force, cancel=cancel)):
+            return
+
+        self.__evaluate(snapshot.targets(), force, cancel)
+
+    def __coarsePass(self, nodes, coarse, cancel, evaluateCoarse):
+        # a quick pass on a second graph kept at the coarse level, the images dumped meanwhile are marked as coarse
+        # returns True if cancelled during the pass
+        if coarse is None or coarse <= self.__proxy:
+            return False
+
+        if coarse not in ProxyLevels:
+            raise ValueError(f"Invalid proxy level '{coarse}', expected one of {ProxyLevels}")
+
+        if self.__coarse_graph is None:
+            # the proxy level is a part of the cache keys, both graphs share the cache and its budget
+            self.__coarse_graph = OFnGraphScene(self.__scene)
+            self.__coarse_graph.__cache = self.__cache
+
+        # the released packets are taken from the cache again, without a cache the upstream nodes would run on every pass
+        self.__coarse_graph.setWorkers(self.__workers)
+        self.__coarse_graph.setMemoryPolicy(self.__memory_policy if self.__cache.enabled() else memory.MemoryKeep)
+        self.__coarse_graph.setProxy(coarse)
+
+        view = resource.OFnViewResource()
+        view.setPass(resource.PassCoarse)
+        try:
+            with trace.span("coarse pass", cat="graph", proxy=coarse):
+                evaluateCoarse(self.__coarse_graph)
+        finally:
+            view.setPass(resource.PassFinal)
+
+        if cancel is not None and cancel.is_set():
+            return True
+
+        # the requested nodes run again even if nothing changed at the full level, the viewers replace the coarse image
+        for n in nodes:
+            self.__graph_nodes[n.id()].dirty()
+
+        return False
+
+    def __evaluate(self, nodes, force, cancel):
+        with trace.span("evaluate", cat="graph", nodes=len(nodes), proxy=self.__proxy):
+            self.__evaluateNodes(nodes, force, cancel)
+
+    def __evaluateNodes(self, nodes, force, cancel):
+        with trace.span("schedule", cat="graph"):
+            waiting = self.__inputNetwork(nodes)
+            dirty_set = set()
+
+            curs = [x for x in waiting if x.isDirty()]
+            while (curs):
+                nexts = []
+                for cur in curs:
+                    if cur.node().id() in dirty_set:
+                        continue
+
+                    cur.dirty()
+                    dirty_set.add(cur.node().id())
+                    nexts.extend([self.__graph_nodes[x.id()] for x in cur.node().outputs()])
+
+                curs = nexts
+
+            self.__materialize(nodes, waiting)
+            chains = self.__fuse(nodes, waiting)
+            absorbed = {}
+            for tid, chain in chains.items():
+                for m in chain:
+                    absorbed[m.node().id()] = tid
+
+            # count the dirty inputs of each node, a node is ready when all of them are evaluated
+            order = {}
+            indegrees = {}
+            for gn in waiting:
                 if not force and not gn.isDirty():
                     continue
 
-                ready = True
-                packets = []
-                for inn in gn.node().inputs():
-                    if inn is not None and self.__graph_nodes[inn.id()].isDirty():
-                        ready = False
-                        break
-
-                    if inn is None:
-                        packets.append(packet.OFnPacket())
-                    else:
-                        packets.append(self.__graph_nodes[inn.id()].packet())
+                nid = gn.node().id()
+                order[nid] = len(order)
+                if nid not in absorbed:
+                    indegrees[nid] = 0
 
-                if not ready:
-                    pending.append(gn)
+            for gn in waiting:
+                nid = gn.node().id()
+                if nid not in indegrees:
                     continue
 
-                gn.evaluate(packet.OFnPacketArray(packets))
-                if gn.result() == node.ResFailure:
-                    print(f"! Evaluation failed.\n{gn.errorMessage()}")
-                evaled.add(gn.node().id())
+                # a fused node waits for the inputs of the head of its chain
+                head = chains[nid][0] if nid in chains else gn
+                for inid in set([x.id() for x in head.node().inputs() if x is not None]):
+                    if inid in indegrees:
+                        indegrees[nid] += 1
+
+            # count the units reading each packet, an intermediate packet is dropped after the last one has run
+            requested = set([x.id() for x in nodes])
+            consumers = {}
+            if self.__memory_policy == memory.MemoryRelease:
+                for nid in indegrees.keys():
+                    gn = self.__graph_nodes[nid]
+                    head = chains[nid][0] if nid in chains else gn
+                    for inid in set([x.id() for x in head.node().inputs() if x is not None]):
+                        if inid not in requested:
+                            consumers[inid] = consumers.get(inid, 0) + 1
+
+        ready = collections.deque([self.__graph_nodes[x] for x, c in indegrees.items() if c == 0])
+        evaled = []
+        released = []
+
+        def _finished(gn):
+            evaled.append(gn)
+
+            if consumers:
+                nid = gn.node().id()
+                head = chains[nid][0] if nid in chains else gn
+                for inid in set([x.id() for x in head.node().inputs() if x is not None]):
+                    if inid not in consumers:
+                        continue
+
+                    consumers[inid] -= 1
+                    if consumers[inid] == 0:
+                        self.__graph_nodes[inid].release()
+                        released.append(inid)
 
-            waiting = pending + waiting
+            nexts = []
+            for outn in gn.node().outputs():
+                oid = absorbed.get(outn.id(), outn.id())
+                if oid not in indegrees:
+                    continue
+
+                indegrees[oid] -= 1
+                if indegrees[oid] == 0:
+                    nexts.append(self.__graph_nodes[oid])
+
+            ready.extend(sorted(nexts, key=lambda x: order[x.node().id()]))
+
+        def _cancelled():
+            return cancel is not None and cancel.is_set()
+
+        if self.__workers == 1:
+            while (ready and not _cancelled()):
+                gn = ready.popleft()
+                self.__evalUnit(gn, chains.get(gn.node().id()))
+                _finished(gn)
+
+        else:
+            # finished futures are queued so that each one is handled once
+            done = queue.Queue()
+            with futures.ThreadPoolExecutor(max_workers=self.__workers) as pool:
+                running = 0
+                while (ready or running):
+                    while (ready and not _cancelled()):
+                        gn = ready.popleft()
+                        ft = pool.submit(self.__evalUnit, gn, chains.get(gn.node().id()))
+                        ft.add_done_callback(lambda x, gn=gn: done.put((x, gn)))
+                        running += 1
+
+                    if not running:
+                        break
 
-    def packet(self, node):
+                    ft, gn = done.get()
+                    running -= 1
+                    ft.result()
+                    _finished(gn)
+
+        self.__memory_stats = {
+            "peakRSS": memory.peakRSS(),
+            "packetBytes": memory.packetBytes([x.packet() for x in self.__graph_nodes.values()]),
+            "released": len(released)
+        }
+
+        # the nodes not started after a cancel stay dirty
+        if not _cancelled() and len(evaled) != len(indegrees):
+            raise exceptions.OFnGraphEvaluationError("Failed to evaludate the scene graph")
+
+        evaled += [y for x in evaled for y in chains.get(x.node().id(), [])]
+        self.__profiled = [x.node().id() for x in evaled]
+
+        for gn in sorted(evaled, key=lambda x: order[x.node().id()]):
+            if gn.result() == node.ResFailure:
+                print(f"! Evaluation failed.\n{gn.errorMessage()}")
+
+    def __materialize(self, nodes, waiting):
+        # a node fused into its output has no packet, evaluate it again if the packet is needed
+        needed = set([x.id() for x in nodes])
+        for gn in waiting:
+            if gn.isDirty():
+                needed.update([x.id() for x in gn.node().inputs() if x is not None])
+
+        for gn in reversed(waiting):
+            if gn.node().id() not in needed:
+                continue
+
+            if not gn.isDirty() and not gn.isMaterialized():
+                gn.dirty()
+
+            if gn.isDirty():
+                needed.update([x.id() for x in gn.node().inputs() if x is not None])
+
+    def __fuse(self, nodes, waiting):
+        # chains of dirty nodes sharing a fuse group are evaluated by the last node at once
+        requested = set([x.id() for x in nodes])
+        dirty = set([x.node().id() for x in waiting if x.isDirty()])
+        chains = {}
+
+        for gn in waiting:
+            n = gn.node()
+            nid = n.id()
+            if nid not in dirty or nid in requested or n.getByPassed() or n.needs() != 1:
+                continue
+
+            group = n.fuseGroup()
+            if group is None:
+                continue
+
+            outs = n.outputs()
+            if len(outs) != 1:
+                continue
+
+            o = outs[0]
+            if o.id() not in dirty or o.getByPassed() or o.needs() != 1 or o.fuseGroup() != group:
+                continue
+
+            inp = o.inputs()[0]
+            if inp is None or inp.id() != nid:
+                continue
+
+            chain = chains.pop(nid, [])
+            chain.append(gn)
+            chains[o.id()] = chain
+
+        return chains
+
+    def __evalUnit(self, gn, chain):
+        if not chain:
+            gn.evaluate(self.__packetArray(gn), cacheKey=self.__cacheKey(gn), cache=self.__cache)
+            return
+
+        keys = {}
+        for m in chain + [gn]:
+            keys[m.node().id()] = self.__cacheKey(m, keys=keys)
+
+        gn.evaluate(self.__packetArray(chain[0]), cacheKey=keys[gn.node().id()], cache=self.__cache, fused=[x.node() for x in chain])
+
+        if gn.result() != node.ResFailure:
+            for m in chain:
+                m.absorb(keys[m.node().id()])
+
+            return
+
+        # evaluate the nodes one by one to find the one failed
+        for m in chain + [gn]:
+            m.dirty()
+            m.evaluate(self.__packetArray(m), cacheKey=self.__cacheKey(m), cache=self.__cache)
+
+    def packet(self, node, roi=None):
+        """
+        roi : (x0, y0, x1, y1) in pixels of the proxy level image, the end is exclusive
+              e.g. (0, 0, 100, 50) at the proxy level 2 is (0, 0, 200, 100) of the full image
+              only the tiles covering the roi are computed through the tileable ops
+        """
         if node.id() not in self.__graph_nodes:
             self.__track_nodes()
 
@@ -109,9 +527,212 @@ class OFnGraphScene(abst._GraphSceneBase):
         if gn is None:
             return None
 
-        self.evaluate([node])
+        if roi is None:
+            self.evaluate([node])
+
+            return gn.packet().resolved()
+
+        if not node.packetable():
+            return None
 
-        return gn.packet()
+        try:
+            return self.__regionPacket(node, roi)
+        except _OFnRegionFallback:
+            self.evaluate([node])
+            full = gn.packet().resolved()
+            if len(full.data().shape) < 2:
+                return full
+
+            return _crop(full, self.__clipRect(roi, full.data().shape))
+
+    def __clipRect(self, roi, shape):
+        h, w = shape[:2]
+        x0, y0, x1, y1 = roi
+        x0 = min(max(0, x0), w)
+        x1 = min(max(x0, x1), w)
+        y0 = min(max(0, y0), h)
+        y1 = min(max(y0, y1), h)
+
+        return (x0, y0, x1, y1)
+
+    def __regionNetwork(self, target):
+        # split the input network into the tileable part (in topological order) and the nodes feeding it
+        chain = []
+        frontier = []
+        visited = set()
+        stack = [(target, False)]
+
+        while (stack):
+            cur, expanded = stack.pop()
+            if expanded:
+                chain.append(cur)
+                continue
+
+            if cur.id() in visited:
+                continue
+
+            visited.add(cur.id())
+
+            if not cur.getByPassed() and not cur.tileable():
+                frontier.append(cur)
+                continue
+
+            stack.append((cur, True))
+            for inp in reversed(cur.inputs()):
+                if inp is not None and inp.id() not in visited:
+                    stack.append((inp, False))
+
+        return (chain, frontier)
+
+    def __regionPacket(self, target, roi):
+        chain, frontier = self.__regionNetwork(target)
+        if not chain:
+            raise _OFnRegionFallback()
+
+        if frontier:
+            self.evaluate(frontier)
+
+        frontier_packets = {}
+        for fn in frontier:
+            gn = self.__graph_nodes[fn.id()]
+            if gn.result() == node.ResFailure or len(gn.packet().data().shape) < 2:
+                raise _OFnRegionFallback()
+
+            frontier_packets[fn.id()] = gn.packet()
+
+        if not frontier_packets:
+            raise _OFnRegionFallback()
+
+        # a tile is valid as long as the params, the inputs and the packets feeding the chain are the same
+        signatures = {}
+        for n in chain:
+            ins = []
+            for inp in n.inputs():
+                if inp is None:
+                    ins.append(None)
+                elif inp.id() in frontier_packets:
+                    ins.append(frontier_packets[inp.id()])
+                else:
+                    ins.append(signatures[inp.id()])
+
+            signatures[n.id()] = (n.getByPassed(), [(x, n.getParamValue(x)) for x in n.paramNames()], ins)
+
+        # a new token for a changed node, its old tiles are not used anymore and are dropped by the cache
+        for n in chain:
+            entry = self.__tiles.get(n.id())
+            if entry is None or entry[0] != signatures[n.id()]:
+                self.__tiles[n.id()] = (signatures[n.id()], next(self.__tile_tokens))
+
+        shape = frontier_packets[frontier[0].id()].data().shape
+        x0, y0, x1, y1 = self.__clipRect(roi, shape)
+        ts = self.__tile_size
+        keys = [(tx, ty) for ty in range(y0 // ts, (y1 + ts - 1) // ts) for tx in range(x0 // ts, (x1 + ts - 1) // ts)]
+
+        if self.__workers > 1 and len(keys) > 1:
+            with futures.ThreadPoolExecutor(max_workers=self.__workers) as pool:
+                tiles = list(pool.map(lambda k: self.__evalTile(chain, frontier_packets, k, shape), keys))
+        else:
+            tiles = [self.__evalTile(chain, frontier_packets, k, shape) for k in keys]
+
+        if not tiles:
+            return _crop(frontier_packets[frontier[0].id()], (x0, y0, x1, y1)).resolved()
+
+        tiles = [x.resolved() for x in tiles]
+        first = tiles[0].data()
+        out = np.empty((y1 - y0, x1 - x0) + first.shape[2:], dtype=first.dtype)
+        for (tx, ty), tile in zip(keys, tiles):
+            d = tile.data()
+            if d.shape[2:] != first.shape[2:] or d.dtype != first.dtype:
+                raise _OFnRegionFallback()
+
+            ix0 = max(x0, tx * ts)
+            iy0 = max(y0, ty * ts)
+            ix1 = min(x1, (tx + 1) * ts)
+            iy1 = min(y1, (ty + 1) * ts)
+            out[iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = d[iy0 - ty * ts:iy1 - ty * ts, ix0 - tx * ts:ix1 - tx * ts]
+
+        return packet.OFnPacket(metadata=tiles[0].metadata(), data=out)
+
+    def __evalTile(self, chain, frontierPackets, key, shape):
+        ts = self.__tile_size
+        tx, ty = key
+        rect = self.__clipRect((tx * ts, ty * ts, (tx + 1) * ts, (ty + 1) * ts), shape)
+
+        # walk back from the requested node and collect the tiles that are not cached yet
+        # the cached ones are kept here, another thread may evict them meanwhile
+        tiles = {}
+        needed = set([chain[-1].id()])
+        for n in reversed(chain):
+            if n.id() not in needed:
+                continue
+
+            p = self.__tile_cache.get((n.id(), self.__tiles[n.id()][1], key))
+            if p is not None:
+                tiles[n.id()] = p
+                needed.remove(n.id())
+                continue
+
+            for inp in n.inputs():
+                if inp is not None and inp.id() not in frontierPackets:
+                    needed.add(inp.id())
+
+        for n in chain:
+            if n.id() not in needed:
+                continue
+
+            packets = []
+            for inp in n.inputs():
+                if inp is None:
+                    packets.append(packet.OFnPacket())
+                elif inp.id() in frontierPackets:
+                    packets.append(_crop(frontierPackets[inp.id()], rect))
+                else:
+                    packets.append(tiles[inp.id()])
+
+            if not n.acceptsWorkingData():
+                packets = [x.resolved() for x in packets]
+
+            if n.getByPassed():
+                p = packets[0] if packets else packet.OFnPacket()
+            else:
+                try:
+                    p = n.operate(packet.OFnPacketArray(packets, proxy=self.__proxy))
+                except Exception:
+                    raise _OFnRegionFallback()
+
+            if not isinstance(p, packet.OFnPacket) or p.data().shape[:2] != (rect[3] - rect[1], rect[2] - rect[0]):
+                raise _OFnRegionFallback()
+
+            tiles[n.id()] = p
+            self.__tile_cache.put((n.id(), self.__tiles[n.id()][1], key), p)
+
+        return tiles[chain[-1].id()]
+
+    def profileReport(self, last=True, sort="wall", limit=None):
+        """
+        the profile of each node with its node, name and type, the slowest first
+        last : only the nodes evaluated by the last evaluation, otherwise the latest profile of every node
+        sort : one of profile.SortKeys
+        limit : the number of nodes to return
+        """
+        graph_nodes = self.__graph_nodes
+        if last:
+            gns = [graph_nodes[x] for x in self.__profiled if x in graph_nodes]
+        else:
+            gns = list(graph_nodes.values())
+
+        rows = []
+        for gn in gns:
+            p = gn.profile()
+            if p is None:
+                continue
+
+            n = gn.node()
+            row = dict(p)
+            row.update({"node": n, "name": n.name(), "type": n.type()})
+            rows.append(row)
+
+        return profile.sortReport(rows, sort=sort, limit=limit)
 
     def failedNodes(self):
         return [x.node() for x in self.__graph_nodes.values() if x.result() == node.ResFailure]
@@ -1,24 +1,94 @@
 import uuid
+import itertools
 from ..core import param
 from .. import exceptions
 
 
+# every node has a unique position in a topological order of all the nodes,
+# an input is always placed before the nodes using it
+_ORDERS = itertools.count()
+
+
+def _reorder(nodeImpls, orders):
+    for n, o in zip(nodeImpls, orders):
+        n._setOrder(o)
+
+
+def connectTrusted(connections):
+    """
+    connections : [(dst node impl, index, src node impl), ...]
+    connect all at once and check cycles by sorting the affected nodes only once
+    returns False and restores the inputs if the connections make a cycle
+    """
+    previous = []
+    for dst, index, src in connections:
+        if index >= dst.needs():
+            raise exceptions.OFnIndexError(index, dst.needs())
+
+        previous.append((dst, index, dst.inputs()[index]))
+
+    for dst, index, src in connections:
+        dst._connectInputUnchecked(index, src)
+
+    # the connected components of the new connections
+    nodes = set()
+    stack = [x[0] for x in connections]
+    while (stack):
+        cur = stack.pop()
+        if cur in nodes:
+            continue
+
+        nodes.add(cur)
+        stack.extend([x for x in cur.inputs() if x is not None and x not in nodes])
+        stack.extend([x for x in cur.outputs() if x not in nodes])
+
+    indegrees = {}
+    for n in nodes:
+        indegrees[n] = len(set([x for x in n.inputs() if x is not None]))
+
+    ready = sorted([x for x, c in indegrees.items() if c == 0], key=lambda x: x._order())
+    sorted_nodes = []
+    while (ready):
+        cur = ready.pop()
+        sorted_nodes.append(cur)
+        for o in cur.outputs():
+            indegrees[o] -= 1
+            if indegrees[o] == 0:
+                ready.append(o)
+
+    if len(sorted_nodes) != len(nodes):
+        for dst, index, org in reversed(previous):
+            if org is None:
+                dst.disconnectInput(index)
+            else:
+                dst._connectInputUnchecked(index, org)
+
+        return False
+
+    _reorder(sorted_nodes, sorted([x._order() for x in sorted_nodes]))
+
+    return True
+
+
 class _OFnNodeImpl(object):
     def __init__(self, op, node):
         super(_OFnNodeImpl, self).__init__()
         self.__id = uuid.uuid4()
+        self.__id_str = self.__id.__str__()
         self.__op = op
         self.__node = node
         self.__inputs = [None] * self.__op.needs()
         self.__params = param.OFnParams(self.__op.params())
         self.__outputs = set()
         self.__user_data = {}
+        self.__generation = 0
+        self.__order = next(_ORDERS)
 
     def __hash__(self):
         return self.__id.int
 
     def id(self):
-        return self.__id.__str__()
+        return self.__id_str
 
     def __eq__(self, other):
         return isinstance(other, _OFnNodeImpl) and other.__hash__() == self.__hash__()
@@ -42,7 +112,20 @@ class _OFnNodeImpl(object):
         return self.__params.get(name, default=default, raw=raw)
 
     def setParamValue(self, name, value):
+        org = self.__params.get(name, raw=True)
         self.__params.set(name, value)
+        if self.__params.get(name, raw=True) == org:
+            return False
+
+        self._touch()
+
+        return True
+
+    def generation(self):
+        return self.__generation
+
+    def _touch(self):
+        self.__generation += 1
 
     def needs(self):
         return self.__op.needs()
@@ -50,6 +133,12 @@ class _OFnNodeImpl(object):
     def packetable(self):
         return self.__op.packetable()
 
+    def tileable(self):
+        return self.__op.tileable()
+
+    def acceptsWorkingData(self):
+        return self.__op.acceptsWorkingData()
+
     def inputs(self):
         return self.__inputs[:]
 
@@ -75,21 +164,51 @@ class _OFnNodeImpl(object):
 
         return True
 
-    def __makeCycle(self, srcNodeImpl):
-        srcid = srcNodeImpl.id()
-
-        curs = list(self.__outputs)
-        while (curs):
-            nexts = []
-            for cur in curs:
-                if cur.id() == srcid:
-                    return True
-
-                nexts.extend(cur.outputs())
-
-            curs = nexts
-
-        return False
+    def _order(self):
+        return self.__order
+
+    def _setOrder(self, order):
+        self.__order = order
+
+    def __affected(self, srcNodeImpl):
+        # the nodes after this node and not after the source in the order, None if the source is one of them
+        upper = srcNodeImpl._order()
+        if upper < self.__order:
+            return []
+
+        forward = [self]
+        visited = set([self])
+        stack = [self]
+        while (stack):
+            cur = stack.pop()
+            for o in cur.outputs():
+                if o == srcNodeImpl:
+                    return None
+
+                if o not in visited and o._order() < upper:
+                    visited.add(o)
+                    forward.append(o)
+                    stack.append(o)
+
+        return forward
+
+    def __shiftOrder(self, srcNodeImpl, forward):
+        # move the source and its inputs between the lower bound and the source before the affected nodes
+        lower = self.__order
+        backward = [srcNodeImpl]
+        visited = set([srcNodeImpl])
+        stack = [srcNodeImpl]
+        while (stack):
+            cur = stack.pop()
+            for i in cur.inputs():
+                if i is not None and i not in visited and i._order() > lower:
+                    visited.add(i)
+                    backward.append(i)
+                    stack.append(i)
+
+        backward.sort(key=lambda x: x._order())
+        forward.sort(key=lambda x: x._order())
+        _reorder(backward + forward, sorted([x._order() for x in backward + forward]))
 
     def connectInput(self, index, nodeImpl):
         if index >= self.__op.needs():
@@ -98,13 +217,31 @@ class _OFnNodeImpl(object):
         if not nodeImpl.packetable():
             return False
 
-        if self.__makeCycle(nodeImpl):
+        if nodeImpl == self:
+            return False
+
+        forward = self.__affected(nodeImpl)
+        if forward is None:
+            return False
+
+        self._connectInputUnchecked(index, nodeImpl)
+
+        if forward:
+            self.__shiftOrder(nodeImpl, forward)
+
+        return True
+
+    def _connectInputUnchecked(self, index, nodeImpl):
+        if not nodeImpl.packetable():
             return False
 
         _org = None
         if self.__inputs[index] is not None:
             _org = self.__inputs[index]
 
+        if _org != nodeImpl:
+            self._touch()
+
         self.__inputs[index] = nodeImpl
         self.__inputs[index]._connectOutput(self)
 
@@ -122,6 +259,7 @@ class _OFnNodeImpl(object):
 
         _org = self.__inputs[index]
         self.__inputs[index] = None
+        self._touch()
 
         if _org is not None and _org not in self.__inputs:
             _org._disconnectOutput(self)
@@ -137,6 +275,17 @@ class _OFnNodeImpl(object):
     def operate(self, packetArray):
         return self.__op.operate(self.__params.copy(), packetArray)
 
+    def fuseGroup(self):
+        return self.__op.fuseGroup()
+
+    def _fuseStep(self):
+        return (self.__op, self.__params.copy())
+
+    def operateFused(self, nodeImpls, packetArray):
+        steps = [x._fuseStep() for x in nodeImpls] + [self._fuseStep()]
+
+        return self.__op.operateFused(steps, packetArray)
+
     def userDataKeys(self):
         return sorted(self.__user_data.keys())
 
@@ -1,8 +1,9 @@
-import codecs
 import sys
 import copy
+import inspect
+import weakref
 import traceback
-from pprint import pprint
+from ..core import sceneFormat
 
 
 class _OFnSceneImpl(object):
@@ -12,6 +13,9 @@ class _OFnSceneImpl(object):
         self.__op_manager = opManager
         self.__nodes = {}
         self.__misc = {}
+        self.__change_callbacks = []
+        self.__names = {}
+        self.__name_indices = {}
 
     def createNode(self, type, name=None):
         op = self.__op_manager.getOp(type)
@@ -26,6 +30,7 @@ class _OFnSceneImpl(object):
 
         node = self.__node_class(self, op, name=name)
         self.__nodes[node.id()] = node
+        self.__names[node.name()] = node.id()
 
         return node
 
@@ -51,6 +56,7 @@ class _OFnSceneImpl(object):
             return False
 
         self.__nodes.pop(node.id())
+        self.__releaseName(node.name())
 
         self.__delNode(node)
 
@@ -59,28 +65,83 @@ class _OFnSceneImpl(object):
     def nodes(self):
         return [x for x in self.__nodes.values()]
 
-    def getUniqueName(self, name):
-        index = 0
+    def nodeChanged(self, node):
+        for ref in self.__change_callbacks[:]:
+            func = ref()
+            if func is None:
+                # the object of the method was deleted
+                self.__change_callbacks.remove(ref)
+                continue
 
-        while (True):
-            nname = f"{name}{index}" if index > 0 else name
+            func(node)
 
-            used = False
-            for n in self.__nodes.values():
-                if n.name() == nname:
-                    used = True
-                    break
+    def __findCallback(self, func):
+        for ref in self.__change_callbacks:
+            if ref() == func:
+                return ref
+
+        return None
+
+    def addChangeCallback(self, func):
+        # the methods are kept by weak references so that the scene does not keep their objects alive
+        if self.__findCallback(func) is not None:
+            return False
+
+        self.__change_callbacks.append(weakref.WeakMethod(func) if inspect.ismethod(func) else (lambda: func))
 
-            if not used:
-                return nname
+        return True
+
+    def removeChangeCallback(self, func):
+        ref = self.__findCallback(func)
+        if ref is None:
+            return False
+
+        self.__change_callbacks.remove(ref)
 
+        return True
+
+    def getUniqueName(self, name):
+        if name not in self.__names:
+            return name
+
+        # the indices lower than the kept one are in use
+        index = self.__name_indices.get(name, 1)
+        while (f"{name}{index}" in self.__names):
             index += 1
 
+        self.__name_indices[name] = index
+
+        return f"{name}{index}"
+
+    def nodeRenamed(self, node, oldName):
+        if node.id() not in self.__nodes:
+            return
+
+        if self.__names.get(oldName) == node.id():
+            self.__releaseName(oldName)
+
+        self.__names[node.name()] = node.id()
+
+    def __releaseName(self, name):
+        self.__names.pop(name, None)
+
+        # the name may be an indexed name of some prefixes, e.g. "a12" of "a1" and "a"
+        digits = len(name)
+        while (digits > 0 and name[digits - 1].isdigit()):
+            digits -= 1
+
+        for i in range(digits, len(name)):
+            if name[i] == "0":
+                continue
+
+            prefix = name[:i]
+            index = int(name[i:])
+            if index < self.__name_indices.get(prefix, 1):
+                self.__name_indices[prefix] = index
+
     def read(self, filepath):
         try:
-            d = None
-            with codecs.open(filepath, mode="r", encoding="utf-8") as f:
-                return self.load(eval(f.read()))
+            return self.load(sceneFormat.readFile(filepath))
         except:
             print(f"Error : Failed to read the scene -\n{traceback.format_exc()}")
             return False
@@ -112,11 +173,18 @@ class _OFnSceneImpl(object):
 
                 id_map[node_desc["id"]] = new_node
 
+            connections = []
             for con in data.get("connections", []):
                 if con["dst"] not in id_map or con["src"] not in id_map:
                     continue
 
-                id_map[con["dst"]].connect(id_map[con["src"]], index=con["index"])
+                connections.append((id_map[con["dst"]], id_map[con["src"]], con["index"]))
+
+            # the connections of a saved scene are made at once, one by one only if they make a cycle
+            if not self.__node_class.connectTrusted(connections):
+                print("WARNING : the scene has a cycle")
+                for dst, src, index in connections:
+                    dst.connect(src, index=index)
 
             self.__misc = copy.deepcopy(data.get("misc", {}))
 
@@ -127,8 +195,7 @@ class _OFnSceneImpl(object):
 
     def write(self, filepath):
         try:
-            with codecs.open(filepath, mode="w", encoding="utf-8") as f:
-                pprint(self.toDict(), f)
+            sceneFormat.writeFile(filepath, self.toDict())
 
             return True
         except:
@@ -142,6 +209,8 @@ class _OFnSceneImpl(object):
             v = self.__nodes.pop(k)
             del v
 
+        self.__names = {}
+        self.__name_indices = {}
         self.__misc = {}
 
         return True
@@ -1,3 +1,4 @@
 from .core.op import OFnOp
 from .core.param import OFnParamBool, OFnParamStr, OFnParamInt, OFnParamFloat, OFnParamCode, OFnParamPath
 from .core.packet import OFnPacket
+from .core import trace
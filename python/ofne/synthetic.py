@@ -0,0 +1,265 @@
+import uuid
+import random
+import argparse
+from .core import sceneFormat
+from .core.scene import OFnScene
+
+
+# the kinds of nodes and their default weights, the ConstantImage nodes are the sources of the graph
+KindConstant = "ConstantImage"
+KindOCIO = "OCIO"
+KindExpression = "PythonExpression"
+
+DefaultOpMix = {
+    KindConstant: 1.0,
+    KindOCIO: 4.0,
+    KindExpression: 1.0
+}
+
+DefaultSizes = [(1024, 540)]
+
+MaxFanIn = 4
+
+# OCIO ops working without any config or LUT file
+OCIO_OPS = {
+    "OCIOMatrixTransform": lambda rng: {"m00": rng.uniform(0.8, 1.2), "m11": rng.uniform(0.8, 1.2), "m22": rng.uniform(0.8, 1.2)},
+    "OCIOAllocationUniformTransform": lambda rng: {"min": 0.0, "max": rng.uniform(1.0, 4.0)},
+    "OCIOExponentTransform": lambda rng: {"gamma": rng.uniform(0.8, 2.4)},
+    "OCIOExponentWithLinearTransform": lambda rng: {"gamma": rng.uniform(1.8, 2.6), "offset": rng.uniform(0.0, 0.1)},
+    "OCIOExposureContrastTransform": lambda rng: {"exposure": rng.uniform(-1.0, 1.0), "contrast": rng.uniform(0.8, 1.2)}
+}
+
+NodeSpacing = (200.0, 100.0)
+PickTries = 16
+
+
+def _expression(count, scale):
+    # the mean of the inputs cropped to the smallest one
+    return (
+        "# synthetic\n"
+        "datas = []\n"
+        f"for i in range({count}):\n"
+        "    datas.append(inPackets.packet(i).data())\n"
+        "h = datas[0].shape[0]\n"
+        "w = datas[0].shape[1]\n"
+        "for x in datas:\n"
+        "    h = min(h, x.shape[0])\n"
+        "    w = min(w, x.shape[1])\n"
+        "out = np.zeros((h, w, datas[0].shape[2]), dtype=np.float32)\n"
+        "for x in datas:\n"
+        "    out += x[:h, :w]\n"
+        f"outPacket = Packet(data=out * np.float32({scale!r}))\n"
+    )
+
+
+def _layerSizes(count, layers):
+    # spread the nodes over the layers, the first layers take the rest
+    if layers <= 0 or count <= 0:
+        return []
+
+    base, rest = divmod(count, layers)
+
+    return [base + (1 if i < rest else 0) for i in range(layers) if base or i < rest]
+
+
+def _pick(rng, candidates, outputs, fanOut, count, exclude=()):
+    # a few random tries for a node with less than fanOut outputs, any node tried otherwise
+    picked = []
+    ids = set([x.id() for x in exclude])
+    for _ in range(count):
+        choice = None
+        for _ in range(PickTries):
+            c = candidates[rng.randrange(len(candidates))]
+            if c.id() in ids:
+                continue
+
+            if choice is None or outputs[c.id()] < fanOut:
+                choice = c
+
+            if outputs[c.id()] < fanOut:
+                break
+
+        if choice is None:
+            break
+
+        picked.append(choice)
+        ids.add(choice.id())
+
+    return picked
+
+
+def generate(nodes=100, depth=8, fanIn=2, fanOut=2, opMix=None, sizes=None, seed=0, viewer=True):
+    """
+    Build a scene of synthetic image nodes, the same arguments always make the same graph
+
+    nodes : the number of nodes, the viewer is not counted
+    depth : the number of layers, each node takes its first input from the previous layer
+    fanIn : the maximum number of inputs of a PythonExpression node (1 - 4), the OCIO nodes have one
+    fanOut : the number of outputs of a node before the other nodes are preferred as inputs
+    opMix : {kind: weight} of KindConstant, KindOCIO and KindExpression, merged with DefaultOpMix
+    sizes : [(width, height), ...] the sizes of the ConstantImage nodes
+    seed : the random seed
+    viewer : connect a Viewer to the last node
+    """
+    if nodes < 1 or depth < 1:
+        raise ValueError("nodes and depth must be at least 1")
+
+    if fanIn < 1 or fanIn > MaxFanIn:
+        raise ValueError(f"fanIn must be between 1 and {MaxFanIn}")
+
+    if fanOut < 1:
+        raise ValueError("fanOut must be at least 1")
+
+    mix = dict(DefaultOpMix)
+    mix.update(opMix or {})
+    for kind, weight in mix.items():
+        if kind not in DefaultOpMix:
+            raise ValueError(f"Unknown kind '{kind}', expected one of {list(DefaultOpMix.keys())}")
+
+        if weight < 0:
+            raise ValueError(f"Negative weight for '{kind}'")
+
+    sizes = list(sizes or DefaultSizes)
+    rng = random.Random(seed)
+
+    # the sources take their share of the nodes, the other kinds fill the layers after them
+    kinds = [x for x in (KindOCIO, KindExpression) if mix[x] > 0]
+    total = sum(mix.values())
+    if not kinds or depth == 1:
+        source_count = nodes
+    else:
+        # at least one source, and one node left for the other layers when there are more than one node
+        source_count = max(1, min(nodes - 1, round(nodes * mix[KindConstant] / total)))
+
+    scene = OFnScene()
+    outputs = {}
+    layers = []
+
+    sources = []
+    for i in range(source_count):
+        n = scene.createNode(KindConstant)
+        width, height = rng.choice(sizes)
+        n.setParamValue("width", width)
+        n.setParamValue("height", height)
+        for ch in "RGB":
+            n.setParamValue(ch, round(rng.uniform(0.0, 1.0), 4))
+
+        n.setUserData("ui:pos", (0.0, i * NodeSpacing[1]))
+        outputs[n.id()] = 0
+        sources.append(n)
+
+    layers.append(sources)
+    upstream = list(sources)
+
+    for li, count in enumerate(_layerSizes(nodes - source_count, depth - 1)):
+        layer = []
+        for i in range(count):
+            kind = rng.choices(kinds, weights=[mix[x] for x in kinds])[0]
+            if kind == KindOCIO:
+                op_name = rng.choice(sorted(OCIO_OPS.keys()))
+                inputs = _pick(rng, layers[-1], outputs, fanOut, 1)
+                n = scene.createNode(op_name)
+                for k, v in OCIO_OPS[op_name](rng).items():
+                    n.setParamValue(k, round(v, 4))
+            else:
+                inputs = _pick(rng, layers[-1], outputs, fanOut, 1)
+                inputs += _pick(rng, upstream, outputs, fanOut, rng.randint(1, fanIn) - 1, exclude=inputs)
+                n = scene.createNode(KindExpression)
+                n.setParamValue("code", _expression(len(inputs), round(1.0 / len(inputs), 4)))
+
+            for index, inp in enumerate(inputs):
+                n.connect(inp, index)
+                outputs[inp.id()] += 1
+
+            n.setUserData("ui:pos", ((li + 1) * NodeSpacing[0], i * NodeSpacing[1]))
+            outputs[n.id()] = 0
+            layer.append(n)
+
+        layers.append(layer)
+        upstream += layer
+
+    if viewer:
+        v = scene.createNode("Viewer")
+        v.connect(layers[-1][-1], 0)
+        v.setUserData("ui:pos", (len(layers) * NodeSpacing[0], 0.0))
+
+    return scene
+
+
+def toDict(scene, seed=0):
+    # the node ids are random, they are replaced by ids made from the seed so that the same scene makes the same file
+    data = scene.toDict()
+    rng = random.Random(seed)
+    ids = {}
+    for nd in data["nodes"]:
+        ids[nd["id"]] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        nd["id"] = ids[nd["id"]]
+
+    for con in data["connections"]:
+        con["src"] = ids[con["src"]]
+        con["dst"] = ids[con["dst"]]
+
+    return data
+
+
+def write(filepath, seed=0, **kwargs):
+    """
+    generate a scene and write it, see generate() for the arguments
+    """
+    scene = generate(seed=seed, **kwargs)
+    sceneFormat.writeFile(filepath, toDict(scene, seed=seed))
+
+    return scene
+
+
+def _parseMix(text):
+    mix = {}
+    for item in text.split(","):
+        kind, sep, weight = item.partition("=")
+        if not sep:
+            raise ValueError(f"invalid op mix '{item}', expected KIND=WEIGHT")
+
+        mix[kind.strip()] = float(weight)
+
+    return mix
+
+
+def _parseSizes(text):
+    sizes = []
+    for item in text.split(","):
+        width, sep, height = item.partition("x")
+        if not sep:
+            raise ValueError(f"invalid size '{item}', expected WIDTHxHEIGHT")
+
+        sizes.append((int(width), int(height)))
+
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser("ofne.synthetic")
+    parser.add_argument("Scene", help="the ofsn file path to write")
+    parser.add_argument("-n", "--nodes", type=int, default=100)
+    parser.add_argument("-d", "--depth", type=int, default=8)
+    parser.add_argument("--fan-in", type=int, default=2, help=f"the maximum inputs of a PythonExpression node (1 - {MaxFanIn})")
+    parser.add_argument("--fan-out", type=int, default=2)
+    parser.add_argument("-m", "--mix", default=None, metavar="KIND=WEIGHT,...", help=f"weights of {', '.join(DefaultOpMix.keys())}")
+    parser.add_argument("-s", "--sizes", default=None, metavar="WxH,...", help="sizes of the ConstantImage nodes (default: 1024x540)")
+    parser.add_argument("--seed", type=int, default=0)
+    opts = parser.parse_args(argv)
+
+    try:
+        mix = _parseMix(opts.mix) if opts.mix else None
+        sizes = _parseSizes(opts.sizes) if opts.sizes else None
+        write(opts.Scene, nodes=opts.nodes, depth=opts.depth, fanIn=opts.fan_in, fanOut=opts.fan_out, opMix=mix, sizes=sizes, seed=opts.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Wrote {opts.Scene}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -10,6 +10,7 @@ from . import model
 
 NODE_DEFAULT_WIDTH = 100
 NODE_DEFAULT_HEGIHT = 30
+HEAT_COLOR = QtGui.QColor(196, 64, 40)
 
 
 class PortDirection(enum.Enum):
@@ -73,6 +74,7 @@ class OFnUINodeBody(QtWidgets.QGraphicsPathItem):
         self.__selected_brush = QtGui.QBrush(QtGui.QColor(81, 83, 102), QtCore.Qt.SolidPattern)
         self.__normal_pen = QtGui.QPen(QtCore.Qt.gray)
         self.__selected_pen = QtGui.QPen(QtCore.Qt.white)
+        self.__heat_brush = None
         self.__normal_pen.setWidth(2)
         self.__selected_pen.setWidth(4)
         rect_height = NODE_DEFAULT_HEGIHT * max(needs, 1)
@@ -80,8 +82,21 @@ class OFnUINodeBody(QtWidgets.QGraphicsPathItem):
         path.addRoundedRect(0, 0, NODE_DEFAULT_WIDTH, rect_height, 5, 5)
         self.setPath(path)
 
+    def setHeat(self, heat):
+        # 0.0 - 1.0 of the slowest node, None shows the normal color
+        if heat is None:
+            self.__heat_brush = None
+        else:
+            heat = min(max(heat, 0.0), 1.0)
+            c = self.__normal_brush.color()
+            self.__heat_brush = QtGui.QBrush(QtGui.QColor(int(c.red() + (HEAT_COLOR.red() - c.red()) * heat),
+                                                          int(c.green() + (HEAT_COLOR.green() - c.green()) * heat),
+                                                          int(c.blue() + (HEAT_COLOR.blue() - c.blue()) * heat)), QtCore.Qt.SolidPattern)
+
+        self.update()
+
     def paint(self, painter, option, widget):
-        brush = self.__normal_brush
+        brush = self.__normal_brush if self.__heat_brush is None else self.__heat_brush
         pen = self.__normal_pen
         if self.isSelected():
             brush = self.__selected_brush
@@ -137,6 +152,26 @@ class OFnUIByPass(QtWidgets.QGraphicsLineItem):
         self.setPen(self.__pen if v else QtCore.Qt.NoPen)
 
 
+class OFnUINodeBadge(QtWidgets.QGraphicsSimpleTextItem):
+    def __init__(self, parent=None):
+        super(OFnUINodeBadge, self).__init__(parent=parent)
+        self.setBrush(QtGui.QBrush(QtGui.QColor(160, 160, 160)))
+        self.setPen(QtCore.Qt.NoPen)
+
+    def setProfile(self, profile):
+        if profile is None:
+            self.setText("")
+            return
+
+        text = f"{profile['wall'] * 1000:.1f} ms"
+        if profile["cache"] == "hit":
+            text += " (cached)"
+
+        self.setText(text)
+        frect = QtGui.QFontMetrics(self.font()).boundingRect(text)
+        self.setX((NODE_DEFAULT_WIDTH - frect.width()) * 0.5)
+
+
 class OFnUINodeLabel(QtWidgets.QGraphicsSimpleTextItem):
     def __init__(self, name, parent=None):
         super(OFnUINodeLabel, self).__init__(parent=parent)
@@ -249,6 +284,11 @@ class OFnUINodeItem(QtCore.QObject, QtWidgets.QGraphicsItemGroup):
         self.__bypass_line.byPassed(self.__node.getByPassed())
         self.addToGroup(self.__bypass_line)
 
+        # evaluation time
+        self.__badge = OFnUINodeBadge(parent=self)
+        self.__badge.setPos(0, body_start + body_rect.height() + 2)
+        self.addToGroup(self.__badge)
+
         # critical
         self.__error_item = OFnUINodeError(parent=self)
         self.__error_item.setPos(body_rect.center().x() - NODE_DEFAULT_HEGIHT * 0.5, 0)
@@ -278,6 +318,10 @@ class OFnUINodeItem(QtCore.QObject, QtWidgets.QGraphicsItemGroup):
     def setError(self, v):
         self.__error_item.setError(v)
 
+    def setProfile(self, profile, heat=None):
+        self.__badge.setProfile(profile)
+        self.__body.setHeat(heat)
+
     def getByPassed(self):
         return self.__node.getByPassed()
 
@@ -506,6 +550,8 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
         self.__scene = None
         self.__graphic_scene = None
         self.__resize_note = None
+        self.__proxy = 1
+        self.__show_profile = True
 
         self.__op_selector = OFnUIOpSelector(parent=self)
 
@@ -526,7 +572,16 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
 
     def evaluate(self):
         if self.__scene:
-            self.__scene.evaluate()
+            self.__scene.requestEvaluation()
+
+    def setProxy(self, proxy):
+        self.__proxy = proxy
+        if self.__scene:
+            self.__scene.setProxy(proxy)
+
+    def shutdown(self):
+        if self.__scene:
+            self.__scene.shutdown()
 
     def updateNodeName(self, node):
         n = self.__nodes.get(node.id())
@@ -570,6 +625,7 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
 
         old_scene = self.__scene
         self.__scene = scene
+        self.__scene.setProxy(self.__proxy)
         self.__scene.nodeCreated.connect(self.__onNodeCreated)
         self.__scene.nodeDeleted.connect(self.__onDeleteNode)
         self.__scene.nodeConnected.connect(self.__onConnected)
@@ -594,6 +650,7 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
             old_scene.evaluationFinished.disconnect(self.__onEvalFinished)
             old_scene.noteCreated.disconnect(self.__onNoteCreated)
             old_scene.noteDeleted.disconnect(self.__onDeleteNote)
+            old_scene.shutdown()
 
             del old_scene
 
@@ -735,6 +792,30 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
             if en:
                 en.setError(True)
 
+        self.__updateProfile()
+
+    def showProfile(self):
+        return self.__show_profile
+
+    def setShowProfile(self, v):
+        self.__show_profile = v
+        self.__updateProfile()
+
+    def __updateProfile(self):
+        # the time of the latest evaluation of each node, the slowest node is the hottest
+        for n in self.__nodes.values():
+            n.setProfile(None)
+
+        if not self.__show_profile or self.__scene is None:
+            return
+
+        rows = self.__scene.profileReport(last=False)
+        slowest = rows[0]["wall"] if rows else 0.0
+        for r in rows:
+            en = self.__nodes.get(r["node"].id())
+            if en:
+                en.setProfile(r, heat=(r["wall"] / slowest) if slowest > 0.0 else 0.0)
+
     def keyPressEvent(self, event):
         if event.key() == QtCore.Qt.Key_Tab:
             self.__op_selector.show(self.mapFromGlobal(QtGui.QCursor.pos()))
@@ -744,6 +825,8 @@ class OFnUINodeGraph(QtWidgets.QGraphicsView):
             self.fit()
         elif event.key() == QtCore.Qt.Key_B:
             self.__onByPass()
+        elif event.key() == QtCore.Qt.Key_T:
+            self.setShowProfile(not self.__show_profile)
         elif event.key() == QtCore.Qt.Key_Delete:
             self.__deleteSelectedItems()
         elif event.modifiers() == QtCore.Qt.ControlModifier:
@@ -1,17 +1,43 @@
 import re
 import os
+import time
 import uuid
+import threading
+import traceback
 import numpy as np
+from concurrent import futures
+from .. import exceptions
 from ..core import abst
 from ..core import param
 from ..core import node
 from ..core import resource
+from ..core import sceneFormat
 from ..core.scene import OFnScene
+from ..graph import debounce
+from ..graph import memory
 from ..graph.scene import OFnGraphScene
+from ..graph.scene import ProxyLevels
 from PySide6 import QtCore
 from PySide6 import QtGui
 
 
+CacheBudget = 2 * 1024 * 1024 * 1024
+EvaluationMaxDelay = 0.5
+ProgressiveFactor = 4
+
+
+def _isPair(v):
+    # None or a pair of numbers, e.g. a position or a size
+    if v is None:
+        return True
+
+    return isinstance(v, (list, tuple)) and len(v) == 2 and all([isinstance(x, (int, float)) and not isinstance(x, bool) for x in v])
+
+
+def _isValidNote(note):
+    return isinstance(note, dict) and _isPair(note.get("pos")) and _isPair(note.get("size")) and isinstance(note.get("note", ""), str)
+
+
 class OFnUINote(abst._NodeBase):
     def __init__(self):
         super(OFnUINote, self).__init__()
@@ -81,15 +107,28 @@ class OFnUIScene(QtCore.QObject):
     nodeConnected = QtCore.Signal(tuple)
     nodeDisconnected = QtCore.Signal(tuple)
     evaluationFinished = QtCore.Signal()
+    __evaluated = QtCore.Signal(int, float)
 
     def __init__(self):
         super(OFnUIScene, self).__init__()
         os.environ["OFSN"] = ""
         self.__filepath = None
         self.__scene = OFnScene()
-        self.__scene_graph = OFnGraphScene(self.__scene)
+        # the intermediate packets are kept by the cache only, within its budget
+        self.__scene_graph = OFnGraphScene(self.__scene, workers=os.cpu_count(), cacheBudget=CacheBudget, memoryPolicy=memory.MemoryRelease)
         self.__notes = {}
         self.__connections = set()
+        self.__evaluator = futures.ThreadPoolExecutor(max_workers=1)
+        self.__evaluation = 0
+        self.__finished_evaluation = 0
+        self.__cancel = threading.Event()
+        self.__evaluated.connect(self.__onEvaluated)
+        self.__proxy = 1
+        self.__progressive = True
+        self.__debouncer = debounce.OFnDebouncer(maxDelay=EvaluationMaxDelay)
+        self.__request_timer = QtCore.QTimer(self)
+        self.__request_timer.setSingleShot(True)
+        self.__request_timer.timeout.connect(self.__onRequestTimeout)
 
     def read(self, filepath):
         res = self.__scene.read(filepath)
@@ -137,80 +176,89 @@ class OFnUIScene(QtCore.QObject):
                 new_notes.append(note.toDict())
             d["misc"] = {"notes": new_notes}
 
-            QtGui.QGuiApplication.clipboard().setText(d.__repr__())
+            QtGui.QGuiApplication.clipboard().setText(sceneFormat.dumps(d))
 
     def loadFromClipboard(self, center=None):
         txt = QtGui.QGuiApplication.clipboard().text()
-        d = {}
         try:
-            d = eval(txt)
-        except:
+            d = sceneFormat.loads(txt)
+        except exceptions.OFnSceneFormatError:
             return
 
-        if not isinstance(d, dict) or "nodes" not in d or "connections" not in d:
+        # the notes and the positions are not checked by the scene format
+        notes = d["misc"].get("notes", [])
+        if not isinstance(notes, list) or not all([_isValidNote(x) for x in notes]):
+            print("Error : Invalid notes in the pasted scene")
+            return
+
+        if not all([_isPair(x["userData"].get("ui:pos")) for x in d["nodes"]]):
+            print("Error : Invalid node positions in the pasted scene")
             return
 
         if center:
-            l = None
-            r = None
-            t = None
-            b = None
-
-            def _updateRect(x, y):
-                nonlocal l
-                nonlocal r
-                nonlocal t
-                nonlocal b
-
-                if l is None:
-                    l = x
-                else:
-                    l = min(l, x)
-                if r is None:
-                    r = x
-                else:
-                    r = max(r, x)
-                if t is None:
-                    t = y
-                else:
-                    t = min(t, y)
-                if b is None:
-                    b = y
-                else:
-                    b = max(b, y)
+            self.__centerPasted(d, center)
 
-            for n in d["nodes"]:
-                if re.match("^" + n["type"], n["name"]):
-                    n["name"] = n["type"]
-                elif re.search("[0-9]+$", n["name"]):
-                    n["name"] = re.sub("[0-9]+$", "", n["name"])
+        if self.__scene.load(d):
+            self.__emitAllContents()
 
-                ud = n.get("userData")
-                if "ui:pos" in ud:
-                    _updateRect(*ud["ui:pos"])
+        for n in d.get("misc", {}).get("notes", []):
+            self.createNote(n)
 
-            for n in d.get("misc", {}).get("notes", []):
-                _updateRect(*n["pos"])
+    def __centerPasted(self, d, center):
+        l = None
+        r = None
+        t = None
+        b = None
 
-            if l is not None and r is not None and t is not None and b is not None:
-                cx = (l + r) * 0.5
-                cy = (t + b) * 0.5
+        def _updateRect(x, y):
+            nonlocal l
+            nonlocal r
+            nonlocal t
+            nonlocal b
 
-                for n in d["nodes"]:
-                    ud = n.get("userData")
-                    if "ui:pos" in ud:
-                        x, y = ud["ui:pos"]
-                        ud["ui:pos"] = (x - cx + center.x(), y - cy + center.y())
+            if l is None:
+                l = x
+            else:
+                l = min(l, x)
+            if r is None:
+                r = x
+            else:
+                r = max(r, x)
+            if t is None:
+                t = y
+            else:
+                t = min(t, y)
+            if b is None:
+                b = y
+            else:
+                b = max(b, y)
 
-                for n in d.get("misc", {}).get("notes", []):
-                    x, y = n["pos"]
-                    n["pos"] = (x - cx + center.x(), y - cy + center.y())
+        for n in d["nodes"]:
+            if re.match("^" + n["type"], n["name"]):
+                n["name"] = n["type"]
+            elif re.search("[0-9]+$", n["name"]):
+                n["name"] = re.sub("[0-9]+$", "", n["name"])
 
-        if self.__scene.load(d):
-            self.__emitAllContents()
+            ud = n.get("userData")
+            if "ui:pos" in ud:
+                _updateRect(*ud["ui:pos"])
 
         for n in d.get("misc", {}).get("notes", []):
-            self.createNote(n)
+            _updateRect(*n["pos"])
+
+        if l is not None and r is not None and t is not None and b is not None:
+            cx = (l + r) * 0.5
+            cy = (t + b) * 0.5
+
+            for n in d["nodes"]:
+                ud = n.get("userData")
+                if "ui:pos" in ud:
+                    x, y = ud["ui:pos"]
+                    ud["ui:pos"] = (x - cx + center.x(), y - cy + center.y())
+
+            for n in d.get("misc", {}).get("notes", []):
+                x, y = n["pos"]
+                n["pos"] = (x - cx + center.x(), y - cy + center.y())
 
     def __emitAllContents(self):
         for n in self.__scene.nodes():
@@ -318,10 +366,88 @@ class OFnUIScene(QtCore.QObject):
 
         return True
 
+    def requestEvaluation(self):
+        # a burst of requests is merged into one evaluation of the latest state once the requests pause
+        # or the delay after the first request of the burst has passed
+        delay = self.__debouncer.request()
+        self.__request_timer.start(int(delay * 1000))
+
+    def __onRequestTimeout(self):
+        if self.__debouncer.take():
+            self.evaluate()
+
+    def proxy(self):
+        return self.__proxy
+
+    def setProxy(self, proxy):
+        if proxy == self.__proxy:
+            return
+
+        # applied on the evaluation thread between two evaluations
+        self.__proxy = proxy
+        self.cancelEvaluation()
+        self.__evaluator.submit(self.__scene_graph.setProxy, proxy)
+        self.requestEvaluation()
+
+    def evaluationStats(self):
+        return self.__debouncer.stats()
+
     def evaluate(self):
+        # the nodes are evaluated on a worker thread from a snapshot, a newer request cancels the running one
         target_nodes = [x for x in self.__scene.nodes() if not x.packetable()]
         if target_nodes:
-            self.__scene_graph.evaluate(target_nodes)
+            if self.isEvaluating():
+                self.__debouncer.cancelled()
+
+            self.cancelEvaluation()
+            self.__cancel = threading.Event()
+            self.__evaluation += 1
+            self.__evaluator.submit(self.__evaluateSnapshot, self.__scene.snapshot(target_nodes), self.__cancel, self.__evaluation, self.__coarseLevel())
+
+    def progressive(self):
+        return self.__progressive
+
+    def setProgressive(self, enabled):
+        # show a coarse image first and then the image at the proxy level
+        self.__progressive = enabled
+
+    def __coarseLevel(self):
+        if not self.__progressive:
+            return None
+
+        coarse = min(max(ProxyLevels), self.__proxy * ProgressiveFactor)
+
+        return coarse if coarse > self.__proxy else None
+
+    def cancelEvaluation(self):
+        self.__cancel.set()
+
+    def shutdown(self):
+        self.__request_timer.stop()
+        self.cancelEvaluation()
+        self.__evaluator.shutdown(wait=False, cancel_futures=True)
+
+    def isEvaluating(self):
+        return not self.__cancel.is_set() and self.__evaluation != self.__finished_evaluation
+
+    def __evaluateSnapshot(self, snapshot, cancel, evaluation, coarse):
+        if cancel.is_set():
+            return
+
+        st = time.perf_counter()
+        try:
+            self.__scene_graph.evaluateSnapshot(snapshot, cancel=cancel, coarse=coarse)
+        except Exception:
+            print(f"Error : Failed to evaluate the scene -\n{traceback.format_exc()}")
+
+        if not cancel.is_set():
+            # queued to the UI thread
+            self.__evaluated.emit(evaluation, time.perf_counter() - st)
+
+    def __onEvaluated(self, evaluation, duration):
+        self.__finished_evaluation = evaluation
+        self.__debouncer.finished(duration)
+        if evaluation == self.__evaluation:
             self.evaluationFinished.emit()
 
     def failedNodes(self):
@@ -330,6 +456,15 @@ class OFnUIScene(QtCore.QObject):
     def errorMessage(self, node):
         return self.__scene_graph.errorMessage(node)
 
+    def cacheStats(self):
+        return self.__scene_graph.cacheStats()
+
+    def memoryStats(self):
+        return self.__scene_graph.memoryStats()
+
+    def profileReport(self, last=True, sort="wall", limit=None):
+        return self.__scene_graph.profileReport(last=last, sort=sort, limit=limit)
+
 
 class OFnUIViewResource(object):
     def __init__(self):
@@ -341,20 +476,29 @@ class OFnUIViewResource(object):
         self.__latest_stamp = None
         self.__image = self.__empty_image
         self.__arr = self.__empty_arr
+        self.__proxy = 1
+        self.__pass_state = resource.PassFinal
 
     def isDirty(self):
-        stamp = resource.OFnViewResource().stamp()
+        packet, stamp, pass_state = resource.OFnViewResource().latest()
         if stamp == self.__latest_stamp:
             return False
 
         self.__latest_stamp = stamp
-        self.__readResource()
+        self.__pass_state = pass_state
+        self.__readResource(packet)
 
         return True
 
     def image(self):
         return self.__image
 
+    def proxy(self):
+        return self.__proxy
+
+    def passState(self):
+        return self.__pass_state
+
     def getPixelValues(self, x, y):
         colors = []
 
@@ -371,9 +515,9 @@ class OFnUIViewResource(object):
 
         return colors
 
-    def __readResource(self):
-        packet = resource.OFnViewResource().packet()
+    def __readResource(self, packet):
         arr = packet.data()
+        self.__proxy = packet.metadata().get(resource.ProxyKey, 1)
 
         if len(arr.shape) == 3:
             h, w, c = arr.shape
@@ -5,6 +5,7 @@ from PySide6 import QtWidgets
 from PySide6 import QtCore
 from PySide6 import QtGui
 from . import model
+from ..core import resource
 
 
 class OFnUIHardwareResources(object):
@@ -191,6 +192,12 @@ class OFnUITextureShader(object):
 
         return (s.width(), s.height())
 
+    def proxy(self):
+        return self.__view.proxy()
+
+    def passState(self):
+        return self.__view.passState()
+
     def isDirty(self):
         if self.__view.isDirty():
             return True
@@ -442,6 +449,7 @@ class OFnUIAimGeometry(object):
 
 class OFnUIView(QtGui.QWindow):
     aimPositionChanged = QtCore.Signal()
+    imageChanged = QtCore.Signal(int, int)
 
     def __init__(self):
         super(OFnUIView, self).__init__()
@@ -542,11 +550,12 @@ class OFnUIView(QtGui.QWindow):
         sx = dpos.x() - (pixelWidth * 0.5)
         sy = dpos.y() - (pixelHeight * 0.5)
 
-        x0 = (iWidth * -0.5) * self.__scale + self.__img_pos.x()
-        y0 = (iHeight * -0.5) * self.__scale + self.__img_pos.y()
+        scale = self.__displayScale()
+        x0 = (iWidth * -0.5) * scale + self.__img_pos.x()
+        y0 = (iHeight * -0.5) * scale + self.__img_pos.y()
 
-        u = (sx - x0) / max(1e-12, (iWidth * self.__scale))
-        v = (sy - y0) / max(1e-12, (iHeight * self.__scale))
+        u = (sx - x0) / max(1e-12, (iWidth * scale))
+        v = (sy - y0) / max(1e-12, (iHeight * scale))
 
         ix = u * iWidth
         iy = v * iHeight
@@ -589,11 +598,15 @@ class OFnUIView(QtGui.QWindow):
             self.__move_anchor = event.position()
             self.__geom_dirty = True
 
+    def __displayScale(self):
+        # a proxy image is drawn at the size of the full resolution image
+        return self.__scale * self.__tex_shader.proxy()
+
     def __updateGeometry(self, batch):
-        self.__vertices.updateGeometry(batch, *(self.__hardware.pixelSize()), *(self.__tex_shader.imageSize()), self.__img_pos.x(), self.__img_pos.y(), self.__scale)
+        self.__vertices.updateGeometry(batch, *(self.__hardware.pixelSize()), *(self.__tex_shader.imageSize()), self.__img_pos.x(), self.__img_pos.y(), self.__displayScale())
 
     def __updateAim(self, batch):
-        self.__aim.updateGeometry(batch, *self.__aim_pixel, *(self.__hardware.pixelSize()), *(self.__tex_shader.imageSize()), self.__img_pos.x(), self.__img_pos.y(), self.__scale)
+        self.__aim.updateGeometry(batch, *self.__aim_pixel, *(self.__hardware.pixelSize()), *(self.__tex_shader.imageSize()), self.__img_pos.x(), self.__img_pos.y(), self.__displayScale())
 
     def render(self):
         if self.__wait:
@@ -620,6 +633,7 @@ class OFnUIView(QtGui.QWindow):
         if tex_dirty:
             self.__tex_shader.updateTexture(batch)
             self.aimPositionChanged.emit()
+            self.imageChanged.emit(self.__tex_shader.proxy(), self.__tex_shader.passState())
 
         if self.__geom_dirty:
             self.__updateGeometry(batch)
@@ -670,6 +684,8 @@ class OFnUIView(QtGui.QWindow):
             iw = max(2, iw - 2)
             self.__scale = ww / iw
 
+        self.__scale /= self.__tex_shader.proxy()
+
         self.__img_pos = QtCore.QPointF()
         self.__geom_dirty = True
 
@@ -692,6 +708,20 @@ class OFnUIFormatSwitcher(QtWidgets.QComboBox):
         self.formatChanged.emit(QtGui.QRhiSwapChain.Format.HDR10 if self.currentText() == "HDR10" else QtGui.QRhiSwapChain.Format.SDR)
 
 
+class OFnUIProxySwitcher(QtWidgets.QComboBox):
+    proxyChanged = QtCore.Signal(int)
+
+    def __init__(self, parent=None):
+        super(OFnUIProxySwitcher, self).__init__(parent=parent)
+        self.addItems(["Full", "1/2", "1/4", "1/8"])
+        self.setMaximumWidth(100)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.currentIndexChanged.connect(self.__proxyChanged)
+
+    def __proxyChanged(self, *args):
+        self.proxyChanged.emit(1 << self.currentIndex())
+
+
 class OFnUIViewport(QtWidgets.QWidget):
     aimPositionChanged = QtCore.Signal()
 
@@ -700,11 +730,23 @@ class OFnUIViewport(QtWidgets.QWidget):
         self.__view = OFnUIView()
         self.setMinimumWidth(300)
         self.setMinimumHeight(300)
+        self.__status = QtWidgets.QLabel(parent=self)
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(QtWidgets.QWidget.createWindowContainer(self.__view))
+        layout.addWidget(self.__status)
 
         self.__view.aimPositionChanged.connect(self.aimPositionChanged)
+        self.__view.imageChanged.connect(self.__onImageChanged)
+        self.__onImageChanged(1, resource.PassFinal)
+
+    def __onImageChanged(self, proxy, passState):
+        # the pass of the image shown, a coarse image is replaced when the full pass finishes
+        text = "Full" if proxy == 1 else f"1/{proxy}"
+        if passState == resource.PassCoarse:
+            text += " (refining...)"
+
+        self.__status.setText(text)
 
     def fit(self):
         self.__view.fit()
@@ -816,16 +858,20 @@ class OFnUIPixelInspector(QtWidgets.QFrame):
 
 class OFnUIViewportSettings(QtWidgets.QWidget):
     formatChanged = QtCore.Signal(QtGui.QRhiSwapChain.Format)
+    proxyChanged = QtCore.Signal(int)
 
     def __init__(self, parent=None):
         super(OFnUIViewportSettings, self).__init__(parent=parent)
         layout = QtWidgets.QVBoxLayout(self)
         self.__format_switcher = OFnUIFormatSwitcher(parent=self)
+        self.__proxy_switcher = OFnUIProxySwitcher(parent=self)
         self.__inspector = OFnUIPixelInspector(parent=self)
         layout.addWidget(self.__format_switcher)
+        layout.addWidget(self.__proxy_switcher)
         layout.addWidget(self.__inspector)
         layout.addStretch(1)
         self.__format_switcher.formatChanged.connect(self.formatChanged.emit)
+        self.__proxy_switcher.proxyChanged.connect(self.proxyChanged.emit)
 
     def setPixel(self, x, y, colors):
         self.__inspector.setPixel(x, y, colors)
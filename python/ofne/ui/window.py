@@ -57,6 +57,7 @@ class OFnUIMain(QtWidgets.QMainWindow):
         self.__params.updateRequest.connect(self.__graph.updateItem)
         self.__viewport.aimPositionChanged.connect(self.__aimPositionChanged)
         self.__viewport_settings.formatChanged.connect(self.__viewport.setFormat)
+        self.__viewport_settings.proxyChanged.connect(self.__graph.setProxy)
 
         # setup
         self.resize(800, 600)
@@ -106,3 +107,7 @@ class OFnUIMain(QtWidgets.QMainWindow):
         res = QtWidgets.QFileDialog.getOpenFileName(self, "Open", "", "Ofne Scene (*.ofsn)")[0]
         if res:
             self.__graph.open(res)
+
+    def closeEvent(self, event):
+        self.__graph.shutdown()
+        super(OFnUIMain, self).closeEvent(event)
@@ -0,0 +1,99 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+
+class BatchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne import batch
+        except:
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            import OpenImageIO
+            from ofne import batch
+            from ofne.core import scene
+            from ofne.core import opManager
+            cls.oiio = OpenImageIO
+            cls.batch = batch
+            cls.scene = scene
+            opManager.OFnOpManager().reloadPlugins()
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+        os.environ.pop("FRAME", None)
+
+    def test_parseFrames(self):
+        self.assertEqual(self.batch.parseFrames("1"), [1])
+        self.assertEqual(self.batch.parseFrames("1-4"), [1, 2, 3, 4])
+        self.assertEqual(self.batch.parseFrames("1-9x4"), [1, 5, 9])
+        self.assertEqual(self.batch.parseFrames("1-3,2,7"), [1, 2, 3, 7])
+        self.assertEqual(self.batch.parseFrames("-2--1"), [-2, -1])
+        with self.assertRaises(ValueError):
+            self.batch.parseFrames("a")
+        with self.assertRaises(ValueError):
+            self.batch.parseFrames("5-1")
+        with self.assertRaises(ValueError):
+            self.batch.parseFrames("1-5x0")
+
+    def test_render(self):
+        scn = self.scene.OFnScene()
+        const = scn.createNode("ConstantImage")
+        const.setParamValue("width", 8)
+        const.setParamValue("height", 4)
+        const.setParamValue("R", 0.5)
+        read = scn.createNode("ReadImage")
+        scene_path = os.path.join(self.tmpdir, "test.ofsn")
+        self.assertTrue(scn.write(scene_path))
+
+        out_a = os.path.join(self.tmpdir, "a.${FRAME}.exr")
+        self.assertTrue(self.batch.render(scene_path, {const.name(): out_a}, frames=[1, 3]))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, "a.0001.exr")))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, "a.0003.exr")))
+        self.assertFalse(os.path.isfile(os.path.join(self.tmpdir, "a.0002.exr")))
+
+        out_b = os.path.join(self.tmpdir, "b.${FRAME}.exr")
+        self.assertTrue(self.batch.render(scene_path, {read.name(): out_b}, frames=[3], overrides={f"{read.name()}.path": out_a}))
+        buf = self.oiio.ImageBuf(os.path.join(self.tmpdir, "b.0003.exr"))
+        pixels = buf.get_pixels(format=self.oiio.FLOAT)
+        self.assertEqual(pixels.shape, (4, 8, 4))
+        self.assertTrue(np.allclose(pixels[..., 0], 0.5))
+
+        self.assertTrue(self.batch.render(scene_path, {const.name(): out_a}, frames=[3], padding=2))
+        self.assertTrue(os.path.isfile(os.path.join(self.tmpdir, "a.03.exr")))
+
+        self.assertFalse(self.batch.render(scene_path, {read.name(): out_b}, frames=[2], overrides={f"{read.name()}.path": out_a}))
+        self.assertFalse(self.batch.render(scene_path, {"NoSuchNode": out_b}))
+        self.assertFalse(self.batch.render(scene_path, {const.name(): out_b}, overrides={f"{const.name()}.R": "1"}))
+
+    def test_renderFrames(self):
+        # the path of the ReadImage changes with ${FRAME}, each frame reads its own image
+        for frame, value in ((1, 0.1), (2, 0.9)):
+            buf = self.oiio.ImageBuf(self.oiio.ImageSpec(8, 4, 4, self.oiio.FLOAT))
+            buf.set_pixels(self.oiio.ROI(0, 8, 0, 4, 0, 1, 0, 4), np.full((4, 8, 4), value, dtype=np.float32))
+            self.assertTrue(buf.write(os.path.join(self.tmpdir, f"in.{frame:04d}.exr")))
+
+        scn = self.scene.OFnScene()
+        read = scn.createNode("ReadImage")
+        read.setParamValue("path", "${OFSN}/in.${FRAME}.exr")
+        scene_path = os.path.join(self.tmpdir, "frames.ofsn")
+        self.assertTrue(scn.write(scene_path))
+
+        out = os.path.join(self.tmpdir, "out.${FRAME}.exr")
+        os.environ["FRAME"] = "previous"
+        os.environ.pop("OFSN", None)
+        self.assertTrue(self.batch.render(scene_path, {read.name(): out}, frames=[1, 2]))
+        self.assertEqual(os.environ.get("FRAME"), "previous")
+        self.assertNotIn("OFSN", os.environ)
+        for frame, value in ((1, 0.1), (2, 0.9)):
+            pixels = self.oiio.ImageBuf(os.path.join(self.tmpdir, f"out.{frame:04d}.exr")).get_pixels(format=self.oiio.FLOAT)
+            self.assertTrue(np.allclose(pixels, value))
@@ -0,0 +1,44 @@
+import os
+import io
+import sys
+import contextlib
+import unittest
+
+
+class BenchSuiteTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+        sys.path.append((os.path.abspath(os.path.join(__file__, "../../benchmarks"))))
+
+        import bench_suite
+        cls.bench_suite = bench_suite
+
+    def __compare(self, results, baseline, threshold, minTime=0.0):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            regressions = self.bench_suite.compare(results, baseline, threshold, minTime=minTime)
+
+        return (regressions, out.getvalue())
+
+    def test_compare(self):
+        baseline = {"a": 1.0, "b": 1.0, "c": 0.0001, "d": 1.0, "removed": 1.0}
+        results = {"a": 1.2, "b": 1.3, "c": 0.0003, "d": 0.5, "added": 1.0}
+
+        # slower than the threshold only
+        regressions, text = self.__compare(results, baseline, 0.25)
+        self.assertEqual(regressions, ["b", "c"])
+        lines = dict([(x.split()[0], x.split()[-1]) for x in text.splitlines()[1:]])
+        self.assertEqual(lines["added"], "new")
+        self.assertEqual(lines["removed"], "gone")
+
+        # the results faster than minTime in both runs are noise
+        regressions, _ = self.__compare(results, baseline, 0.25, minTime=0.001)
+        self.assertEqual(regressions, ["b"])
+
+        regressions, _ = self.__compare(results, baseline, 0.1, minTime=0.001)
+        self.assertEqual(regressions, ["a", "b"])
+
+        # a zero baseline is never a regression
+        regressions, _ = self.__compare({"a": 1.0}, {"a": 0.0}, 0.25)
+        self.assertEqual(regressions, [])
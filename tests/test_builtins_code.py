@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+import numpy as np
+
+
+class BuiltinsCode(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne.core import scene
+        except:
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne.core import scene
+            from ofne.core import packet
+            from ofne.core import opManager
+            cls.scene = scene
+            cls.packet = packet
+            opManager.OFnOpManager().reloadPlugins()
+            cls.code = opManager.OFnOpManager().getOp("PythonExpression").operate.__globals__
+
+    def __run(self, node, *datas):
+        return node.operate(self.packet.OFnPacketArray([self.packet.OFnPacket(data=x) for x in datas]))
+
+    def test_compileOnce(self):
+        self.code["_clearCodeCache"]()
+        scn = self.scene.OFnScene()
+        n1 = scn.createNode("PythonExpression")
+        n2 = scn.createNode("PythonExpression")
+        expression = "outPacket = Packet(data=np.array([x * 2 for x in inPackets.packet(0).data()]))\n"
+        n1.setParamValue("code", expression)
+        n2.setParamValue("code", expression)
+
+        # comprehensions see the names of the expression
+        self.assertTrue(np.array_equal(self.__run(n1, np.array([1, 2])).data(), [2, 4]))
+        self.assertTrue(np.array_equal(self.__run(n2, np.array([3])).data(), [6]))
+        stats = self.code["_codeCacheStats"]()
+        self.assertEqual(stats["codes"], 2)
+        self.assertEqual(stats["setups"], 1)
+
+        code = self.code["_compile"](expression, "<expression>")
+        self.assertIs(code, self.code["_compile"](expression, "<expression>"))
+        self.assertEqual(self.code["_codeCacheStats"]()["codes"], 2)
+
+        n2.setParamValue("code", "outPacket = inPackets.packet(0)\n")
+        self.__run(n2, np.array([3]))
+        self.assertEqual(self.code["_codeCacheStats"]()["codes"], 3)
+
+        # the errors are raised every time
+        n1.setParamValue("code", "outPacket = (\n")
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                self.__run(n1, np.array([1]))
+
+    def test_setup(self):
+        self.code["_clearCodeCache"]()
+        scn = self.scene.OFnScene()
+        n = scn.createNode("PythonExpression")
+        n.setParamValue("setup", "table = np.arange(4) * 10\ntoken = object()\n")
+        n.setParamValue("code", "outPacket = Packet(metadata={'token': id(token)}, data=table[inPackets.packet(0).data()])\ntable = None\n")
+
+        p1 = self.__run(n, np.array([1, 3]))
+        self.assertTrue(np.array_equal(p1.data(), [10, 30]))
+
+        # the setup runs once, rebinding its names in the expression does not change it
+        p2 = self.__run(n, np.array([2]))
+        self.assertTrue(np.array_equal(p2.data(), [20]))
+        self.assertEqual(p1.metadata()["token"], p2.metadata()["token"])
+
+        # changing the expression keeps the setup, changing the setup runs it again
+        n.setParamValue("code", "outPacket = Packet(metadata={'token': id(token)}, data=table[:1])\n")
+        self.assertEqual(self.__run(n).metadata()["token"], p1.metadata()["token"])
+        n.setParamValue("setup", "table = np.arange(4) * 100\ntoken = object()\n")
+        p3 = self.__run(n)
+        self.assertNotEqual(p3.metadata()["token"], p1.metadata()["token"])
+        self.assertTrue(np.array_equal(p3.data(), [0]))
+
+        # the names of an evaluation are not seen by the next one
+        n.setParamValue("code", "count = globals().get('count', 0) + 1\noutPacket = Packet(data=np.array([count]))\n")
+        self.assertTrue(np.array_equal(self.__run(n).data(), [1]))
+        self.assertTrue(np.array_equal(self.__run(n).data(), [1]))
+
+        n.setParamValue("setup", "raise ValueError('setup failed')\n")
+        with self.assertRaises(ValueError):
+            self.__run(n)
+        self.assertEqual(self.code["_codeCacheStats"]()["setups"], 2)
@@ -0,0 +1,109 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+
+class BuiltinsIO(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne.core import scene
+        except:
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            import OpenImageIO
+            from ofne.core import scene
+            from ofne.core import packet
+            from ofne.core import opManager
+            cls.oiio = OpenImageIO
+            cls.scene = scene
+            cls.packet = packet
+            opManager.OFnOpManager().reloadPlugins()
+            cls.io = opManager.OFnOpManager().getOp("ReadImage").operate.__globals__
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def __write(self, path, value):
+        out = self.oiio.ImageOutput.create(path)
+        out.open(path, self.oiio.ImageSpec(8, 4, 3, self.oiio.FLOAT))
+        out.write_image(np.full((4, 8, 3), value, dtype=np.float32))
+        out.close()
+
+    def test_readImageCache(self):
+        scn = self.scene.OFnScene()
+        read = scn.createNode("ReadImage")
+        path = os.path.join(self.tmpdir, "a.exr")
+        self.__write(path, 0.5)
+        read.setParamValue("path", path)
+        self.io["_clearImageCache"]()
+
+        empty = self.packet.OFnPacketArray([])
+        d1 = read.operate(empty).data()
+        self.assertTrue(np.allclose(d1, 0.5))
+
+        # the decoded pixels are shared
+        d2 = read.operate(empty).data()
+        self.assertTrue(np.shares_memory(d1, d2))
+
+        # the file is read again when it is modified
+        st = os.stat(path)
+        self.__write(path, 0.25)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        d3 = read.operate(empty).data()
+        self.assertFalse(np.shares_memory(d1, d3))
+        self.assertTrue(np.allclose(d3, 0.25))
+
+        # the previous version of the file is dropped
+        stats = self.io["_imageCacheStats"]()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["bytes"], d3.nbytes)
+
+    def test_readImageProxy(self):
+        scn = self.scene.OFnScene()
+        read = scn.createNode("ReadImage")
+        const = scn.createNode("ConstantImage")
+        self.io["_clearImageCache"]()
+
+        # a flat file is resized
+        flat = os.path.join(self.tmpdir, "flat.exr")
+        out = self.oiio.ImageOutput.create(flat)
+        out.open(flat, self.oiio.ImageSpec(64, 32, 3, self.oiio.FLOAT))
+        out.write_image(np.full((32, 64, 3), 0.5, dtype=np.float32))
+        out.close()
+        read.setParamValue("path", flat)
+
+        full = read.operate(self.packet.OFnPacketArray([])).data()
+        half = read.operate(self.packet.OFnPacketArray([], proxy=2)).data()
+        eighth = read.operate(self.packet.OFnPacketArray([], proxy=8)).data()
+        self.assertEqual(full.shape, (32, 64, 3))
+        self.assertEqual(half.shape, (16, 32, 3))
+        self.assertEqual(eighth.shape, (4, 8, 3))
+        self.assertTrue(np.allclose(eighth, 0.5))
+        self.assertEqual(eighth.dtype, full.dtype)
+
+        # each proxy level is cached separately
+        self.assertTrue(np.shares_memory(half, read.operate(self.packet.OFnPacketArray([], proxy=2)).data()))
+        self.assertEqual(self.io["_imageCacheStats"]()["entries"], 3)
+
+        # the MIP level of the proxy is read if the file has one
+        buf = self.oiio.ImageBuf(self.oiio.ImageSpec(64, 32, 3, self.oiio.FLOAT))
+        buf.set_pixels(self.oiio.ROI(), np.full((32, 64, 3), 0.25, dtype=np.float32))
+        mip = os.path.join(self.tmpdir, "mip.exr")
+        self.assertTrue(self.oiio.ImageBufAlgo.make_texture(self.oiio.MakeTxTexture, buf, mip, self.oiio.ImageSpec()))
+        read.setParamValue("path", mip)
+        quarter = read.operate(self.packet.OFnPacketArray([], proxy=4)).data()
+        self.assertEqual(quarter.shape, (8, 16, 3))
+        self.assertTrue(np.allclose(quarter, 0.25))
+
+        const.setParamValue("width", 100)
+        const.setParamValue("height", 50)
+        self.assertEqual(const.operate(self.packet.OFnPacketArray([], proxy=4)).data().shape, (12, 25, 4))
@@ -0,0 +1,173 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+
+class BuiltinsOCIO(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne.core import scene
+        except:
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne.core import scene
+            from ofne.core import packet
+            from ofne.core import opManager
+            cls.scene = scene
+            cls.packet = packet
+            opManager.OFnOpManager().reloadPlugins()
+            cls.ocio = opManager.OFnOpManager().getOp("OCIOMatrixTransform").operate.__globals__
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.ocio["_clearCaches"]()
+
+    def tearDown(self):
+        self.ocio["_clearCaches"]()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def __writeCube(self, path, scale):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("LUT_3D_SIZE 2\n")
+            for b in range(2):
+                for g in range(2):
+                    for r in range(2):
+                        f.write(f"{r * scale} {g * scale} {b * scale}\n")
+
+    def __operate(self, node, value=1.0):
+        inp = self.packet.OFnPacket(data=np.full((4, 8, 3), value, dtype=np.float32))
+
+        return node.operate(self.packet.OFnPacketArray([inp])).data()
+
+    def test_processorCache(self):
+        scn = self.scene.OFnScene()
+        a = scn.createNode("OCIOExponentTransform")
+        b = scn.createNode("OCIOExponentTransform")
+        a.setParamValue("gamma", 2.0)
+        b.setParamValue("gamma", 2.0)
+
+        # the nodes with the same params share the processor
+        self.__operate(a)
+        self.__operate(b)
+        processors = self.ocio["_PROCESSORS"]
+        self.assertEqual(len(processors), 1)
+        proc = list(processors.values())[0]
+
+        b.setParamValue("gamma", 3.0)
+        self.assertTrue(np.allclose(self.__operate(b, 0.5), 0.5 ** 3.0, atol=1e-4))
+        self.assertEqual(len(processors), 2)
+        self.__operate(a)
+        self.assertIs(list(processors.values())[-1], proc)
+
+        # the configs are parsed once
+        config = "builtin:studio-config-v2.2.0_aces-v1.3_ocio-v2.4"
+        self.assertIs(self.ocio["_getOCIO"](config), self.ocio["_getOCIO"](config))
+
+    def test_processorEviction(self):
+        get = self.ocio["_getProcessor"]
+        made = []
+
+        def _factory(i):
+            made.append(i)
+            return ("proc", i)
+
+        count = self.ocio["MAX_CACHED_PROCESSORS"]
+        for i in range(count):
+            get(("test", i), lambda i=i: _factory(i))
+
+        # the least recently used one is evicted
+        self.assertEqual(get(("test", 0), lambda: _factory(0)), ("proc", 0))
+        self.assertEqual(len(made), count)
+        get(("test", count), lambda: _factory(count))
+        self.assertEqual(len(self.ocio["_PROCESSORS"]), count)
+        self.assertIn(("test", 0), self.ocio["_PROCESSORS"])
+        self.assertNotIn(("test", 1), self.ocio["_PROCESSORS"])
+
+        get(("test", 1), lambda: _factory(1))
+        self.assertEqual(made[-1], 1)
+        self.assertEqual(len(made), count + 2)
+
+    def test_lutReload(self):
+        path = os.path.join(self.tmpdir, "lut.cube")
+        self.__writeCube(path, 0.5)
+
+        scn = self.scene.OFnScene()
+        n = scn.createNode("OCIOFileTransform")
+        n.setParamValue("src", path)
+        self.assertTrue(np.allclose(self.__operate(n), 0.5))
+        self.assertTrue(np.allclose(self.__operate(n), 0.5))
+        self.assertEqual(len(self.ocio["_PROCESSORS"]), 1)
+
+        # the processor is built again when the file is modified
+        st = os.stat(path)
+        self.__writeCube(path, 0.25)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+        self.assertTrue(np.allclose(self.__operate(n), 0.25))
+        self.assertEqual(len(self.ocio["_PROCESSORS"]), 2)
+
+    def test_applyBands(self):
+        raw = self.ocio["RAW_CONFIG"]
+        ocio = self.ocio["ocio"]
+        proc = raw.getProcessor(ocio.ExponentWithLinearTransform(gamma=[2.4, 2.2, 2.0, 1.0], offset=[0.055, 0.05, 0.04, 0.0])).getDefaultCPUProcessor()
+        threads = self.ocio["APPLY_THREADS"]
+        min_rows = self.ocio["APPLY_MIN_ROWS"]
+
+        # the height is not a multiple of the band height
+        self.ocio["APPLY_THREADS"] = 4
+        self.ocio["APPLY_MIN_ROWS"] = 8
+        try:
+            rng = np.random.default_rng(0)
+            for c in (3, 4):
+                data = rng.random((203, 17, c), dtype=np.float32)
+                expected = data.copy()
+                (proc.applyRGB if c == 3 else proc.applyRGBA)(expected)
+
+                self.ocio["_apply"](proc, data)
+                self.assertTrue(np.array_equal(data, expected))
+        finally:
+            self.ocio["APPLY_THREADS"] = threads
+            self.ocio["APPLY_MIN_ROWS"] = min_rows
+
+    def test_fuse(self):
+        from ofne.graph.scene import OFnGraphScene
+
+        scn = self.scene.OFnScene()
+        matrix = scn.createNode("OCIOMatrixTransform")
+        matrix.setParamValue("m00", 1.1)
+        matrix.setParamValue("m11", 0.9)
+        matrix.setParamValue("offset0", 0.01)
+        exponent = scn.createNode("OCIOExponentTransform")
+        exponent.setParamValue("gamma", 2.2)
+        exponent.connect(matrix)
+        cst = scn.createNode("OCIOColorSpaceTransform")
+        cst.setParamValue("config", "builtin:studio-config-v2.2.0_aces-v1.3_ocio-v2.4")
+        cst.setParamValue("from", "aka:ap0")
+        cst.setParamValue("to", "aka:srgb")
+        cst.connect(exponent)
+
+        data = np.random.default_rng(0).random((16, 24, 4), dtype=np.float32)
+        src = scn.createNode("PythonExpression")
+        src.setParamValue("setup", "import numpy\ndata = numpy.random.default_rng(0).random((16, 24, 4), dtype=numpy.float32)\n")
+        src.setParamValue("code", "outPacket = Packet(data=data)\n")
+        matrix.connect(src)
+
+        # the chain is applied by a single processor made of the group of the transforms
+        graph = OFnGraphScene(scn)
+        fused = graph.packet(cst).data()
+        rows = dict([(x["name"], x) for x in graph.profileReport()])
+        self.assertEqual(rows[cst.name()]["fused"], 2)
+        self.assertNotIn(matrix.name(), rows)
+
+        expected = self.packet.OFnPacket(data=data)
+        for n in (matrix, exponent, cst):
+            expected = n.operate(self.packet.OFnPacketArray([expected]))
+
+        self.assertEqual(fused.shape, data.shape)
+        self.assertTrue(np.allclose(fused, expected.resolved().data(), atol=1e-6))
+        self.assertFalse(np.allclose(fused, data))
@@ -38,7 +38,12 @@ class CorePacket(unittest.TestCase):
         dt = p2.data()
         self.assertEqual(mt, {"a": 1})
         self.assertTrue(np.all(dt == np.array([1, 2, 3])))
+        self.assertFalse(dt.flags.writeable)
+        with self.assertRaises(ValueError):
+            dt[1] = 3
         mt["a"] = 2
+        dt = p2.mutableData()
+        self.assertTrue(dt.flags.writeable)
         dt[1] = 3
         self.assertEqual(mt, {"a": 2})
         self.assertTrue(np.all(dt == np.array([1, 3, 3])))
@@ -56,14 +61,47 @@ class CorePacket(unittest.TestCase):
         dt = p2.data()
         dt2 = p3.data()
         self.assertTrue(np.all(dt == dt2))
+        self.assertTrue(np.shares_memory(dt, dt2))
+        dt = p2.mutableData()
         dt[1] = 4
         self.assertFalse(np.all(dt == dt2))
+        self.assertFalse(np.shares_memory(dt, dt2))
+
+        src = np.array([1.0, 2.0, 3.0])
+        p4 = self.packet.OFnPacket(data=src)
+        self.assertTrue(np.shares_memory(p4.data(), src))
+        self.assertTrue(src.flags.writeable)
+        self.assertFalse(p4.data().flags.writeable)
 
         with self.assertRaises(self.exceptions.OFnInvalidArgumentError):
             self.packet.OFnPacket(metadata=["A", "b"])
         with self.assertRaises(self.exceptions.OFnInvalidArgumentError):
             self.packet.OFnPacket(data=[1, 2])
 
+    def testPacketStorageType(self):
+        p = self.packet.OFnPacket(data=np.array([1.0, 2.0], dtype=np.float32))
+        self.assertIsNone(p.storageType())
+        self.assertIs(p.resolved(), p)
+
+        p = self.packet.OFnPacket(data=np.array([1.0, 2.0], dtype=np.float32), storageType=np.float32)
+        self.assertIsNone(p.storageType())
+
+        p = self.packet.OFnPacket(metadata={"a": 1}, data=np.array([0.0, 0.5, 1.0, 2.0], dtype=np.float32), storageType=np.uint8)
+        self.assertEqual(p.storageType(), np.dtype(np.uint8))
+        self.assertEqual(p.data().dtype, np.float32)
+        self.assertEqual(p.copy().storageType(), np.dtype(np.uint8))
+
+        r = p.resolved()
+        self.assertIsNone(r.storageType())
+        self.assertEqual(r.data().dtype, np.uint8)
+        self.assertEqual(r.data().tolist(), [0, 128, 255, 255])
+        self.assertEqual(r.metadata().get("a"), 1)
+        self.assertIs(p.resolved(), r)
+
+        p = self.packet.OFnPacket(data=np.array([1.0, 100000.0], dtype=np.float32), storageType=np.float16)
+        self.assertEqual(p.resolved().data().dtype, np.float16)
+        self.assertTrue(np.isfinite(p.resolved().data()).all())
+
     def testPacketArray(self):
         p1 = self.packet.OFnPacket(metadata={"a": 1}, data=np.array([1, 2, 3]))
         pa1 = self.packet.OFnPacketArray([p1])
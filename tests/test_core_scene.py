@@ -13,7 +13,11 @@ class SceneTest(unittest.TestCase):
             import os
             from ofne.core import scene
             from ofne.core import opManager
+            from ofne.core import sceneFormat
+            from ofne import exceptions
             cls.scene = scene
+            cls.sceneFormat = sceneFormat
+            cls.exceptions = exceptions
             cls.opManager = opManager
             cls.orgEnv = os.environ.get("OFNE_PLUGIN_PATH")
             os.environ["OFNE_PLUGIN_PATH"] = os.path.join(__file__, "../plugins")
@@ -148,8 +152,7 @@ class SceneTest(unittest.TestCase):
 
     def __read(self):
         try:
-            with open(self.test_ofsn_file) as f:
-                return eval(f.read())
+            return self.sceneFormat.readFile(self.test_ofsn_file)
         except:
             return None
 
@@ -259,3 +262,173 @@ class SceneTest(unittest.TestCase):
         self.assertTrue(b0ins[0] in a_nodes)
         self.assertTrue(b1ins[0] in a_nodes)
         self.assertNotEqual(b0ins[0], b1ins[0])
+
+    def test_readLegacy(self):
+        scn = self.scene.OFnScene()
+        a = scn.createNode("MyOpA")
+        b = scn.createNode("MyOpB")
+        b.connect(a, index=1)
+        a.setUserData("ui:pos", (10.0, 20.0))
+        a.setParamValue("count", 5)
+        scn.setMisc({"notes": [{"pos": (1, 2), "text": "memo"}]})
+        d = scn.toDict()
+
+        # the scenes were written with pprint before the version 1
+        from pprint import pformat
+        with open(self.test_ofsn_file, "w") as f:
+            f.write(pformat(d))
+
+        scn = self.scene.OFnScene()
+        self.assertTrue(scn.read(self.test_ofsn_file))
+        self.assertEqual(len(scn.nodes()), 2)
+        ra = scn.nodes()[0] if scn.nodes()[0].type() == "MyOpA" else scn.nodes()[1]
+        rb = scn.nodes()[1] if ra is scn.nodes()[0] else scn.nodes()[0]
+        self.assertEqual(ra.getParamValue("count"), 5)
+        self.assertEqual(list(ra.getUserData("ui:pos")), [10.0, 20.0])
+        self.assertEqual(rb.inputs(), [None, ra])
+        self.assertEqual(scn.misc(), {"notes": [{"pos": [1, 2], "text": "memo"}]})
+
+        # saving migrates the scene
+        self.assertTrue(scn.write(self.test_ofsn_file))
+        with open(self.test_ofsn_file) as f:
+            self.assertFalse(self.sceneFormat.isLegacy(f.read()))
+        self.assertEqual(len(self.sceneFormat.readFile(self.test_ofsn_file)["nodes"]), 2)
+
+    def test_sceneFormat(self):
+        d = {
+            "nodes": [{"name": "MyOpA1", "type": "MyOpA", "id": "0", "byPassed": False, "params": {"count": 1}, "userData": {"ui:pos": [0, 1]}}],
+            "connections": [{"src": "0", "dst": "1", "index": 0}],
+            "misc": {"notes": []}
+        }
+        text = self.sceneFormat.dumps(d)
+        self.assertEqual(len(text.splitlines()), 4)
+        self.assertEqual(self.sceneFormat.loads(text), d)
+        self.assertEqual(self.sceneFormat.loads(repr(d)), d)
+
+        # legacy scenes are never evaluated
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("__import__('os').remove('x')")
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("{'nodes': [open('x')]}")
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("[1, 2]")
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("{'nodes': [{'id': b'0'}]}")
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("{'nodes': [], 'misc': {'tags': {1, 2}}}")
+
+        # the records are complete
+        node = d["nodes"][0]
+        for key in ("name", "type", "id", "byPassed", "params", "userData"):
+            broken = dict(node)
+            broken.pop(key)
+            with self.assertRaises(self.exceptions.OFnSceneFormatError):
+                self.sceneFormat.loads(self.sceneFormat.dumps({"nodes": [broken], "connections": []}))
+            with self.assertRaises(self.exceptions.OFnSceneFormatError):
+                self.sceneFormat.loads(repr({"nodes": [broken]}))
+
+        for con in ({"src": "0", "dst": "1"}, {"src": "0", "index": 0}, {"src": "0", "dst": "1", "index": "0"}, {"src": [], "dst": "1", "index": 0}):
+            with self.assertRaises(self.exceptions.OFnSceneFormatError):
+                self.sceneFormat.loads(self.sceneFormat.dumps({"nodes": [node], "connections": [con]}))
+
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads("{'nodes': [1]}")
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads(text.replace('{"misc": {"notes": []}}', '{"misc": [1]}'))
+
+        # an unknown id is skipped by the scene
+        self.assertEqual(len(self.sceneFormat.loads(self.sceneFormat.dumps({"nodes": [node], "connections": [{"src": "x", "dst": "0", "index": 0}]}))["connections"]), 1)
+
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads('{"format": "ofne-scene", "version": 999}\n')
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads('{"format": "other", "version": 1}\n')
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads(text + '{"unknown": 1}\n')
+        with self.assertRaises(self.exceptions.OFnSceneFormatError):
+            self.sceneFormat.loads(text + '{"node": \n')
+
+        scn = self.scene.OFnScene()
+        scn.createNode("MyOpA")
+        self.assertTrue(scn.write(self.test_ofsn_file))
+        with open(self.test_ofsn_file, "w") as f:
+            f.write('{"format": "ofne-scene", "version": 1}\n{"node": ')
+        self.assertFalse(scn.read(self.test_ofsn_file))
+
+    def test_changeCallback(self):
+        scn = self.scene.OFnScene()
+        a = scn.createNode("MyOpA", name="a")
+        b = scn.createNode("MyOpB", name="b")
+        changed = []
+
+        def _changed(node):
+            changed.append(node.name())
+
+        self.assertTrue(scn.addChangeCallback(_changed))
+        self.assertFalse(scn.addChangeCallback(_changed))
+
+        gen = a.generation()
+        a.setParamValue("count", 1)
+        self.assertEqual(changed, ["a"])
+        self.assertEqual(a.generation(), gen + 1)
+
+        # the same value is not a change
+        a.setParamValue("count", 1)
+        self.assertEqual(changed, ["a"])
+        self.assertEqual(a.generation(), gen + 1)
+
+        gen = b.generation()
+        b.connect(a, 0)
+        b.connect(a, 0)
+        b.connect(a, 1)
+        self.assertEqual(changed, ["a", "b", "b"])
+        b.disconnect(0)
+        b.disconnect(0)
+        self.assertEqual(changed, ["a", "b", "b", "b"])
+        b.setByPassed(True)
+        b.setByPassed(True)
+        self.assertEqual(changed, ["a", "b", "b", "b", "b"])
+        self.assertEqual(b.generation(), gen + 4)
+
+        scn.deleteNode(a)
+        self.assertEqual(changed, ["a", "b", "b", "b", "b", "b"])
+
+        self.assertTrue(scn.removeChangeCallback(_changed))
+        self.assertFalse(scn.removeChangeCallback(_changed))
+        b.setByPassed(False)
+        self.assertEqual(len(changed), 6)
+
+    def test_uniqueName(self):
+        import random
+
+        def _expected(scn, name):
+            names = set([x.name() for x in scn.nodes()])
+            index = 0
+            while (True):
+                nname = f"{name}{index}" if index > 0 else name
+                if nname not in names:
+                    return nname
+
+                index += 1
+
+        rnd = random.Random(3)
+        scn = self.scene.OFnScene()
+        for _ in range(500):
+            nodes = scn.nodes()
+            action = rnd.random()
+            name = rnd.choice(["a", "a1", "b", "a11", "b2"])
+
+            if action < 0.5 or not nodes:
+                expected = _expected(scn, name)
+                self.assertEqual(scn.createNode("MyOpA", name=name).name(), expected)
+            elif action < 0.8:
+                self.assertTrue(scn.deleteNode(rnd.choice(nodes)))
+            else:
+                expected = _expected(scn, name)
+                self.assertEqual(rnd.choice(nodes).rename(name), expected)
+
+            names = [x.name() for x in scn.nodes()]
+            self.assertEqual(len(names), len(set(names)))
+
+        scn.clear()
+        self.assertEqual(scn.createNode("MyOpA", name="a").name(), "a")
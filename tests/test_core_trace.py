@@ -0,0 +1,119 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import numpy as np
+
+
+class CoreTrace(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne.core import trace
+        except:
+            import sys
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne.core import trace
+            from ofne.core import packet
+            from ofne.core import opManager
+            from ofne.core.scene import OFnScene
+            from ofne.graph.scene import OFnGraphScene
+            cls.trace = trace
+            cls.packet = packet
+            cls.OFnScene = OFnScene
+            cls.OFnGraphScene = OFnGraphScene
+            opManager.OFnOpManager().reloadPlugins()
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.trace.stop()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_span(self):
+        # nothing is recorded while disabled
+        self.assertFalse(self.trace.isEnabled())
+        self.assertIs(self.trace.span("a"), self.trace.span("b", cat="x", v=1))
+
+        tracer = self.trace.start()
+        self.assertTrue(self.trace.isEnabled())
+        with self.trace.span("outer", cat="test", v=1):
+            with self.trace.span("inner"):
+                pass
+
+        th = threading.Thread(target=lambda: self.trace.span("thread").__enter__().__exit__(None, None, None), name="worker")
+        th.start()
+        th.join()
+
+        self.assertIs(self.trace.stop(), tracer)
+        self.assertFalse(self.trace.isEnabled())
+
+        events = [x for x in tracer.events() if x["ph"] == "X"]
+        names = dict([(x["name"], x) for x in events])
+        self.assertEqual(set(names.keys()), set(["outer", "inner", "thread"]))
+        self.assertEqual(names["outer"]["cat"], "test")
+        self.assertEqual(names["outer"]["args"], {"v": 1})
+        self.assertLessEqual(names["outer"]["ts"], names["inner"]["ts"])
+        self.assertGreaterEqual(names["outer"]["dur"], names["inner"]["dur"])
+        self.assertNotEqual(names["outer"]["tid"], names["thread"]["tid"])
+
+        meta = [x for x in tracer.events() if x["ph"] == "M"]
+        self.assertIn("worker", [x["args"]["name"] for x in meta])
+
+    def test_record(self):
+        path = os.path.join(self.tmpdir, "packet.json")
+        with self.trace.record(path):
+            p = self.packet.OFnPacket(data=np.zeros((2, 2), dtype=np.float32), storageType=np.uint8)
+            p.resolved()
+            p.mutableData()
+
+        self.assertFalse(self.trace.isEnabled())
+        with open(path) as f:
+            data = json.load(f)
+
+        names = [x["name"] for x in data["traceEvents"] if x["ph"] == "X"]
+        self.assertIn("packet", names)
+        self.assertIn("resolve", names)
+        self.assertIn("copy", names)
+
+    def test_evaluate(self):
+        import OpenImageIO as oiio
+
+        image_path = os.path.join(self.tmpdir, "image.exr")
+        buf = oiio.ImageBuf(oiio.ImageSpec(8, 4, 4, oiio.FLOAT))
+        self.assertTrue(buf.write(image_path))
+
+        scn = self.OFnScene()
+        read = scn.createNode("ReadImage")
+        read.setParamValue("path", image_path)
+        const = scn.createNode("ConstantImage")
+        graph = self.OFnGraphScene(scn, workers=2)
+
+        path = os.path.join(self.tmpdir, "evaluate.json")
+        graph.evaluate([read, const], tracePath=path)
+        self.assertFalse(self.trace.isEnabled())
+
+        with open(path) as f:
+            events = [x for x in json.load(f)["traceEvents"] if x["ph"] == "X"]
+
+        cats = set([x["cat"] for x in events])
+        self.assertTrue(set(["graph", "operate", "packet", "io"]).issubset(cats))
+        operates = dict([(x["name"], x) for x in events if x["cat"] == "operate"])
+        self.assertEqual(set(operates.keys()), set([read.name(), const.name()]))
+        self.assertEqual(operates[read.name()]["args"]["type"], "ReadImage")
+        self.assertIn(image_path, [x["args"]["path"] for x in events if x["cat"] == "io"])
+
+        schedule = [x for x in events if x["name"] == "schedule"][0]
+        self.assertNotIn(schedule["tid"], [x["tid"] for x in operates.values()])
+
+        # no file without a trace path
+        os.remove(path)
+        read.setParamValue("path", "")
+        graph.evaluate([read])
+        self.assertFalse(os.path.exists(path))
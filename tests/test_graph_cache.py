@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+
+
+class GraphCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from ofne.graph import cache
+        except:
+            import sys
+            import os
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne.core import packet
+            from ofne.graph import cache
+            cls.packet = packet
+            cls.cache = cache
+
+    def test_key(self):
+        k1 = self.cache.makeKey("a", False, [("num", 1.0)], [None])
+        self.assertEqual(k1, self.cache.makeKey("a", False, [("num", 1.0)], [None]))
+        self.assertNotEqual(k1, self.cache.makeKey("b", False, [("num", 1.0)], [None]))
+        self.assertNotEqual(k1, self.cache.makeKey("a", True, [("num", 1.0)], [None]))
+        self.assertNotEqual(k1, self.cache.makeKey("a", False, [("num", 2.0)], [None]))
+        self.assertNotEqual(k1, self.cache.makeKey("a", False, [("num", 1.0)], ["x"]))
+
+    def test_lru(self):
+        c = self.cache.OFnPacketCache()
+        self.assertFalse(c.enabled())
+        self.assertFalse(c.put("a", self.packet.OFnPacket(data=np.zeros(10, dtype=np.uint8))))
+        self.assertIsNone(c.get("a"))
+
+        c.setBudget(30)
+        self.assertTrue(c.enabled())
+        p1 = self.packet.OFnPacket(data=np.zeros(10, dtype=np.uint8))
+        p2 = self.packet.OFnPacket(data=np.ones(10, dtype=np.uint8))
+        p3 = self.packet.OFnPacket(data=np.ones(10, dtype=np.uint8) * 2)
+        p4 = self.packet.OFnPacket(data=np.ones(10, dtype=np.uint8) * 3)
+        self.assertTrue(c.put("a", p1))
+        self.assertTrue(c.put("b", p2))
+        self.assertTrue(c.put("c", p3))
+        self.assertIs(c.get("a"), p1)
+        self.assertTrue(c.put("d", p4))
+        self.assertIsNone(c.get("b"))
+        self.assertIs(c.get("a"), p1)
+        self.assertIs(c.get("c"), p3)
+        self.assertIs(c.get("d"), p4)
+        self.assertFalse(c.put("e", self.packet.OFnPacket(data=np.zeros(31, dtype=np.uint8))))
+
+        stats = c.stats()
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["bytes"], 30)
+        self.assertEqual(stats["budget"], 30)
+
+        c.setBudget(15)
+        self.assertEqual(c.stats()["entries"], 1)
+        self.assertIs(c.get("d"), p4)
+
+        c.clear()
+        c.resetStats()
+        self.assertEqual(c.stats()["entries"], 0)
+        self.assertEqual(c.stats()["bytes"], 0)
+        self.assertEqual(c.stats()["hits"], 0)
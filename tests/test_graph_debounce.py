@@ -0,0 +1,71 @@
+import unittest
+
+
+class GraphDebounce(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from ofne.graph import debounce
+        except:
+            import sys
+            import os
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne.graph import debounce
+            cls.debounce = debounce
+
+    def test_coalesce(self):
+        d = self.debounce.OFnDebouncer()
+        self.assertFalse(d.take())
+
+        # a burst is merged into the last request
+        for _ in range(10):
+            self.assertEqual(d.request(), 0.0)
+        self.assertTrue(d.isPending())
+        self.assertTrue(d.take())
+        self.assertFalse(d.isPending())
+        self.assertFalse(d.take())
+
+        d.request()
+        d.cancelled()
+        self.assertTrue(d.take())
+
+        stats = d.stats()
+        self.assertEqual(stats["requested"], 11)
+        self.assertEqual(stats["executed"], 2)
+        self.assertEqual(stats["dropped"], 9)
+        self.assertEqual(stats["cancelled"], 1)
+
+        d.resetStats()
+        self.assertEqual(d.stats()["requested"], 0)
+        self.assertEqual(d.stats()["dropped"], 0)
+
+    def test_adaptive(self):
+        d = self.debounce.OFnDebouncer(minDelay=0.01, maxDelay=0.5, factor=1.0, smoothing=0.5)
+        self.assertEqual(d.delay(), 0.01)
+
+        # the delay follows the smoothed duration of the evaluations within the limits
+        d.finished(0.2)
+        self.assertAlmostEqual(d.request(), 0.2)
+        d.finished(0.4)
+        self.assertAlmostEqual(d.delay(), 0.3)
+        d.finished(10.0)
+        self.assertEqual(d.delay(), 0.5)
+        for _ in range(20):
+            d.finished(0.001)
+        self.assertEqual(d.delay(), 0.01)
+        self.assertIsNotNone(d.stats()["duration"])
+
+    def test_maxWait(self):
+        d = self.debounce.OFnDebouncer(minDelay=0.1, maxDelay=0.5)
+
+        # requests faster than the delay do not push the evaluation past the delay after the first one
+        self.assertAlmostEqual(d.request(now=10.0), 0.1)
+        self.assertAlmostEqual(d.request(now=10.04), 0.06)
+        self.assertAlmostEqual(d.request(now=10.08), 0.02)
+        self.assertEqual(d.request(now=10.12), 0.0)
+        self.assertTrue(d.take())
+
+        # the next burst waits again from its first request
+        self.assertAlmostEqual(d.request(now=10.13), 0.1)
+        self.assertAlmostEqual(d.request(now=10.15), 0.08)
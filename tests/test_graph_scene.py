@@ -238,3 +238,856 @@ class GraphScene(unittest.TestCase):
         graph_scene.packet(op)
         self.assertEqual(GraphScene.count, 20)
         self.assertEqual(GraphScene.Res[0], 2.0)
+
+    def test_graph_parallel(self):
+        import threading
+        from ofne.core import op
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        class WaitNums(op.OFnOp):
+            def params(self):
+                return [
+                    GraphScene.param.OFnParamFloat("num")
+                ]
+
+            def needs(self):
+                return 0
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                # both branches must be running at the same time to pass the barrier
+                barrier.wait()
+                return GraphScene.packet.OFnPacket(data=np.array([params.get("num")]))
+
+        class FailOp(op.OFnOp):
+            def params(self):
+                return []
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                raise Exception("failed")
+
+        wait_op = WaitNums()
+        fail_op = FailOp()
+        self.opManager.OFnOpManager().registerOp(wait_op)
+        self.opManager.OFnOpManager().registerOp(fail_op)
+
+        try:
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn, workers=4)
+            self.assertEqual(graph_scene.workers(), 4)
+
+            w1 = scn.createNode("WaitNums")
+            w2 = scn.createNode("WaitNums")
+            p1 = scn.createNode("PlusOp")
+            op = scn.createNode("Output")
+            w1.setParamValue("num", 1.0)
+            w2.setParamValue("num", 2.0)
+            p1.connect(w1, 0)
+            p1.connect(w2, 1)
+            op.connect(p1)
+
+            graph_scene.packet(op)
+            self.assertEqual(graph_scene.failedNodes(), [])
+            self.assertEqual(GraphScene.Res[0], 3.0)
+
+            f1 = scn.createNode("FailOp")
+            f2 = scn.createNode("FailOp")
+            f1.connect(w1)
+            f2.connect(w2)
+            p1.connect(f1, 0)
+            p1.connect(f2, 1)
+            w1.setParamValue("num", 3.0)
+            w2.setParamValue("num", 4.0)
+            graph_scene.packet(op)
+            self.assertEqual(graph_scene.failedNodes(), [f1, f2])
+            self.assertIn("failed", graph_scene.errorMessage(f1))
+
+            graph_scene.setWorkers(0)
+            self.assertEqual(graph_scene.workers(), 1)
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(wait_op)
+            self.opManager.OFnOpManager().deregisterOp(fail_op)
+
+    def test_graph_roi(self):
+        from ofne.core import op
+
+        class MakeImage(op.OFnOp):
+            def params(self):
+                return []
+
+            def needs(self):
+                return 0
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                GraphScene.count += 1
+                return GraphScene.packet.OFnPacket(data=np.arange(100 * 120 * 3, dtype=np.float32).reshape((100, 120, 3)))
+
+        class Scale(op.OFnOp):
+            def params(self):
+                return [
+                    GraphScene.param.OFnParamFloat("scale", 2.0)
+                ]
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def tileable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                GraphScene.count += 1
+                return GraphScene.packet.OFnPacket(data=packetArray.packet(0).data() * params.get("scale"))
+
+        make_op = MakeImage()
+        scale_op = Scale()
+        self.opManager.OFnOpManager().registerOp(make_op)
+        self.opManager.OFnOpManager().registerOp(scale_op)
+
+        try:
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn)
+            graph_scene.setTileSize(32)
+            self.assertEqual(graph_scene.tileSize(), 32)
+
+            img = scn.createNode("MakeImage")
+            s1 = scn.createNode("Scale")
+            s2 = scn.createNode("Scale")
+            s1.connect(img)
+            s2.connect(s1)
+            s2.setParamValue("scale", 3.0)
+            full = np.arange(100 * 120 * 3, dtype=np.float32).reshape((100, 120, 3)) * 6.0
+
+            GraphScene.count = 0
+            roi = graph_scene.packet(s2, roi=(10, 20, 40, 30)).data()
+            self.assertEqual(roi.shape, (10, 30, 3))
+            self.assertTrue(np.array_equal(roi, full[20:30, 10:40]))
+            # 1 MakeImage + 2 tiles * 2 Scale
+            self.assertEqual(GraphScene.count, 5)
+
+            # the tiles are reused
+            roi = graph_scene.packet(s2, roi=(0, 0, 64, 32)).data()
+            self.assertTrue(np.array_equal(roi, full[0:32, 0:64]))
+            self.assertEqual(GraphScene.count, 5)
+
+            # clipped by the image size
+            roi = graph_scene.packet(s2, roi=(100, 90, 200, 200)).data()
+            self.assertEqual(roi.shape, (10, 20, 3))
+            self.assertTrue(np.array_equal(roi, full[90:, 100:]))
+            self.assertEqual(GraphScene.count, 9)
+
+            # only the changed node is recomputed
+            s2.setParamValue("scale", 1.0)
+            roi = graph_scene.packet(s2, roi=(10, 20, 40, 30)).data()
+            self.assertTrue(np.array_equal(roi, full[20:30, 10:40] / 3.0))
+            self.assertEqual(GraphScene.count, 11)
+
+            s1.setByPassed(True)
+            roi = graph_scene.packet(s2, roi=(10, 20, 40, 30)).data()
+            self.assertTrue(np.array_equal(roi, full[20:30, 10:40] / 6.0))
+            self.assertEqual(GraphScene.count, 13)
+            s1.setByPassed(False)
+
+            # the tiles are kept within their budget, the least recently used ones are dropped
+            tile_bytes = 32 * 32 * 3 * 4
+            graph_scene.setTileBudget(tile_bytes * 4)
+            self.assertEqual(graph_scene.tileBudget(), tile_bytes * 4)
+            roi = graph_scene.packet(s2, roi=(0, 0, 120, 100)).data()
+            self.assertTrue(np.array_equal(roi, full / 3.0))
+            stats = graph_scene.tileStats()
+            self.assertLessEqual(stats["bytes"], tile_bytes * 4)
+            self.assertLess(stats["entries"], 32)
+
+            count = GraphScene.count
+            roi = graph_scene.packet(s2, roi=(100, 90, 120, 100)).data()
+            self.assertTrue(np.array_equal(roi, full[90:, 100:] / 3.0))
+            self.assertEqual(GraphScene.count, count)
+            roi = graph_scene.packet(s2, roi=(0, 0, 10, 10)).data()
+            self.assertTrue(np.array_equal(roi, full[:10, :10] / 3.0))
+            self.assertEqual(GraphScene.count, count + 2)
+            graph_scene.setTileBudget(self.graph_scene.DefaultTileBudget)
+
+            # non tileable nodes are evaluated entirely
+            roi = graph_scene.packet(img, roi=(10, 20, 40, 30)).data()
+            self.assertTrue(np.array_equal(roi, full[20:30, 10:40] / 6.0))
+            self.assertTrue(np.array_equal(graph_scene.packet(s2).data(), full / 3.0))
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(make_op)
+            self.opManager.OFnOpManager().deregisterOp(scale_op)
+
+    def test_graph_cache(self):
+        GraphScene.count = 0
+        scn = self.core_scene.OFnScene()
+        graph_scene = self.graph_scene.OFnGraphScene(scn, cacheBudget=1024 * 1024)
+        self.assertEqual(graph_scene.cacheBudget(), 1024 * 1024)
+
+        p1 = scn.createNode("PlusOp")
+        m1 = scn.createNode("MakeNums")
+        m2 = scn.createNode("MakeNums")
+        op = scn.createNode("Output")
+        m1.setParamValue("num", 1.0)
+        m1.setParamValue("count", 1)
+        m2.setParamValue("num", 2.0)
+        m2.setParamValue("count", 1)
+        p1.connect(m1, 0)
+        p1.connect(m2, 1)
+        op.connect(p1, 0)
+
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 4)
+        self.assertEqual(GraphScene.Res[0], 3.0)
+        m2.setParamValue("num", 3.0)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 7)
+        self.assertEqual(GraphScene.Res[0], 4.0)
+
+        # the previous state is cached, only the output runs
+        m2.setParamValue("num", 2.0)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 8)
+        self.assertEqual(GraphScene.Res[0], 3.0)
+        m2.setParamValue("num", 3.0)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 9)
+        self.assertEqual(GraphScene.Res[0], 4.0)
+
+        stats = graph_scene.cacheStats()
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["misses"], 5)
+        self.assertEqual(stats["entries"], 5)
+
+        # same params on another node is not the same result
+        m3 = scn.createNode("MakeNums")
+        m3.setParamValue("num", 3.0)
+        m3.setParamValue("count", 1)
+        p1.connect(m3, 1)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 12)
+
+        graph_scene.clearCache()
+        p1.connect(m2, 1)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 14)
+        self.assertEqual(GraphScene.Res[0], 4.0)
+
+        graph_scene.setCacheBudget(0)
+        m2.setParamValue("num", 2.0)
+        graph_scene.packet(op)
+        m2.setParamValue("num", 3.0)
+        graph_scene.packet(op)
+        self.assertEqual(GraphScene.count, 20)
+
+    def test_graph_fuse(self):
+        from ofne.core import op
+
+        class AddNum(op.OFnOp):
+            fused = 0
+
+            def params(self):
+                return [
+                    GraphScene.param.OFnParamFloat("value", 1.0)
+                ]
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def fuseGroup(self):
+                return "add"
+
+            def operate(self, params, packetArray):
+                return self.operateFused([(self, params)], packetArray)
+
+            def operateFused(self, steps, packetArray):
+                GraphScene.count += 1
+                AddNum.fused += len(steps)
+
+                total = 0.0
+                for _, params in steps:
+                    if params.get("value") < 0:
+                        raise RuntimeError("negative value")
+
+                    total += params.get("value")
+
+                return GraphScene.packet.OFnPacket(data=packetArray.packet(0).data() + total)
+
+        add_op = AddNum()
+        self.opManager.OFnOpManager().registerOp(add_op)
+
+        try:
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn)
+
+            m1 = scn.createNode("MakeNums")
+            m1.setParamValue("num", 1.0)
+            m1.setParamValue("count", 1)
+            a1 = scn.createNode("AddNum")
+            a2 = scn.createNode("AddNum")
+            a3 = scn.createNode("AddNum")
+            op = scn.createNode("Output")
+            a1.connect(m1)
+            a2.connect(a1)
+            a3.connect(a2)
+            op.connect(a3)
+
+            # MakeNums + a single fused AddNum + Output
+            GraphScene.count = 0
+            graph_scene.evaluate([op])
+            self.assertEqual(GraphScene.count, 3)
+            self.assertEqual(AddNum.fused, 3)
+            self.assertEqual(GraphScene.Res[0], 4.0)
+            self.assertFalse(graph_scene.failedNodes())
+
+            # the packet of a fused node is computed again when requested
+            self.assertEqual(graph_scene.packet(a2).data()[0], 3.0)
+            self.assertEqual(GraphScene.count, 4)
+
+            # the dirty chain is fused again
+            a1.setParamValue("value", 2.0)
+            graph_scene.evaluate([op])
+            self.assertEqual(GraphScene.count, 6)
+            self.assertEqual(GraphScene.Res[0], 5.0)
+            a1.setParamValue("value", 1.0)
+
+            # a node having another output is not fused
+            op2 = scn.createNode("Output")
+            op2.connect(a1)
+            GraphScene.count = 0
+            AddNum.fused = 0
+            graph_scene.evaluate([op, op2])
+            self.assertEqual(AddNum.fused, 3)
+            self.assertEqual(GraphScene.count, 4)
+            self.assertEqual(GraphScene.Res[0], 4.0)
+            scn.deleteNode(op2)
+
+            # a bypassed node breaks the chain
+            a2.setByPassed(True)
+            GraphScene.count = 0
+            graph_scene.evaluate([op])
+            self.assertEqual(GraphScene.count, 2)
+            self.assertEqual(GraphScene.Res[0], 3.0)
+            a2.setByPassed(False)
+
+            # the failed node is reported even when it is fused
+            a2.setParamValue("value", -1.0)
+            graph_scene.evaluate([op])
+            self.assertEqual(graph_scene.failedNodes(), [a2])
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(add_op)
+
+    def test_graph_working_data(self):
+        from ofne.core import op
+
+        class ToWorking(op.OFnOp):
+            dtypes = []
+
+            def params(self):
+                return []
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def acceptsWorkingData(self):
+                return True
+
+            def operate(self, params, packetArray):
+                inp = packetArray.packet(0)
+                ToWorking.dtypes.append(inp.data().dtype)
+                if inp.storageType() is not None:
+                    return inp
+
+                d = inp.data()
+
+                return GraphScene.packet.OFnPacket(data=d.astype(np.float32) / np.iinfo(d.dtype).max, storageType=d.dtype)
+
+        class MakeUInt(op.OFnOp):
+            def params(self):
+                return []
+
+            def needs(self):
+                return 0
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                return GraphScene.packet.OFnPacket(data=np.array([0, 1000, 65535], dtype=np.uint16))
+
+        work_op = ToWorking()
+        make_op = MakeUInt()
+        self.opManager.OFnOpManager().registerOp(work_op)
+        self.opManager.OFnOpManager().registerOp(make_op)
+
+        try:
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn)
+
+            m = scn.createNode("MakeUInt")
+            w1 = scn.createNode("ToWorking")
+            w2 = scn.createNode("ToWorking")
+            op = scn.createNode("Output")
+            w1.connect(m)
+            w2.connect(w1)
+            op.connect(w2)
+
+            graph_scene.evaluate([op])
+            # the working data is passed between the nodes and converted back for Output
+            self.assertEqual(ToWorking.dtypes, [np.uint16, np.float32])
+            self.assertEqual(GraphScene.Res.dtype, np.uint16)
+            self.assertEqual(GraphScene.Res.tolist(), [0, 1000, 65535])
+
+            # the packet requested is in its storage type
+            self.assertEqual(graph_scene.packet(w2).data().dtype, np.uint16)
+            self.assertEqual(graph_scene.packet(w2).data().tolist(), [0, 1000, 65535])
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(work_op)
+            self.opManager.OFnOpManager().deregisterOp(make_op)
+
+    def test_graph_snapshot(self):
+        import threading
+
+        GraphScene.count = 0
+        scn = self.core_scene.OFnScene()
+        graph_scene = self.graph_scene.OFnGraphScene(scn)
+
+        p1 = scn.createNode("PlusOp")
+        m1 = scn.createNode("MakeNums")
+        m2 = scn.createNode("MakeNums")
+        op = scn.createNode("Output")
+        m1.setParamValue("num", 1.0)
+        m1.setParamValue("count", 1)
+        m2.setParamValue("num", 2.0)
+        m2.setParamValue("count", 1)
+        p1.connect(m1, 0)
+        p1.connect(m2, 1)
+        op.connect(p1, 0)
+
+        snapshot = scn.snapshot([op])
+        self.assertEqual(len(snapshot.nodes()), 4)
+        self.assertEqual([x.id() for x in snapshot.targets()], [op.id()])
+        with self.assertRaises(self.exceptions.OFnNotImplementedError):
+            snapshot.targets()[0].setParamValue("num", 1.0)
+
+        # the edits after the snapshot are not seen by its evaluation
+        m2.setParamValue("num", 5.0)
+        p1.connect(m1, 1)
+        scn.createNode("MakeNums")
+        graph_scene.evaluateSnapshot(snapshot)
+        self.assertEqual(GraphScene.count, 4)
+        self.assertEqual(GraphScene.Res.tolist(), [3.0])
+
+        # and are evaluated with the next snapshot
+        graph_scene.evaluateSnapshot(scn.snapshot([op]))
+        self.assertEqual(GraphScene.count, 6)
+        self.assertEqual(GraphScene.Res.tolist(), [2.0])
+        graph_scene.evaluate([op])
+        self.assertEqual(GraphScene.count, 6)
+        self.assertEqual(graph_scene.packet(p1).data().tolist(), [2.0])
+
+        m2.setParamValue("num", 1.0)
+        p1.connect(m2, 1)
+        graph_scene.evaluateSnapshot(scn.snapshot([op]))
+        self.assertEqual(GraphScene.count, 9)
+        self.assertEqual(GraphScene.Res.tolist(), [2.0])
+
+        # nothing is started once cancelled, the nodes stay dirty
+        m1.setParamValue("num", 3.0)
+        cancel = threading.Event()
+        cancel.set()
+        graph_scene.evaluateSnapshot(scn.snapshot([op]), cancel=cancel)
+        self.assertEqual(GraphScene.count, 9)
+        graph_scene.evaluateSnapshot(scn.snapshot([op]), cancel=threading.Event())
+        self.assertEqual(GraphScene.count, 12)
+        self.assertEqual(GraphScene.Res.tolist(), [4.0])
+
+        # the nodes deleted from the scene are dropped
+        self.assertEqual(graph_scene.errorMessage(m2), "")
+        scn.deleteNode(m2)
+        graph_scene.evaluateSnapshot(scn.snapshot([op]))
+        self.assertEqual(GraphScene.count, 14)
+        self.assertIsNone(graph_scene.errorMessage(m2))
+
+    def test_graph_cancel(self):
+        import threading
+        from ofne.core import op
+
+        cancel = threading.Event()
+
+        class CancelOp(op.OFnOp):
+            def params(self):
+                return []
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                GraphScene.count += 1
+                cancel.set()
+                return packetArray.packet(0)
+
+        cancel_op = CancelOp()
+        self.opManager.OFnOpManager().registerOp(cancel_op)
+
+        try:
+            for workers in (1, 4):
+                GraphScene.count = 0
+                cancel.clear()
+                scn = self.core_scene.OFnScene()
+                graph_scene = self.graph_scene.OFnGraphScene(scn, workers=workers)
+                m = scn.createNode("MakeNums")
+                c = scn.createNode("CancelOp")
+                o = scn.createNode("Output")
+                c.connect(m)
+                o.connect(c)
+
+                # the running node finishes but the following ones are not started
+                graph_scene.evaluate([o], cancel=cancel)
+                self.assertEqual(GraphScene.count, 2)
+                cancel.clear()
+                graph_scene.evaluate([o], cancel=cancel)
+                self.assertEqual(GraphScene.count, 3)
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(cancel_op)
+
+    def test_graph_proxy(self):
+        from ofne.core import op
+
+        class ProxyNums(op.OFnOp):
+            def params(self):
+                return []
+
+            def needs(self):
+                return 0
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                GraphScene.count += 1
+                return GraphScene.packet.OFnPacket(data=np.ones(16 // packetArray.proxy()))
+
+        proxy_op = ProxyNums()
+        self.opManager.OFnOpManager().registerOp(proxy_op)
+
+        try:
+            GraphScene.count = 0
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn, cacheBudget=1024 * 1024)
+            self.assertEqual(graph_scene.proxy(), 1)
+            with self.assertRaises(ValueError):
+                graph_scene.setProxy(3)
+
+            m = scn.createNode("ProxyNums")
+            o = scn.createNode("Output")
+            o.connect(m)
+
+            graph_scene.evaluate([o])
+            self.assertEqual(GraphScene.count, 2)
+            self.assertEqual(GraphScene.Res.shape, (16, ))
+
+            # the source ops make smaller packets and the results are cached per level
+            graph_scene.setProxy(4)
+            graph_scene.evaluate([o])
+            self.assertEqual(GraphScene.count, 4)
+            self.assertEqual(GraphScene.Res.shape, (4, ))
+            graph_scene.evaluate([o])
+            self.assertEqual(GraphScene.count, 4)
+
+            graph_scene.setProxy(1)
+            graph_scene.evaluate([o])
+            self.assertEqual(GraphScene.count, 5)
+            self.assertEqual(GraphScene.Res.shape, (16, ))
+            graph_scene.setProxy(4)
+            graph_scene.evaluate([o])
+            self.assertEqual(GraphScene.count, 6)
+            self.assertEqual(GraphScene.Res.shape, (4, ))
+            self.assertEqual(graph_scene.packet(m).data().shape, (4, ))
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(proxy_op)
+
+    def test_graph_progressive(self):
+        import threading
+        from ofne.core import op
+        from ofne.core import resource
+
+        records = []
+        cancel = threading.Event()
+
+        class Record(op.OFnOp):
+            cancelCoarse = False
+
+            def params(self):
+                return []
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return False
+
+            def operate(self, params, packetArray):
+                resource.OFnViewResource().dump(packetArray.packet(0))
+                records.append((packetArray.proxy(), packetArray.packet(0).data().shape, resource.OFnViewResource().passState()))
+                if Record.cancelCoarse and packetArray.proxy() > 1:
+                    cancel.set()
+
+        class Source(op.OFnOp):
+            def params(self):
+                return [GraphScene.param.OFnParamFloat("num")]
+
+            def needs(self):
+                return 0
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                return GraphScene.packet.OFnPacket(data=np.full(16 // packetArray.proxy(), params.get("num")))
+
+        ops = [Record(), Source()]
+        for o in ops:
+            self.opManager.OFnOpManager().registerOp(o)
+
+        try:
+            scn = self.core_scene.OFnScene()
+            graph_scene = self.graph_scene.OFnGraphScene(scn)
+            s = scn.createNode("Source")
+            r = scn.createNode("Record")
+            r.connect(s)
+
+            # the coarse image first and then the full one
+            graph_scene.evaluate([r], coarse=4)
+            self.assertEqual(records, [(4, (4, ), resource.PassCoarse), (1, (16, ), resource.PassFinal)])
+
+            # the coarse pass has nothing to do, the full one shows the image again
+            del records[:]
+            graph_scene.evaluateSnapshot(scn.snapshot([r]), coarse=4)
+            self.assertEqual(records, [(1, (16, ), resource.PassFinal)])
+
+            # no coarse pass finer than the proxy level
+            del records[:]
+            graph_scene.setProxy(8)
+            graph_scene.evaluate([r], coarse=4)
+            self.assertEqual(records, [(8, (2, ), resource.PassFinal)])
+            graph_scene.setProxy(1)
+
+            # the full pass is not started once cancelled
+            del records[:]
+            Record.cancelCoarse = True
+            s.setParamValue("num", 1.0)
+            graph_scene.evaluateSnapshot(scn.snapshot([r]), coarse=2, cancel=cancel)
+            self.assertEqual(records, [(2, (8, ), resource.PassCoarse)])
+            self.assertEqual(resource.OFnViewResource().passState(), resource.PassCoarse)
+
+            Record.cancelCoarse = False
+            cancel.clear()
+            del records[:]
+            graph_scene.evaluate([r], coarse=2, cancel=cancel)
+            self.assertEqual(records, [(1, (16, ), resource.PassFinal)])
+
+            with self.assertRaises(ValueError):
+                graph_scene.evaluate([r], coarse=3)
+        finally:
+            for o in ops:
+                self.opManager.OFnOpManager().deregisterOp(o)
+
+    def test_graph_progressive_incremental(self):
+        from ofne.core import op
+        from ofne.graph import memory
+
+        counts = {}
+
+        class Level(op.OFnOp):
+            def params(self):
+                return [GraphScene.param.OFnParamFloat("num")]
+
+            def needs(self):
+                return 1
+
+            def packetable(self):
+                return True
+
+            def operate(self, params, packetArray):
+                counts[packetArray.proxy()] = counts.get(packetArray.proxy(), 0) + 1
+                if packetArray.packet(0).data().size == 0:
+                    return GraphScene.packet.OFnPacket(data=np.zeros(16 // packetArray.proxy()))
+
+                return GraphScene.packet.OFnPacket(data=packetArray.packet(0).data() + params.get("num"))
+
+        level_op = Level()
+        self.opManager.OFnOpManager().registerOp(level_op)
+
+        try:
+            for policy, budget in ((memory.MemoryRelease, 1024 * 1024), (memory.MemoryKeep, 0), (memory.MemoryRelease, 0)):
+                scn = self.core_scene.OFnScene()
+                graph_scene = self.graph_scene.OFnGraphScene(scn, cacheBudget=budget, memoryPolicy=policy)
+                chain = [scn.createNode("Level")]
+                for _ in range(9):
+                    n = scn.createNode("Level")
+                    n.connect(chain[-1])
+                    chain.append(n)
+
+                counts.clear()
+                graph_scene.evaluate([chain[-1]], coarse=4)
+                self.assertEqual(counts, {4: 10, 1: 10})
+
+                # only the edited node runs again at the coarse level, the full level has no cache to release to
+                counts.clear()
+                chain[-1].setParamValue("num", 1.0)
+                graph_scene.evaluate([chain[-1]], coarse=4)
+                self.assertEqual(counts[4], 1)
+                self.assertEqual(counts[1], 10 if policy == memory.MemoryRelease and not budget else 1)
+                self.assertEqual(graph_scene.packet(chain[-1]).data().tolist(), [1.0] * 16)
+        finally:
+            self.opManager.OFnOpManager().deregisterOp(level_op)
+
+    def test_graph_collected(self):
+        import gc
+        import weakref
+
+        scn = self.core_scene.OFnScene()
+        m = scn.createNode("MakeNums")
+        graph_scene = self.graph_scene.OFnGraphScene(scn)
+        graph_scene.evaluate([m], coarse=2)
+        ref = weakref.ref(graph_scene)
+
+        # the scene does not keep the graph and its coarse graph alive
+        del graph_scene
+        gc.collect()
+        self.assertIsNone(ref())
+        m.setParamValue("count", 2)
+
+    def test_graph_memory(self):
+        from ofne.graph import memory
+
+        GraphScene.count = 0
+        scn = self.core_scene.OFnScene()
+        graph_scene = self.graph_scene.OFnGraphScene(scn, memoryPolicy=memory.MemoryRelease)
+        self.assertEqual(graph_scene.memoryPolicy(), memory.MemoryRelease)
+
+        p1 = scn.createNode("PlusOp")
+        p2 = scn.createNode("PlusOp")
+        m1 = scn.createNode("MakeNums")
+        m2 = scn.createNode("MakeNums")
+        m1.setParamValue("num", 1.0)
+        m1.setParamValue("count", 1000)
+        m2.setParamValue("num", 2.0)
+        m2.setParamValue("count", 1000)
+        p1.connect(m1, 0)
+        p1.connect(m2, 1)
+        p2.connect(p1, 0)
+        p2.connect(m1, 1)
+
+        # m1 is read by both plus nodes, every intermediate packet is dropped after its last reader
+        self.assertEqual(graph_scene.packet(p2).data()[0], 4.0)
+        self.assertEqual(GraphScene.count, 4)
+        stats = graph_scene.memoryStats()
+        self.assertEqual(stats["released"], 3)
+        self.assertEqual(stats["packetBytes"], 1000 * 8)
+        self.assertTrue(stats["peakRSS"] is None or stats["peakRSS"] > 0)
+
+        # a released packet is computed again when a dirty node needs it
+        m2.setParamValue("num", 3.0)
+        self.assertEqual(graph_scene.packet(p2).data()[0], 5.0)
+        self.assertEqual(GraphScene.count, 8)
+        self.assertEqual(graph_scene.packet(p1).data()[0], 4.0)
+        self.assertEqual(GraphScene.count, 11)
+
+        # the cache keeps the intermediate packets within its budget
+        graph_scene.setCacheBudget(1024 * 1024)
+        m2.setParamValue("num", 2.0)
+        graph_scene.packet(p2)
+        self.assertEqual(GraphScene.count, 15)
+        m1.setParamValue("num", 5.0)
+        m1.setParamValue("num", 1.0)
+        m2.setParamValue("num", 3.0)
+        m2.setParamValue("num", 2.0)
+        graph_scene.packet(p2)
+        self.assertEqual(GraphScene.count, 15)
+        self.assertEqual(graph_scene.packet(p2).data()[0], 4.0)
+
+        # every packet is kept otherwise
+        graph_scene = self.graph_scene.OFnGraphScene(scn)
+        graph_scene.packet(p2)
+        stats = graph_scene.memoryStats()
+        self.assertEqual(stats["released"], 0)
+        self.assertEqual(stats["packetBytes"], 1000 * 8 * 4)
+
+        with self.assertRaises(ValueError):
+            graph_scene.setMemoryPolicy(5)
+
+    def test_graph_profile(self):
+        from ofne.graph import profile
+
+        scn = self.core_scene.OFnScene()
+        graph_scene = self.graph_scene.OFnGraphScene(scn, cacheBudget=1024 * 1024)
+        p1 = scn.createNode("PlusOp")
+        m1 = scn.createNode("MakeNums")
+        m2 = scn.createNode("MakeNums")
+        op = scn.createNode("Output")
+        m1.setParamValue("num", 1.0)
+        m1.setParamValue("count", 10)
+        m2.setParamValue("num", 2.0)
+        m2.setParamValue("count", 10)
+        p1.connect(m1, 0)
+        p1.connect(m2, 1)
+        op.connect(p1, 0)
+
+        graph_scene.evaluate([op])
+        rows = graph_scene.profileReport()
+        self.assertEqual(set([x["name"] for x in rows]), set([p1.name(), m1.name(), m2.name(), op.name()]))
+        self.assertEqual([x["wall"] for x in rows], sorted([x["wall"] for x in rows], reverse=True))
+
+        by_name = dict([(x["name"], x) for x in rows])
+        self.assertEqual(by_name[p1.name()]["shape"], (10, ))
+        self.assertEqual(by_name[p1.name()]["dtype"], "float64")
+        self.assertEqual(by_name[p1.name()]["bytes"], 80)
+        self.assertEqual(by_name[p1.name()]["cache"], profile.CacheMiss)
+        self.assertIs(by_name[p1.name()]["node"], p1)
+        self.assertEqual(by_name[p1.name()]["type"], "PlusOp")
+        self.assertIsNone(by_name[op.name()]["shape"])
+        self.assertIsNone(by_name[op.name()]["cache"])
+        self.assertTrue(all([x["wall"] >= 0.0 and x["cpu"] >= 0.0 for x in rows]))
+
+        # the last evaluation only, or the latest profile of every node
+        m2.setParamValue("num", 3.0)
+        m2.setParamValue("num", 2.0)
+        graph_scene.evaluate([op])
+        rows = graph_scene.profileReport(sort="bytes")
+        by_name = dict([(x["name"], x) for x in rows])
+        self.assertEqual(set(by_name.keys()), set([p1.name(), m2.name(), op.name()]))
+        self.assertEqual(by_name[m2.name()]["cache"], profile.CacheHit)
+        self.assertEqual(by_name[m2.name()]["bytes"], 0)
+        self.assertEqual(len(graph_scene.profileReport(last=False)), 4)
+        self.assertEqual(len(graph_scene.profileReport(last=False, limit=2)), 2)
+
+        # a bypassed node passes its input through
+        p1.setByPassed(True)
+        graph_scene.evaluate([op])
+        by_name = dict([(x["name"], x) for x in graph_scene.profileReport()])
+        self.assertEqual(by_name[p1.name()]["bytes"], 0)
+
+        with self.assertRaises(ValueError):
+            graph_scene.profileReport(sort="name")
@@ -229,3 +229,76 @@ class ImplNode(unittest.TestCase):
         self.assertTrue(two2.connectInput(0, one2))
         self.assertTrue(two2.connectInput(0, one2))
         self.assertFalse(one2.connectInput(0, one1))
+
+    def test_order(self):
+        import random
+
+        def _reaches(src, dst):
+            stack = [src]
+            visited = set()
+            while (stack):
+                cur = stack.pop()
+                if cur == dst:
+                    return True
+
+                if cur in visited:
+                    continue
+
+                visited.add(cur)
+                stack.extend(cur.outputs())
+
+            return False
+
+        rnd = random.Random(7)
+        nodes = [self._node._OFnNodeImpl(self.TwoInputsPacketable(), None) for _ in range(40)]
+        for _ in range(400):
+            dst = rnd.choice(nodes)
+            src = rnd.choice(nodes)
+            index = rnd.randint(0, 1)
+            expected = src != dst and not _reaches(dst, src)
+            self.assertEqual(dst.connectInput(index, src), expected)
+
+            # every input is placed before the node in the order
+            for n in nodes:
+                for i in n.inputs():
+                    if i is not None:
+                        self.assertLess(i._order(), n._order())
+
+        # diamonds do not make the check slow
+        top = self._node._OFnNodeImpl(self.TwoInputsPacketable(), None)
+        cur = top
+        for _ in range(200):
+            a = self._node._OFnNodeImpl(self.TwoInputsPacketable(), None)
+            b = self._node._OFnNodeImpl(self.TwoInputsPacketable(), None)
+            d = self._node._OFnNodeImpl(self.TwoInputsPacketable(), None)
+            self.assertTrue(a.connectInput(0, cur))
+            self.assertTrue(b.connectInput(0, cur))
+            self.assertTrue(d.connectInput(0, a))
+            self.assertTrue(d.connectInput(1, b))
+            cur = d
+
+        self.assertFalse(top.connectInput(0, cur))
+
+    def test_connectTrusted(self):
+        one1 = self._node._OFnNodeImpl(self.OneInputs(), None)
+        one2 = self._node._OFnNodeImpl(self.OneInputs(), None)
+        one3 = self._node._OFnNodeImpl(self.OneInputs(), None)
+        one4 = self._node._OFnNodeImpl(self.OneInputs(), None)
+
+        # created in the reverse order of the connections
+        self.assertTrue(self._node.connectTrusted([(one1, 0, one2), (one2, 0, one3)]))
+        self.assertEqual(one1.inputs()[0], one2)
+        self.assertEqual(one2.inputs()[0], one3)
+        self.assertLess(one3._order(), one2._order())
+        self.assertLess(one2._order(), one1._order())
+        self.assertFalse(one3.connectInput(0, one1))
+
+        # a cycle restores the previous inputs
+        self.assertTrue(one3.connectInput(0, one4))
+        self.assertFalse(self._node.connectTrusted([(one4, 0, one1), (one3, 0, one2)]))
+        self.assertIsNone(one4.inputs()[0])
+        self.assertEqual(one3.inputs()[0], one4)
+        self.assertEqual(len(one2.outputs()), 1)
+
+        with self.assertRaises(self.exceptions.OFnIndexError):
+            self._node.connectTrusted([(one1, 1, one2)])
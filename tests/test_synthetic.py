@@ -0,0 +1,104 @@
+import os
+import sys
+import shutil
+import filecmp
+import tempfile
+import unittest
+
+
+class SyntheticTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.pop("OFNE_PLUGIN_PATH", None)
+
+        try:
+            from ofne import synthetic
+        except:
+            sys.path.append((os.path.abspath(os.path.join(__file__, "../../python"))))
+        finally:
+            from ofne import synthetic
+            from ofne.core import scene
+            from ofne.core import opManager
+            from ofne.graph.scene import OFnGraphScene
+            cls.synthetic = synthetic
+            cls.scene = scene
+            cls.OFnGraphScene = OFnGraphScene
+            opManager.OFnOpManager().reloadPlugins()
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def __depth(self, node, depths):
+        if node.id() not in depths:
+            ins = [x for x in node.inputs() if x is not None]
+            depths[node.id()] = 1 + max([self.__depth(x, depths) for x in ins] + [0])
+
+        return depths[node.id()]
+
+    def test_generate(self):
+        sizes = [(16, 8), (32, 16)]
+        scn = self.synthetic.generate(nodes=120, depth=6, fanIn=3, fanOut=2, sizes=sizes, seed=1)
+        nodes = scn.nodes()
+        viewers = [x for x in nodes if x.type() == "Viewer"]
+        self.assertEqual(len(viewers), 1)
+        self.assertEqual(len(nodes), 121)
+
+        types = set([x.type() for x in nodes])
+        self.assertIn("ConstantImage", types)
+        self.assertIn("PythonExpression", types)
+        self.assertTrue(len([x for x in types if x.startswith("OCIO")]) > 1)
+
+        depths = {}
+        self.assertEqual(max([self.__depth(x, depths) for x in nodes if x.type() != "Viewer"]), 6)
+        self.assertTrue(all([len([y for y in x.inputs() if y is not None]) <= 3 for x in nodes]))
+        self.assertTrue(all([(x.getParamValue("width"), x.getParamValue("height")) in sizes for x in nodes if x.type() == "ConstantImage"]))
+
+        graph = self.OFnGraphScene(scn)
+        graph.evaluate(viewers)
+        self.assertEqual(graph.failedNodes(), [])
+
+        # the op mix
+        scn = self.synthetic.generate(nodes=20, depth=4, opMix={"OCIO": 0.0}, sizes=sizes)
+        self.assertEqual(set([x.type() for x in scn.nodes()]), set(["ConstantImage", "PythonExpression", "Viewer"]))
+        scn = self.synthetic.generate(nodes=20, depth=4, opMix={"PythonExpression": 0.0}, fanIn=1, sizes=sizes)
+        self.assertNotIn("PythonExpression", set([x.type() for x in scn.nodes()]))
+        self.assertTrue(all([len([y for y in x.inputs() if y is not None]) <= 1 for x in scn.nodes()]))
+
+        # fewer nodes than layers
+        for count in (1, 2, 3):
+            scn = self.synthetic.generate(nodes=count, sizes=sizes)
+            self.assertEqual(len(scn.nodes()), count + 1)
+            graph = self.OFnGraphScene(scn)
+            graph.evaluate([x for x in scn.nodes() if x.type() == "Viewer"])
+            self.assertEqual(graph.failedNodes(), [])
+
+        with self.assertRaises(ValueError):
+            self.synthetic.generate(nodes=0)
+        with self.assertRaises(ValueError):
+            self.synthetic.generate(depth=0)
+        with self.assertRaises(ValueError):
+            self.synthetic.generate(fanIn=5)
+        with self.assertRaises(ValueError):
+            self.synthetic.generate(opMix={"ReadImage": 1.0})
+
+    def test_write(self):
+        a = os.path.join(self.tmpdir, "a.ofsn")
+        b = os.path.join(self.tmpdir, "b.ofsn")
+        c = os.path.join(self.tmpdir, "c.ofsn")
+
+        # the same seed writes the same file
+        self.synthetic.write(a, nodes=50, depth=5, seed=7)
+        self.synthetic.write(b, nodes=50, depth=5, seed=7)
+        self.synthetic.write(c, nodes=50, depth=5, seed=8)
+        self.assertTrue(filecmp.cmp(a, b, shallow=False))
+        self.assertFalse(filecmp.cmp(a, c, shallow=False))
+
+        scn = self.scene.OFnScene()
+        self.assertTrue(scn.read(a))
+        self.assertEqual(len(scn.nodes()), 51)
+
+        self.assertEqual(self.synthetic.main([b, "-n", "30", "-d", "3", "-m", "OCIO=1,PythonExpression=2", "-s", "8x4,16x8", "--seed", "2"]), 0)
+        self.assertTrue(scn.read(b))